@@ -1,26 +1,51 @@
-import requests
-import dotenv
 import os
 import json
-dotenv.load_dotenv()
+from datetime import date
+from api.snapshot import load_snapshot, snapshot_path_for, write_snapshot
+from event.validation import is_canceled
+from instrument import instrument
 
+# number of characters read from disk at a time when streaming a feed
+STREAM_CHUNK_SIZE = 64 * 1024
+# the most text a chunk boundary can cut off undecodably, the start of a "\\uXXXX" escape or of "false"
+PARTIAL_TOKEN_LENGTH = 6
 
-def call_api_and_return_json_data(api_url: str) -> dict:
-    """Calls the Assabet calendar API and returns a JSON object."""
+# shared client for call_api_and_return_json_data, created on first use
+_client = None
+
+# field compared by merge_feeds when both copies of an event carry it, an ISO timestamp
+MODIFIED_FIELD = "last_modified"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
-    }
 
-    response = requests.get(api_url, headers=headers)
-    return response.json()
+def call_api_and_return_json_data(api_url: str, params: dict = None, paginate: bool = False) -> list:
+    """
+    Calls the Assabet calendar API and returns a JSON object.
+
+    Requests go through a shared pooled ApiClient, so repeated calls reuse the same connection.
+    Responses are kept in a ResponseCache under src/storage/cache, so a repeated call within the cache's TTL is answered from disk and a later one is revalidated with a conditional GET, costing a 304 when the feed has not changed.
+    The network stack and the .env settings are only loaded on the first call, so reading stored feeds never pays for them.
+    """
 
+    global _client
+    if _client is None:
+        import dotenv
+        from api.cache import ResponseCache
+        from api.client import ApiClient
+
+        dotenv.load_dotenv()
+        _client = ApiClient(cache=ResponseCache())
+    with instrument.span("fetch", url=api_url):
+        json_data = _client.fetch(api_url, params, paginate=paginate)
+    instrument.count("events_fetched", len(json_data))
+    return json_data
+
+
+def get_api_data_from_storage(file_path: str, use_snapshot: bool = False) -> dict:
+    """
+    Retrieves JSON data from a local JSON file.
 
-def get_api_data_from_storage(file_path: str) -> dict:
-    """Retrieves JSON data from a local JSON file."""
+    With use_snapshot, the feed is loaded from its binary snapshot (see api.snapshot) when that snapshot is newer than the JSON file. Otherwise the JSON is parsed and the snapshot rebuilt for the next run. Snapshot loads return events projected down to the fields used by the calendar.
+    """
 
     full_file_path = os.path.join(os.getcwd(), "src", "storage", file_path)
     file_exists = os.path.exists(full_file_path)
@@ -29,9 +54,26 @@ def get_api_data_from_storage(file_path: str) -> dict:
         print(f"File not found: {full_file_path}")
         return {}
 
+    if use_snapshot:
+        snapshot_path = snapshot_path_for(file_path)
+        json_data = load_snapshot(snapshot_path, file_path)
+        if json_data is not None:
+            return json_data
+
+        json_data = get_api_data_from_storage(file_path)
+        if not json_data:
+            return json_data
+        json_data = [[project_event(item) for item in events]
+                     for events in json_data]
+        write_snapshot(json_data, snapshot_path, file_path)
+        return json_data
+
     try:
-        with open(full_file_path, 'r') as file:
-            json_data = json.load(file)
+        with instrument.span("load", file_path=file_path):
+            with open(full_file_path, 'r') as file:
+                json_data = json.load(file)
+        instrument.count("bytes_read", os.path.getsize(full_file_path))
+        instrument.count("events_read", sum(len(events) for events in json_data))
         return json_data
     except OSError as e:
         print(f"An error occurred while reading the file: {e}")
@@ -41,7 +83,212 @@ def get_api_data_from_storage(file_path: str) -> dict:
         file.close()
 
 
-def write_json_to_file(json_data: dict, file_path: str) -> bool:
+def project_event(item: dict) -> dict:
+    """
+    Reduces a feed event to the fields used by the calendar, dropping descriptions, images and registration details.
+
+        Parameters:
+            item -- dict containing the full event details from the feed
+
+        Returns:
+            dict with the same shape as the feed event, holding only the projected fields.
+    """
+
+    locations = item.get("locations") or []
+    return {
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "start_date": item.get("start_date"),
+        "start_time": item.get("start_time"),
+        "end_date": item.get("end_date"),
+        "end_time": item.get("end_time"),
+        "canceled": item.get("canceled"),
+        # kept so merge_feeds can still pick the most recently modified copy of a projected event
+        MODIFIED_FIELD: item.get(MODIFIED_FIELD),
+        "locations": [
+            {
+                "location_name": location.get("location_name"),
+                "branch_name": location.get("branch_name"),
+            }
+            for location in locations[:1]
+        ],
+        "categories": [
+            {"category_name": category.get("category_name")}
+            for category in item.get("categories") or []
+        ],
+    }
+
+
+def iter_feed_items(file, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Incrementally walks a feed shaped as [[{event}, ...], ...] and yields each event dict as soon as it has been read.
+
+    Only one event and one chunk of text are held in memory at a time.
+
+        Parameters:
+            file -- text file object positioned at the start of the feed
+            chunk_size -- int number of characters to read at a time
+
+        Returns:
+            Generator of event dicts in feed order.
+
+        Raises:
+            ValueError if the feed is not a list of lists of objects, holds malformed JSON or ends unexpectedly.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    # characters already dropped from the front of the buffer, for reporting offsets in the feed
+    consumed = 0
+    depth = 0
+    started = False
+
+    def read_chunk() -> bool:
+        nonlocal buffer, position, consumed
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return False
+        consumed += position
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    while True:
+        # skip whitespace and separators, reading more text when the buffer runs out
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or not read_chunk():
+                break
+
+        if position >= len(buffer):
+            if depth != 0 or not started:
+                raise ValueError("Unexpected end of feed data.")
+            return
+
+        char = buffer[position]
+        if char == "[":
+            if depth == 2:
+                raise ValueError("Feed data is nested too deeply.")
+            depth += 1
+            started = True
+            position += 1
+        elif char == "]" and depth > 0:
+            depth -= 1
+            position += 1
+            if depth == 0:
+                return
+        elif char == "{" and depth > 0:
+            while True:
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                    break
+                except json.JSONDecodeError as e:
+                    # only an event cut off by the end of the buffer can be completed by reading on
+                    if (len(buffer) - e.pos > PARTIAL_TOKEN_LENGTH
+                            and not e.msg.startswith("Unterminated string")):
+                        raise ValueError(
+                            f"Invalid feed data at offset {consumed + e.pos}: {e.msg}") from None
+                    if not read_chunk():
+                        raise ValueError("Unexpected end of feed data.")
+            yield item
+        else:
+            raise ValueError(f"Unexpected character in feed data: {char!r}")
+
+
+def stream_api_data_from_storage(file_path: str, start_date=None, end_date=None):
+    """
+    Streams events from a local JSON file without loading the whole feed into memory.
+
+    Each event is projected down to the fields used by the calendar and filtered by date as it is read.
+
+        Parameters:
+            file_path -- str representing the file name within the storage directory
+            start_date -- optional datetime.date or "YYYY-MM-DD" str, events starting before it are skipped
+            end_date -- optional datetime.date or "YYYY-MM-DD" str, events starting after it are skipped
+
+        Returns:
+            Generator of projected event dicts in feed order.
+    """
+
+    full_file_path = os.path.join(os.getcwd(), "src", "storage", file_path)
+    if not os.path.exists(full_file_path):
+        print(f"File not found: {full_file_path}")
+        return
+
+    if isinstance(start_date, date):
+        start_date = start_date.strftime("%Y-%m-%d")
+    if isinstance(end_date, date):
+        end_date = end_date.strftime("%Y-%m-%d")
+
+    try:
+        with open(full_file_path, 'r') as file:
+            for item in iter_feed_items(file):
+                instrument.count("events_read")
+                event_date = item.get("start_date") or ""
+                if start_date and event_date < start_date:
+                    continue
+                if end_date and event_date > end_date:
+                    continue
+                yield project_event(item)
+        instrument.count("bytes_read", os.path.getsize(full_file_path))
+    except OSError as e:
+        print(f"An error occurred while reading the file: {e}")
+
+
+def merge_feeds(feeds, modified_field: str = MODIFIED_FIELD, drop_canceled: bool = False) -> list:
+    """
+    Merge overlapping feeds, e.g. all-events.json and a branch feed like lkwy-events.json, into one list holding each event once.
+    Events are matched through a hash index on their id, in a single pass over every feed, so merging is linear in the number of records. Feeds are read one at a time and only the winning copy of each event is kept, so feeds can be generators such as stream_api_data_from_storage.
+    When both copies of an event carry modified_field the most recently modified one wins. Otherwise the copy read last wins, unless only the earlier copy is canceled: a feed that has not caught up with a cancellation never brings the event back.
+
+      Parameters:
+        feeds {Iterable} —— feeds shaped as [[{event}, ...], ...] like get_api_data_from_storage returns, or flat iterables of event dicts
+        modified_field {str} —— name of the last-modified timestamp field
+        drop_canceled {bool} —— leave canceled events out of the result
+      Raises:
+        TypeError if a feed is not a list or iterable of events, e.g. the {} returned for a feed that could not be read.
+      Returns:
+        events {list[dict]} —— the event dicts in the order each id was first seen; events without an id are all kept
+    """
+
+    merged = {}
+    anonymous = 0
+    duplicates = 0
+    with instrument.span("merge"):
+        for feed in feeds:
+            if feed is None or isinstance(feed, dict):
+                raise TypeError(
+                    f"Each feed should be a list or iterable of events, not {type(feed).__name__}.")
+            for group in feed:
+                for item in (group if isinstance(group, list) else (group,)):
+                    event_id = item.get("id")
+                    if event_id is None:
+                        # nothing to match on, so keep it under a key no feed id can collide with
+                        merged[(None, anonymous)] = item
+                        anonymous += 1
+                        continue
+                    current = merged.get(event_id)
+                    if current is None:
+                        merged[event_id] = item
+                        continue
+                    duplicates += 1
+                    current_modified = current.get(modified_field)
+                    modified = item.get(modified_field)
+                    if current_modified and modified:
+                        if modified >= current_modified:
+                            merged[event_id] = item
+                    elif is_canceled(item) or not is_canceled(current):
+                        merged[event_id] = item
+        instrument.count("duplicates_merged", duplicates)
+
+    if drop_canceled:
+        return [item for item in merged.values() if not is_canceled(item)]
+    return list(merged.values())
+
+
+def write_json_to_file(json_data: dict, file_path: str, snapshot: bool = False) -> bool:
     """
     Writes the JSON data to a file.
 
@@ -51,6 +298,7 @@ def write_json_to_file(json_data: dict, file_path: str) -> bool:
         Parameters:
             json_data: dict containing the JSON data to write
             file_path: str representing the requested file name
+            snapshot: bool, also write a binary snapshot of the data next to the JSON file
 
         Returns:
             True if successful, False if not.
@@ -74,7 +322,6 @@ def write_json_to_file(json_data: dict, file_path: str) -> bool:
         with open(full_file_path, 'w') as file:
             json.dump(json_data, file, indent=4)
         print(f"Data written to {full_file_path}")
-        return True
 
     except OSError as e:
         print(f"An error occurred while writing to the file: {e}")
@@ -83,6 +330,10 @@ def write_json_to_file(json_data: dict, file_path: str) -> bool:
     finally:
         file.close()
 
+    if snapshot:
+        return write_snapshot(json_data, snapshot_path_for(file_path), file_path)
+    return True
+
 
 def search_branch(event, search_branch: str) -> bool:
     """
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+
+
+DEFAULT_CACHE_DIRECTORY = os.path.join("src", "storage", "cache")
+# seconds a stored response is served without contacting the API
+DEFAULT_TTL = 60 * 60
+# seconds past the TTL during which a stale response is served while it is revalidated in the background
+DEFAULT_STALE_WHILE_REVALIDATE = 10 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class CachedResponse:
+    """A stored API response. Exposes the parts of requests.Response used by ApiClient.fetch."""
+
+    def __init__(self, content: bytes, url: str, links: dict, status_code: int = 200, from_cache: bool = True):
+        self.content = content
+        self.url = url
+        self.links = links
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    The ResponseCache class stores API responses on disk and revalidates them with conditional GETs.
+
+      Constructor:
+        Responses are stored under the storage directory, keyed by a hash of the URL and query parameters. A response younger than the TTL is served straight from disk. Past the TTL it is revalidated with If-None-Match / If-Modified-Since, so an unchanged feed costs a 304 instead of a full download. Within the stale-while-revalidate window the stale copy is served immediately and refreshed in the background, and a stale copy is also served if the API cannot be reached. The least recently used entries are evicted once the cache grows past max_bytes.
+
+      Parameters:
+        directory {str} —— where to store responses, relative to the current working directory
+        ttl {float} —— seconds a response is fresh
+        stale_while_revalidate {float} —— seconds past the TTL a stale response may be served while refreshing
+        max_bytes {int} —— upper bound on the size of stored response bodies
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIRECTORY, ttl: float = DEFAULT_TTL,
+                 stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE, max_bytes: int = DEFAULT_MAX_BYTES):
+        if ttl < 0 or stale_while_revalidate < 0:
+            raise ValueError("Cache durations cannot be negative.")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+
+        self.directory = os.path.join(os.getcwd(), directory)
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_bytes = max_bytes
+        self.__lock = threading.Lock()
+        self.__in_flight = {}
+        self.__stats = {"hits": 0, "stale_hits": 0,
+                        "revalidated": 0, "misses": 0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        """Counters for fresh hits, stale hits, 304 revalidations and misses."""
+        with self.__lock:
+            return dict(self.__stats)
+
+    def key(self, url: str, params: dict = None) -> str:
+        """Return the cache key for a URL and its query parameters."""
+        canonical = json.dumps([url, sorted((params or {}).items())])
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, session: requests.Session, url: str, params: dict = None, timeout=None) -> CachedResponse:
+        """
+        Return the response for a request, from disk when possible.
+
+          Parameters:
+            session {requests.Session} —— the session used when the API has to be contacted
+            url {str} —— the API endpoint
+            params {dict} —— query parameters
+            timeout —— timeout passed to requests
+          Raises:
+            requests.RequestException if the API cannot be reached and nothing is stored.
+            requests.HTTPError if the server responds with an error status.
+          Returns:
+            response {CachedResponse} —— the stored or freshly downloaded response
+        """
+        key = self.key(url, params)
+        meta = self.__read_meta(key)
+        if meta is not None:
+            age = time.time() - meta["stored_at"]
+            cached = None
+            if age < self.ttl:
+                cached = self.__serve(key, meta, "hits")
+            elif age < self.ttl + self.stale_while_revalidate:
+                self.__revalidate_in_background(
+                    session, url, params, timeout, key, meta)
+                cached = self.__serve(key, meta, "stale_hits")
+            else:
+                return self.__fetch(session, url, params, timeout, key, meta)
+            if cached is not None:
+                return cached
+            # the body was evicted or replaced since the meta was read, so treat it as a miss
+            meta = None
+
+        return self.__fetch(session, url, params, timeout, key, meta)
+
+    def wait(self) -> None:
+        """Block until every background revalidation has finished."""
+        with self.__lock:
+            threads = list(self.__in_flight.values())
+        for thread in threads:
+            thread.join()
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def __paths(self, key: str) -> tuple[str, str]:
+        return (os.path.join(self.directory, f"{key}.body"),
+                os.path.join(self.directory, f"{key}.meta.json"))
+
+    def __read_meta(self, key: str) -> dict:
+        body_path, meta_path = self.__paths(key)
+        try:
+            with open(meta_path, "r") as file:
+                meta = json.load(file)
+            if not os.path.exists(body_path):
+                return None
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def __serve(self, key: str, meta: dict, counter: str) -> CachedResponse | None:
+        body_path, __ = self.__paths(key)
+        try:
+            with open(body_path, "rb") as file:
+                content = file.read()
+            # the body's modification time tracks recent use for eviction
+            os.utime(body_path)
+        except FileNotFoundError:
+            # removed by an eviction or a background revalidation since the meta was read
+            return None
+        with self.__lock:
+            self.__stats[counter] += 1
+        return CachedResponse(content, meta["url"], meta["links"])
+
+    def __fetch(self, session, url, params, timeout, key, meta, conditional: bool = True) -> CachedResponse:
+        headers = {}
+        if not conditional:
+            # None also drops any validators set on the session itself
+            headers = {"If-None-Match": None, "If-Modified-Since": None, "Cache-Control": "no-cache"}
+        elif meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = session.get(url, params=params,
+                                   headers=headers, timeout=timeout)
+        except requests.RequestException:
+            stale = None if meta is None else self.__serve(key, meta, "stale_hits")
+            if stale is None:
+                raise
+            return stale
+
+        if response.status_code == 304:
+            if meta is not None:
+                meta["stored_at"] = time.time()
+                self.__write(key, meta)
+                cached = self.__serve(key, meta, "revalidated")
+                if cached is not None:
+                    return cached
+            if not conditional:
+                raise requests.HTTPError(
+                    f"304 Not Modified for {url}, but no response is stored.", response=response)
+            # there is no stored body for the 304 to stand for, so download it in full
+            return self.__fetch(session, url, params, timeout, key, None, conditional=False)
+
+        response.raise_for_status()
+        meta = {
+            "url": response.url,
+            "links": response.links,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        self.__write(key, meta, response.content)
+        with self.__lock:
+            self.__stats["misses"] += 1
+        self.__evict()
+        return CachedResponse(response.content, meta["url"], meta["links"], response.status_code, False)
+
+    def __revalidate_in_background(self, session, url, params, timeout, key, meta) -> None:
+        with self.__lock:
+            if key in self.__in_flight:
+                return
+            thread = threading.Thread(target=self.__fetch_quietly, args=(
+                session, url, params, timeout, key, meta), daemon=True)
+            self.__in_flight[key] = thread
+        thread.start()
+
+    def __fetch_quietly(self, session, url, params, timeout, key, meta) -> None:
+        try:
+            self.__fetch(session, url, params, timeout, key, meta)
+        except requests.RequestException as e:
+            print(f"An error occurred while revalidating {url}: {e}")
+        finally:
+            with self.__lock:
+                self.__in_flight.pop(key, None)
+
+    def __write(self, key: str, meta: dict, content: bytes = None) -> None:
+        body_path, meta_path = self.__paths(key)
+        # write to a temporary file first so readers never see a partial entry
+        if content is not None:
+            with open(body_path + ".tmp", "wb") as file:
+                file.write(content)
+            os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w") as file:
+            json.dump(meta, file)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def __evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".body"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name[:-5]))
+
+        total = sum(size for __, size, __ in entries)
+        for __, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in self.__paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from api.cache import CachedResponse, ResponseCache
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+}
+
+# seconds to wait for the server to connect and to send data
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PAGES = 50
+
+
+class ApiClient:
+    """
+    The ApiClient class fetches event feeds from the Assabet calendar API over a pooled session.
+
+      Constructor:
+        Creates a requests session whose connection pool is sized to the number of worker threads, so concurrent fetches reuse warm connections instead of opening a new one per request. Use the client as a context manager, or call close(), to release the pool.
+
+      Parameters:
+        max_workers {int} —— number of requests to run at the same time
+        timeout {float | tuple} —— connect and read timeout passed to requests
+        page_param {str} —— query parameter holding the page number when paginating
+        max_pages {int} —— upper bound on the number of pages fetched for one request
+        headers {dict} —— headers sent with every request
+        cache {ResponseCache} —— optional on-disk cache responses are served from and revalidated against
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 page_param: str = "page", max_pages: int = DEFAULT_MAX_PAGES, headers: dict = None,
+                 cache: ResponseCache = None):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        if not isinstance(max_pages, int) or max_pages < 1:
+            raise ValueError("max_pages must be a positive integer.")
+
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.page_param = page_param
+        self.max_pages = max_pages
+        self.cache = cache
+
+        self.__session = requests.Session()
+        self.__session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers,
+                              pool_maxsize=max_workers)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session shared by every request made with this client."""
+        return self.__session
+
+    def close(self) -> None:
+        """Close the session and its pooled connections."""
+        self.__session.close()
+
+    def get(self, url: str, params: dict = None) -> requests.Response | CachedResponse:
+        """
+        Issue a single GET request on the pooled session, through the cache if the client has one.
+
+          Raises:
+            requests.HTTPError if the server responds with an error status.
+          Returns:
+            response {requests.Response | CachedResponse} —— the server's or the cache's response
+        """
+        if self.cache is not None:
+            return self.cache.get(self.__session, url, params, self.timeout)
+
+        response = self.__session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def fetch(self, url: str, params: dict = None, paginate: bool = True) -> list:
+        """
+        Fetch a feed, following pagination, and return its events.
+
+        Pages are followed through a "next" Link header when the server sends one, otherwise by incrementing the page parameter. Paging stops at an empty page, at a page identical to the previous one (the server ignoring the parameter) or after max_pages.
+
+          Parameters:
+            url {str} —— the API endpoint
+            params {dict} —— query parameters such as the branch or date range
+            paginate {bool} —— whether to request pages after the first one
+          Raises:
+            ValueError if a page is not a JSON list.
+            requests.HTTPError if the server responds with an error status.
+          Returns:
+            events {list} —— the pages merged into the [[event], ...] shape of the stored feeds
+        """
+        params = dict(params or {})
+        merged = []
+        previous = None
+        following_links = False
+        page_number = int(params.get(self.page_param, 1))
+
+        for __ in range(self.max_pages):
+            response = self.get(url, params)
+            page = response.json()
+            if not isinstance(page, list):
+                raise ValueError("Expected the API to return a JSON list.")
+            if not page or page == previous:
+                break
+            merged.extend(page)
+            previous = page
+
+            if not paginate:
+                break
+            if "next" in response.links:
+                url = urljoin(response.url, response.links["next"]["url"])
+                params = None
+                following_links = True
+            elif following_links:
+                break
+            else:
+                page_number += 1
+                params[self.page_param] = page_number
+
+        return merged
+
+    def fetch_many(self, requests_: list[tuple], paginate: bool = True) -> list:
+        """
+        Fetch several feeds concurrently, e.g. one per branch or date range, and merge them.
+
+          Parameters:
+            requests_ {list[tuple]} —— (url, params) pairs to fetch
+            paginate {bool} —— whether to follow pagination for each request
+          Raises:
+            The first error raised by any of the requests.
+          Returns:
+            events {list} —— every feed merged into the [[event], ...] shape, in the order the requests were given
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            feeds = executor.map(
+                lambda request: self.fetch(request[0], request[1], paginate), requests_)
+            merged = []
+            for feed in feeds:
+                merged.extend(feed)
+        return merged
@@ -0,0 +1,195 @@
+import marshal
+import os
+import sys
+
+
+SNAPSHOT_MAGIC = b"LTCS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_EXTENSION = ".snap"
+
+# flat columns kept for every event, in the order they are stored
+SNAPSHOT_FIELDS = ("id", "title", "start_date", "start_time", "end_date",
+                   "end_time", "canceled", "last_modified", "location_name", "branch_name")
+
+
+def snapshot_path_for(file_path: str) -> str:
+    """
+    Return the snapshot file name that belongs to a stored JSON feed, e.g. "lkwy-events.json" -> "lkwy-events.snap".
+    """
+    return os.path.splitext(file_path)[0] + SNAPSHOT_EXTENSION
+
+
+def source_fingerprint(full_file_path: str) -> tuple:
+    """
+    Return the (size, modification time) pair used to tell whether a source feed has changed since its snapshot was written.
+    Returns None if the file does not exist.
+    """
+    try:
+        stat = os.stat(full_file_path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def encode_snapshot(json_data: list, fingerprint: tuple = None) -> bytes:
+    """
+    Encode a feed as a compact binary snapshot.
+
+    Events are split into columns of interned strings, so values repeated across events (dates, times, locations) are written once and referenced afterwards. Only the fields used by the calendar are kept.
+
+        Parameters:
+            json_data -- list of lists of event dicts, full or projected
+            fingerprint -- optional (size, mtime) of the source JSON file
+
+        Returns:
+            bytes containing the snapshot.
+    """
+
+    columns = {field: [] for field in SNAPSHOT_FIELDS}
+    columns["categories"] = []
+    group_sizes = []
+    intern = sys.intern
+
+    for events in json_data:
+        group_sizes.append(len(events))
+        for item in events:
+            location = (item.get("locations") or [{}])[0]
+            values = (item.get("id"), item.get("title"), item.get("start_date"),
+                      item.get("start_time"), item.get("end_date"), item.get("end_time"),
+                      item.get("canceled"), item.get("last_modified"),
+                      location.get("location_name"), location.get("branch_name"))
+            for field, value in zip(SNAPSHOT_FIELDS, values):
+                columns[field].append(
+                    intern(value) if isinstance(value, str) else value)
+            columns["categories"].append(tuple(
+                intern(category.get("category_name") or "") for category in item.get("categories") or []))
+
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "source": fingerprint,
+        "group_sizes": group_sizes,
+        "columns": columns,
+    }
+    return SNAPSHOT_MAGIC + marshal.dumps(payload)
+
+
+def decode_snapshot(data: bytes) -> tuple:
+    """
+    Decode a snapshot written by encode_snapshot.
+
+        Parameters:
+            data -- bytes containing the snapshot
+
+        Returns:
+            (json_data, fingerprint) where json_data is the feed rebuilt as lists of projected event dicts.
+
+        Raises:
+            ValueError if the data is not a snapshot or was written by a different version.
+    """
+
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("Data is not an event snapshot.")
+    try:
+        payload = marshal.loads(data[len(SNAPSHOT_MAGIC):])
+    except (EOFError, TypeError, ValueError):
+        raise ValueError("Snapshot data is corrupted.")
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("Snapshot was written by an unsupported version.")
+
+    try:
+        json_data = _rebuild_feed(payload)
+    except (KeyError, StopIteration, TypeError):
+        raise ValueError("Snapshot data is corrupted.")
+
+    source = payload["source"]
+    return json_data, tuple(source) if source is not None else None
+
+
+def _rebuild_feed(payload: dict) -> list:
+    columns = payload["columns"]
+    rows = zip(*(columns[field] for field in SNAPSHOT_FIELDS),
+               columns["categories"])
+
+    json_data = []
+    for size in payload["group_sizes"]:
+        events = []
+        for __ in range(size):
+            (event_id, title, start_date, start_time, end_date, end_time,
+             canceled, last_modified, location_name, branch_name, categories) = next(rows)
+            events.append({
+                "id": event_id,
+                "title": title,
+                "start_date": start_date,
+                "start_time": start_time,
+                "end_date": end_date,
+                "end_time": end_time,
+                "canceled": canceled,
+                "last_modified": last_modified,
+                "locations": [{"location_name": location_name, "branch_name": branch_name}],
+                "categories": [{"category_name": name} for name in categories],
+            })
+        json_data.append(events)
+
+    return json_data
+
+
+def write_snapshot(json_data: list, file_path: str, source_file_path: str = None) -> bool:
+    """
+    Writes a binary snapshot of the JSON data to a file. The binary counterpart to write_json_to_file.
+
+    Storage path is relative to the current working directory - should be run from the project directory.
+
+        Parameters:
+            json_data: list containing the feed data to write
+            file_path: str representing the requested snapshot file name
+            source_file_path: optional str naming the stored JSON feed the data was read from, so the snapshot is rebuilt when that file changes
+
+        Returns:
+            True if successful, False if not.
+    """
+
+    storage_path = os.path.join(os.getcwd(), "src", "storage")
+    full_file_path = os.path.join(storage_path, file_path)
+    fingerprint = None
+    if source_file_path is not None:
+        fingerprint = source_fingerprint(
+            os.path.join(storage_path, source_file_path))
+
+    try:
+        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+        # write to a temporary file first so readers never see a partial snapshot
+        with open(full_file_path + ".tmp", 'wb') as file:
+            file.write(encode_snapshot(json_data, fingerprint))
+        os.replace(full_file_path + ".tmp", full_file_path)
+        return True
+
+    except OSError as e:
+        print(f"An error occurred while writing the snapshot: {e}")
+        return False
+
+
+def load_snapshot(file_path: str, source_file_path: str = None) -> list:
+    """
+    Loads a binary snapshot from storage.
+
+        Parameters:
+            file_path: str representing the snapshot file name
+            source_file_path: optional str naming the stored JSON feed the snapshot was built from
+
+        Returns:
+            The feed as lists of projected event dicts, or None if the snapshot is missing, unreadable, or older than its source feed.
+    """
+
+    storage_path = os.path.join(os.getcwd(), "src", "storage")
+    try:
+        with open(os.path.join(storage_path, file_path), 'rb') as file:
+            json_data, fingerprint = decode_snapshot(file.read())
+    except (OSError, ValueError):
+        return None
+
+    if source_file_path is not None:
+        current = source_fingerprint(
+            os.path.join(storage_path, source_file_path))
+        if current is None or current != fingerprint:
+            return None
+    return json_data
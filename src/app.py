@@ -1,16 +1,289 @@
+import argparse
+import calendar as month_calendar
+from datetime import date, datetime, timedelta
+import os
+import sys
+import time
 from event_calendar.event_calendar import EventCalendar
-from doc_builder.doc_builder import DocBuilder
-from api.api import *
-from doc_builder.settings import *
-from doc_builder.style import *
+from event_calendar.week_window import next_monday
+from event.validation import ValidationReport
+# python-docx, requests and dotenv are imported on the code paths that use them,
+# so a run only pays for what it renders with
+from api.api import get_api_data_from_storage, merge_feeds, stream_api_data_from_storage
+from instrument import instrument
 
 
-data = get_api_data_from_storage("lkwy-events.json")
-calendar = EventCalendar()
-calendar.events = data
-doc = DocBuilder(DEFAULT_FONT_STYLE,
-                 DEFAULT_FONT_SIZE, MARGINS_IN_INCHES, calendar)
-doc.init_table()
-doc.init_psa()
+def parse_month(value: str) -> date:
+    """Parse a "YYYY-MM" argument into the first day of that month."""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a month as YYYY-MM, got '{value}'")
 
-doc.save_document("calendar.docx")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate printable meeting room calendars from the library's event feed.")
+    parser.add_argument("--feed", nargs="+", default=["lkwy-events.json"], metavar="FILE",
+                        help="stored feeds to read, relative to src/storage; events found in several are merged by id")
+    parser.add_argument("--output", default="calendar.docx",
+                        help="document to write in single document mode")
+    parser.add_argument("--backend", choices=["python-docx", "streaming"], default="python-docx",
+                        help="build the document with python-docx or stream it straight into the .docx file")
+    parser.add_argument("--branches", nargs="+", metavar="NAME",
+                        help="render one document per listed room or branch in a process pool")
+    parser.add_argument("--all-branches", action="store_true",
+                        help="render one document for every room or branch in the feed")
+    parser.add_argument("--by", choices=["location", "branch"], default="location",
+                        help="split batch documents by room (location) or library (branch)")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        help="Monday of the first week to render, defaults to next week")
+    parser.add_argument("--weeks", type=int, default=1,
+                        help="number of consecutive weeks to render, one page each")
+    parser.add_argument("--month", type=parse_month, metavar="YYYY-MM",
+                        help="render every week of a month as pages of a single document")
+    parser.add_argument("--workers", type=int,
+                        help="number of worker processes in batch mode, defaults to the number of CPUs")
+    parser.add_argument("--out-dir", default="calendars",
+                        help="directory batch documents are written to")
+    parser.add_argument("--highlight-conflicts", action="store_true",
+                        help="shade events double-booked into the same room")
+    parser.add_argument("--list-conflicts", action="store_true",
+                        help="print every double booking in the feed instead of rendering a document")
+    parser.add_argument("--render-cache", metavar="PATH",
+                        help="keep the streaming backend's rendered event cells in PATH between runs")
+    parser.add_argument("--no-snapshot", dest="snapshot", action="store_false",
+                        help="parse the JSON feeds instead of loading them from their binary snapshots in src/storage")
+    parser.add_argument("--force", action="store_true",
+                        help="render documents even when their events and settings have not changed since the last run")
+    parser.add_argument("--import-report", nargs="?", const=20, type=int, metavar="N",
+                        help="run the command under python -X importtime and print the N slowest imports")
+    parser.add_argument("--trace-report", metavar="PATH",
+                        help="record stage timings and counters and write them to PATH as JSON")
+    parser.add_argument("--profile-stage", metavar="STAGE",
+                        help="also capture a cProfile of one stage, e.g. render.table, in the trace report")
+    parser.add_argument("--memory", action="store_true",
+                        help="record each stage's peak and retained memory in the trace report and print them")
+    args = parser.parse_args(argv)
+    if args.start is not None and args.start.weekday() != 0:
+        parser.error("--start must be a Monday.")
+    if args.weeks < 1:
+        parser.error("--weeks must be at least 1.")
+    if args.month is not None and (args.branches or args.all_branches):
+        parser.error("--month renders a single document and cannot be combined with batch mode.")
+    if args.profile_stage is not None and args.trace_report is None:
+        parser.error("--profile-stage needs --trace-report to write the profile to.")
+    if args.render_cache is not None and args.backend != "streaming":
+        parser.error("--render-cache only applies to the streaming backend.")
+    if args.render_cache is not None and (args.branches or args.all_branches):
+        parser.error("--render-cache cannot be shared by batch mode's worker processes.")
+    if args.memory and args.trace_report is None:
+        parser.error("--memory needs --trace-report to write the memory use to.")
+    missing = [feed for feed in args.feed
+               if not os.path.isfile(os.path.join(os.getcwd(), "src", "storage", feed))]
+    if missing:
+        parser.error(f"feed not found in src/storage: {', '.join(missing)}")
+    return args
+
+
+def selected_mondays(args: argparse.Namespace, calendar: EventCalendar) -> list[date]:
+    """Return the weeks a single document should show, or None for the default one week page."""
+    if args.month is not None:
+        last_day = month_calendar.monthrange(
+            args.month.year, args.month.month)[1]
+        return calendar.weeks_between(args.month, args.month.replace(day=last_day))
+    if args.start is None and args.weeks == 1:
+        return None
+    monday = args.start or calendar.week_window.monday
+    return [monday + timedelta(weeks=week) for week in range(args.weeks)]
+
+
+def load_records(args: argparse.Namespace, stream: bool = False) -> list[dict]:
+    """
+    Read every --feed in turn and merge them, so an event listed twice, in one feed or several, is only shown once.
+    Feeds are loaded from their binary snapshots, which are rebuilt whenever a feed changes. With --no-snapshot the JSON is parsed instead, or streamed one event at a time when stream is set.
+    """
+    if args.snapshot:
+        return merge_feeds(get_api_data_from_storage(feed, use_snapshot=True) for feed in args.feed)
+    if stream:
+        return merge_feeds(stream_api_data_from_storage(feed) for feed in args.feed)
+    return merge_feeds(get_api_data_from_storage(feed) for feed in args.feed)
+
+
+def load_calendar(args: argparse.Namespace) -> EventCalendar:
+    """Load the merged feeds into a series backed calendar, leaving out and reporting any record that fails validation."""
+    # recurring programs are stored once per series and only expanded for the weeks rendered
+    calendar = EventCalendar(series=True)
+    calendar.load_events(load_records(args), on_error="skip")
+    rejected = calendar.report.rejected_ids
+    if rejected:
+        print(f"Skipped {len(rejected)} invalid event(s): {', '.join(map(str, rejected))}",
+              file=sys.stderr)
+    return calendar
+
+
+def render_single(args: argparse.Namespace) -> None:
+    calendar = load_calendar(args)
+    mondays = selected_mondays(args, calendar)
+    from doc_builder.fingerprint import calendar_fingerprint, is_up_to_date
+
+    fingerprint = calendar_fingerprint(calendar, mondays, args.backend, args.highlight_conflicts)
+    if not args.force and is_up_to_date(args.output, fingerprint):
+        # checked before python-docx is imported, so an unchanged week costs little more than reading the feed
+        instrument.count("documents_skipped")
+        print(f"{args.output} is up to date.")
+        return
+
+    from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE, MARGINS_IN_INCHES
+    if args.backend == "streaming":
+        from doc_builder.ooxml_writer import CELL_CACHE, write_calendar
+        from doc_builder.render_cache import RenderCache
+
+        render_cache = CELL_CACHE
+        if args.render_cache is not None:
+            render_cache = RenderCache(file_path=args.render_cache)
+        write_calendar(calendar, args.output, DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE,
+                       mondays, fingerprint, render_cache, args.highlight_conflicts)
+        instrument.count("render_cache_hits", render_cache.stats["hits"])
+        instrument.count("render_cache_misses", render_cache.stats["misses"])
+        if args.render_cache is not None:
+            render_cache.save()
+        return
+
+    from doc_builder.doc_builder import DocBuilder
+
+    with instrument.span("render"):
+        doc = DocBuilder(DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE, MARGINS_IN_INCHES, calendar,
+                         highlight_conflicts=args.highlight_conflicts)
+        if mondays is None:
+            doc.init_table()
+            doc.init_psa()
+        else:
+            doc.init_weeks(mondays)
+
+    doc.save_document(args.output, fingerprint)
+
+
+def format_conflicts(conflicts: list) -> str:
+    """Lay double bookings out one per line, with each event's times as they appear on the calendar."""
+    lines = [f"{conflict.first.date}  {conflict.location}: "
+             f"{conflict.first.title} ({conflict.first.full_event_string()}) overlaps "
+             f"{conflict.second.title} ({conflict.second.full_event_string()})"
+             for conflict in conflicts]
+    lines.append(f"{len(conflicts)} double booking(s) found.")
+    return "\n".join(lines)
+
+
+def list_conflicts(args: argparse.Namespace) -> None:
+    calendar = load_calendar(args)
+    mondays = selected_mondays(args, calendar)
+    if mondays is None:
+        # without --start, --weeks or --month the whole feed is checked
+        conflicts = calendar.conflicts()
+    else:
+        conflicts = calendar.conflicts(mondays[0], mondays[-1] + timedelta(days=5))
+    print(format_conflicts(conflicts))
+
+
+def render_batch_documents(args: argparse.Namespace) -> None:
+    from batch.batch import format_summary, plan_jobs, render_batch, weeks_from
+
+    start = time.perf_counter()
+    monday = args.start
+    if monday is None:
+        monday = next_monday(date.today())
+    records = load_records(args, stream=True)
+    field = "branch_name" if args.by == "branch" else "location_name"
+    unplaced = ValidationReport()
+    jobs = plan_jobs(records, args.out_dir, weeks_from(monday, args.weeks),
+                     field, None if args.all_branches else args.branches, args.force, unplaced,
+                     args.highlight_conflicts, args.backend)
+
+    results = render_batch(jobs, args.workers)
+    print(format_summary(results, time.perf_counter() - start, len(unplaced.rejected_ids)))
+
+
+def format_import_report(importtime_output: str, limit: int = 20) -> str:
+    """
+    Summarize the output of python -X importtime as the slowest imports by cumulative time.
+
+      Parameters:
+        importtime_output {str} —— what the interpreter wrote to stderr
+        limit {int} —— how many imports to list
+      Returns:
+        report {str} —— one line per import followed by the total
+    """
+    imports = []
+    total = 0
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_us), int(self_us), name.strip()))
+        if not name[1:].startswith(" "):
+            # top level imports include everything they pulled in
+            total += int(cumulative_us)
+
+    imports.sort(reverse=True)
+    lines = [f"{'cumulative ms':>13}  {'self ms':>8}  module"]
+    for cumulative_us, self_us, name in imports[:limit]:
+        lines.append(f"{cumulative_us / 1000:>13.1f}  {self_us / 1000:>8.1f}  {name}")
+    lines.append(f"{len(imports)} modules imported in {total / 1000:.1f}ms")
+    return "\n".join(lines)
+
+
+def run_import_report(argv: list[str], limit: int) -> str:
+    """Run app.py with the given arguments under python -X importtime and return the import report."""
+    import subprocess
+
+    result = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+                            stderr=subprocess.PIPE, text=True)
+    # pass anything that is not import timing through, e.g. a traceback
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+    return format_import_report(result.stderr, limit)
+
+
+def without_import_report(argv: list[str]) -> list[str]:
+    """Return the arguments with --import-report and its optional count removed."""
+    remaining = []
+    skip_count = False
+    for argument in argv:
+        if skip_count and argument.isdigit():
+            skip_count = False
+            continue
+        skip_count = argument == "--import-report"
+        if not skip_count and not argument.startswith("--import-report="):
+            remaining.append(argument)
+    return remaining
+
+
+def main(argv=None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parse_args(argv)
+    if args.import_report is not None:
+        print(run_import_report(without_import_report(argv), args.import_report))
+        return
+
+    if args.trace_report is not None:
+        instrument.enable(args.profile_stage, args.memory)
+    try:
+        with instrument.span("run"):
+            if args.list_conflicts:
+                list_conflicts(args)
+            elif args.branches or args.all_branches:
+                render_batch_documents(args)
+            else:
+                render_single(args)
+    finally:
+        if args.trace_report is not None:
+            report = instrument.disable()
+            instrument.write_report(args.trace_report, report)
+            if args.memory:
+                print(instrument.format_memory_report(report))
+
+
+if __name__ == "__main__":
+    main()
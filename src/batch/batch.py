@@ -0,0 +1,177 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+import os
+import time
+from typing import NamedTuple
+from event_calendar.event_calendar import EventCalendar
+from event.validation import ValidationReport
+from event_store.event_store import partition_records
+from util.util import slugify
+
+
+BACKENDS = ("python-docx", "streaming")
+
+
+class RenderJob(NamedTuple):
+    """The documents of one location: its events, loaded once, and a document for each week."""
+
+    name: str
+    records: list
+    mondays: tuple
+    output_paths: tuple
+    force: bool = False
+    highlight_conflicts: bool = False
+    backend: str = "python-docx"
+
+
+class RenderResult(NamedTuple):
+    """The outcome of one document of a RenderJob, with the time spent rendering and saving it. Records rejected by validation are counted on the job's first document, which loads them."""
+
+    name: str
+    monday: date
+    output_path: str
+    event_count: int
+    seconds: float
+    skipped: bool = False
+    rejected: int = 0
+
+
+def plan_jobs(records, output_directory: str, mondays: list[date], field: str = "location_name",
+              branches=None, force: bool = False, report: ValidationReport = None,
+              highlight_conflicts: bool = False, backend: str = "python-docx") -> list[RenderJob]:
+    """
+    Split a feed into one render job per location (or branch), covering every week, so each location's events are sent to a worker and loaded only once.
+
+      Parameters:
+        records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+        output_directory {str} —— directory the documents are written to
+        mondays {list[datetime.date]} —— the first day of every week to render
+        field {str} —— "location_name" for one document per room, "branch_name" for one per library
+        branches {Iterable[str]} —— optional names to render, every other location is skipped
+        force {bool} —— render every document, even those already up to date
+        report {ValidationReport} —— optional report the records without a location, which no job can take, are added to
+        highlight_conflicts {bool} —— shade events double-booked into the same room
+        backend {str} —— build the documents with "python-docx" or the "streaming" writer
+      Raises:
+        ValueError if field is not a supported location field or backend is not a supported backend.
+      Returns:
+        jobs {list[RenderJob]} —— the jobs, in location order, each with its documents in week order
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}.")
+    mondays = tuple(mondays)
+    jobs = []
+    for key, partition in partition_records(records, field, branches, report).items():
+        output_paths = tuple(
+            os.path.join(output_directory, f"{slugify(key)}-{monday.strftime('%Y-%m-%d')}.docx")
+            for monday in mondays)
+        jobs.append(RenderJob(key, partition, mondays, output_paths, force,
+                              highlight_conflicts, backend))
+    return jobs
+
+
+def render_job(job: RenderJob) -> list[RenderResult]:
+    """
+    Load a location's events once, skipping invalid records, then render and save its document for each week, unless the document from an earlier run already shows the same events. Runs inside a worker process.
+
+      Parameters:
+        job {RenderJob} —— the job to render
+      Returns:
+        results {list[RenderResult]} —— one result per week, with where the document was written and how long it took
+    """
+    from doc_builder.fingerprint import calendar_fingerprint, is_up_to_date
+
+    start = time.perf_counter()
+    calendar = EventCalendar(series=True)
+    calendar.load_events(job.records, on_error="skip")
+    rejected = len(calendar.report.rejected_ids)
+
+    results = []
+    for monday, output_path in zip(job.mondays, job.output_paths):
+        calendar.select_week(monday)
+        event_count = sum(len(events) for events in calendar.events.values())
+
+        fingerprint = calendar_fingerprint(calendar, backend=job.backend,
+                                           highlight_conflicts=job.highlight_conflicts)
+        skipped = not job.force and is_up_to_date(output_path, fingerprint)
+        if not skipped and job.backend == "streaming":
+            from doc_builder.ooxml_writer import write_calendar
+            from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE
+
+            write_calendar(calendar, output_path, DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE,
+                           fingerprint=fingerprint, highlight_conflicts=job.highlight_conflicts)
+        elif not skipped:
+            from doc_builder.doc_builder import DocBuilder
+            from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE, MARGINS_IN_INCHES
+
+            doc = DocBuilder(DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE, MARGINS_IN_INCHES, calendar,
+                             highlight_conflicts=job.highlight_conflicts)
+            doc.init_table()
+            doc.init_psa()
+            doc.save_document(output_path, fingerprint)
+
+        results.append(RenderResult(job.name, monday, output_path, event_count,
+                                    time.perf_counter() - start, skipped, rejected))
+        # the load is counted once, on the first week
+        rejected = 0
+        start = time.perf_counter()
+    return results
+
+
+def render_batch(jobs: list[RenderJob], max_workers: int = None) -> list[RenderResult]:
+    """
+    Render every job in a process pool, so documents are built on all cores at once.
+
+      Parameters:
+        jobs {list[RenderJob]} —— the locations to render
+        max_workers {int} —— number of worker processes, defaults to the number of CPUs
+      Returns:
+        results {list[RenderResult]} —— one result per document, in job then week order
+    """
+    for job in jobs:
+        for output_path in job.output_paths:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    if max_workers == 1:
+        return [result for job in jobs for result in render_job(job)]
+
+    job_results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(render_job, job): index
+                   for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            job_results[futures[future]] = future.result()
+    return [result for results in job_results for result in results]
+
+
+def weeks_from(monday: date, count: int) -> list[date]:
+    """Return count consecutive Mondays starting from the given one."""
+    if count < 1:
+        raise ValueError("Week count must be at least 1.")
+    return [monday + timedelta(weeks=week) for week in range(count)]
+
+
+def format_summary(results: list[RenderResult], wall_seconds: float, rejected: int = 0) -> str:
+    """
+    Build a plain text summary of a batch run with per-document timings.
+
+      Parameters:
+        results {list[RenderResult]} —— the rendered documents
+        wall_seconds {float} —— total elapsed time for the batch
+        rejected {int} —— invalid records left out before any job was planned, e.g. those without a location
+      Returns:
+        summary {str} —— one line per document followed by a total line
+    """
+    lines = []
+    for result in results:
+        status = "  (up to date)" if result.skipped else ""
+        if result.rejected:
+            status += f"  ({result.rejected} invalid records skipped)"
+        lines.append(f"{result.seconds:8.3f}s  {result.event_count:5d} events  {result.output_path}{status}")
+    busy = sum(result.seconds for result in results)
+    skipped = sum(result.skipped for result in results)
+    rejected += sum(result.rejected for result in results)
+    lines.append(f"{len(results)} documents{f' ({skipped} up to date)' if skipped else ''} "
+                 f"in {wall_seconds:.3f}s ({busy:.3f}s of rendering across workers)"
+                 f"{f', {rejected} invalid records skipped' if rejected else ''}")
+    return "\n".join(lines)
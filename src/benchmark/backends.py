@@ -0,0 +1,90 @@
+"""
+Side by side timing of the python-docx (DocBuilder) and streaming (StreamingDocWriter) backends.
+
+Run from the src directory:
+    python -m benchmark.backends --events 100 1000 5000
+"""
+import argparse
+from datetime import date
+import os
+import tempfile
+import time
+import tracemalloc
+from benchmark.feed_generator import generate_events
+from event_calendar.event_calendar import EventCalendar
+
+
+def synthetic_week(event_count: int, monday: date) -> list[dict]:
+    """Build feed records spreading event_count events over the six days starting at monday."""
+    return list(generate_events(event_count, start=monday, days=6))
+
+
+def render_python_docx(calendar: EventCalendar, file_path: str) -> None:
+    from doc_builder.doc_builder import DocBuilder
+    from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE, MARGINS_IN_INCHES
+
+    doc = DocBuilder(DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE,
+                     MARGINS_IN_INCHES, calendar)
+    doc.init_table()
+    doc.init_psa()
+    doc.save_document(file_path)
+
+
+def render_streaming(calendar: EventCalendar, file_path: str) -> None:
+    from doc_builder.ooxml_writer import write_calendar
+    from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE
+
+    write_calendar(calendar, file_path, DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE)
+
+
+BACKENDS = {
+    "python-docx": render_python_docx,
+    "streaming": render_streaming,
+}
+
+
+def measure(render, calendar: EventCalendar, file_path: str) -> tuple[float, int]:
+    """
+    Return the seconds taken and the peak traced memory in bytes for one render.
+    Timing and tracing are separate runs since tracemalloc slows allocation heavy code down.
+    """
+    start = time.perf_counter()
+    render(calendar, file_path)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    render(calendar, file_path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="number of events in the rendered week")
+    args = parser.parse_args(argv)
+
+    monday = date(2025, 7, 7)
+    print(f"{'events':>8}  {'backend':<12} {'seconds':>8}  {'peak MiB':>8}  {'size KiB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        # import both backends before anything is timed
+        warm_up = EventCalendar()
+        warm_up.load_events(synthetic_week(6, monday))
+        warm_up.select_week(monday)
+        for name, render in BACKENDS.items():
+            render(warm_up, os.path.join(directory, f"warm-up-{name}.docx"))
+
+        for event_count in args.events:
+            calendar = EventCalendar()
+            calendar.load_events(synthetic_week(event_count, monday))
+            calendar.select_week(monday)
+            for name, render in BACKENDS.items():
+                file_path = os.path.join(directory, f"{name}-{event_count}.docx")
+                seconds, peak = measure(render, calendar, file_path)
+                print(f"{event_count:>8}  {name:<12} {seconds:>8.3f}  {peak / 2 ** 20:>8.2f}  "
+                      f"{os.path.getsize(file_path) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Synthetic Assabet-shaped feeds for benchmarking, from a thousand to a million events.
+
+Run from the src directory:
+    python -m benchmark.feed_generator --size 100k --output storage/bench-100k.json
+"""
+import argparse
+from datetime import date, timedelta
+import json
+import random
+from util.util import slugify
+
+
+# the preset sizes the benchmark suite runs at
+FEED_SIZES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# rooms per branch, as they appear in the sample feed
+DEFAULT_BRANCHES = {
+    "Lakeway Library": ["Lakeway Meeting Room", "Lakeway"],
+    "West Library": ["West Meeting Room", "West"],
+}
+
+ADDRESSES = {
+    "Lakeway Library": "1938 Lohmans Crossing, Lakeway, TX, 78734",
+    "West Library": "14430 FM 620 N, Austin, TX, 78732",
+}
+
+TITLES = [
+    "Bow Wow Reading", "Tech Coach", "Preschool Story Time", "Mah Jongg", "Story Time",
+    "West Book Club", "Power for Parkinsons", "Lake Travis Senior Services",
+    "Hybrid Social Justice Book Club", "Third Grade and Up Library Camp", "Chess Club",
+    "Teen Advisory Board", "Knitting Circle", "ESL Conversation Group", "Lego Builders",
+]
+
+CATEGORIES = ["Children", "Adult", "All Ages"]
+
+# relative share of events on Monday to Sunday; the branches are closed on Sundays
+DEFAULT_WEEKDAY_WEIGHTS = (1, 1, 1, 1, 1, 0.6, 0)
+
+DURATIONS_IN_MINUTES = (30, 60, 90, 120)
+
+
+def feed_size(value: str) -> int:
+    """Turn a preset name such as "10k" or a plain number into an event count."""
+    if value.casefold() in FEED_SIZES:
+        return FEED_SIZES[value.casefold()]
+    count = int(value)
+    if count < 1:
+        raise ValueError("Feeds must have at least one event.")
+    return count
+
+
+def generate_events(count: int, branches: dict = None, branch_weights: dict = None,
+                    start: date = date(2025, 7, 1), days: int = 62,
+                    weekday_weights: tuple = DEFAULT_WEEKDAY_WEIGHTS,
+                    canceled_ratio: float = 0.02, seed: int = 0):
+    """
+    Generate events with the same structure as src/storage/all-events.json, one at a time.
+
+      Parameters:
+        count {int} —— number of events to generate
+        branches {dict[str, list[str]]} —— room names keyed by branch name, defaults to the two sample branches
+        branch_weights {dict[str, float]} —— relative share of events per branch, defaults to an even split
+        start {datetime.date} —— first day events can fall on
+        days {int} —— number of days events are spread over
+        weekday_weights {tuple[float]} —— relative share of events on Monday to Sunday
+        canceled_ratio {float} —— share of events marked as canceled
+        seed {int} —— seed for the random generator, the same seed always gives the same feed
+      Raises:
+        ValueError if no day in the range can hold events.
+      Returns:
+        events {Generator[dict]} —— event dicts as they appear in the Assabet feed
+    """
+    branches = branches or DEFAULT_BRANCHES
+    names = list(branches)
+    weights = [branch_weights.get(name, 0) for name in names] if branch_weights else None
+
+    calendar_days = [start + timedelta(days=offset) for offset in range(days)]
+    day_weights = [weekday_weights[day.weekday()] for day in calendar_days]
+    if not any(day_weights):
+        raise ValueError("The date range has no days that can hold events.")
+    day_strings = [day.strftime("%Y-%m-%d") for day in calendar_days]
+
+    rng = random.Random(seed)
+    # each title is a recurring series, numbered like the feed's "tech-coach-189" ids
+    series_counts = [0] * len(TITLES)
+    for _ in range(count):
+        branch = rng.choices(names, weights)[0]
+        room = rng.choice(branches[branch])
+        day = rng.choices(day_strings, day_weights)[0]
+        title_index = rng.randrange(len(TITLES))
+        series_counts[title_index] += 1
+        start_minutes = rng.randrange(9 * 60, 19 * 60, 15)
+        end_minutes = start_minutes + rng.choice(DURATIONS_IN_MINUTES)
+        title = TITLES[title_index]
+        event_id = f"{slugify(title)}-{series_counts[title_index]}"
+        yield {
+            "id": event_id,
+            "title": title,
+            "start_date": day,
+            "start_time": f"{start_minutes // 60:02d}:{start_minutes % 60:02d}:00 -0500",
+            "end_date": day,
+            "end_time": f"{end_minutes // 60:02d}:{end_minutes % 60:02d}:00 -0500",
+            "canceled": "1" if rng.random() < canceled_ratio else "0",
+            "locations": [{
+                "address": ADDRESSES.get(branch, ""),
+                "branch_name": branch,
+                "location_name": room,
+                "location_virtual": "0",
+            }],
+            "categories": [{"category_name": rng.choice(CATEGORIES)}],
+            "url": f"https://laketravislibrary.assabetinteractive.com/calendar/{event_id}/",
+            "description": f"<p>{title} at the {branch}.</p>\n",
+            "image": {"alt": title, "url": ""},
+            "registration": {
+                "maximum_attendees": "",
+                "registration_ends": "",
+                "registration_required": "0",
+                "registration_starts": "",
+                "waitlist": "0",
+            },
+        }
+
+
+def generate_feed(count: int, **options) -> list[list[dict]]:
+    """
+    Generate a whole feed in memory, one event per group like the stored feeds.
+
+      Parameters:
+        count {int} —— number of events to generate
+        options —— any of generate_events' distribution options
+      Returns:
+        feed {list[list[dict]]} —— the feed
+    """
+    return [[event] for event in generate_events(count, **options)]
+
+
+def write_feed(file_path: str, count: int, **options) -> int:
+    """
+    Write a generated feed to a JSON file one event at a time, so even a million event feed is never held in memory.
+
+      Parameters:
+        file_path {str} —— where to write the feed
+        count {int} —— number of events to generate
+        options —— any of generate_events' distribution options
+      Returns:
+        count {int} —— the number of events written
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for index, event in enumerate(generate_events(count, **options)):
+            if index:
+                file.write(",\n")
+            file.write("[")
+            file.write(json.dumps(event))
+            file.write("]")
+        file.write("]\n")
+    return count
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=feed_size, default="10k",
+                        help="number of events, or one of " + ", ".join(FEED_SIZES))
+    parser.add_argument("--output", required=True, help="file to write the feed to")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 7, 1),
+                        help="first day events can fall on")
+    parser.add_argument("--days", type=int, default=62,
+                        help="number of days events are spread over")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_feed(args.output, args.size, start=args.start,
+               days=args.days, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
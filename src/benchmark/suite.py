@@ -0,0 +1,220 @@
+"""
+End-to-end benchmark of the calendar pipeline on generated feeds, stage by stage.
+
+Run from the src directory:
+    python -m benchmark.suite --sizes 1k 10k 100k
+    python -m benchmark.suite --sizes 1k 10k --save-baseline
+    python -m benchmark.suite --sizes 1k 10k --compare
+
+baselines.json is recorded on a single host and its timings are absolute, see README.md in this directory for the machine and how to regenerate it.
+"""
+import argparse
+from datetime import date
+import json
+import os
+import sys
+import tempfile
+import time
+from api.api import get_api_data_from_storage
+from benchmark.feed_generator import FEED_SIZES, feed_size, write_feed
+from event_calendar.event_calendar import EventCalendar
+from event_store.event_store import partition_records
+from instrument.instrument import current_rss_bytes
+from util.util import _format_time, format_times
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, where peak memory is reported as 0
+    resource = None
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# a stage counts as a regression once it is this many times slower than its baseline
+DEFAULT_TOLERANCE = 1.25
+
+# stages faster than this are too noisy to compare
+MIN_COMPARED_SECONDS = 0.005
+
+FEED_START = date(2025, 7, 1)
+RENDERED_WEEK = date(2025, 7, 7)
+
+
+def peak_rss_bytes() -> int:
+    """The highest resident memory use of this process so far. It only ever grows, so it cannot tell which stage used the memory."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def stage_parse(state: dict) -> None:
+    state["feed"] = get_api_data_from_storage(state["feed_path"])
+
+
+def stage_filter(state: dict) -> None:
+    state["records"] = [item for group in state.pop("feed") for item in group]
+    state["partitions"] = partition_records(state["records"])
+
+
+def stage_events(state: dict) -> None:
+    calendar = EventCalendar(today=FEED_START)
+    calendar.load_events(state["records"], on_error="skip")
+    state["calendar"] = calendar
+
+
+def stage_format_time(state: dict) -> None:
+    _format_time.cache_clear()
+    records = state["records"]
+    format_times(item["start_time"] for item in records)
+    format_times(item["end_time"] for item in records)
+
+
+def stage_render(state: dict) -> None:
+    from doc_builder.doc_builder import DocBuilder
+    from doc_builder.settings import DEFAULT_FONT_SIZE, DEFAULT_FONT_STYLE, MARGINS_IN_INCHES
+
+    calendar = state["calendar"]
+    calendar.select_week(RENDERED_WEEK)
+    doc = DocBuilder(DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE,
+                     MARGINS_IN_INCHES, calendar)
+    doc.init_table()
+    doc.init_psa()
+    state["doc"] = doc
+
+
+def stage_save(state: dict) -> None:
+    state.pop("doc").save_document(state["output_path"])
+
+
+# the pipeline in the order the app runs it
+STAGES = [
+    ("parse", stage_parse),
+    ("filter", stage_filter),
+    ("events", stage_events),
+    ("format_time", stage_format_time),
+    ("render", stage_render),
+    ("save", stage_save),
+]
+
+
+def run_benchmark(count: int, directory: str, seed: int = 0) -> dict[str, dict]:
+    """
+    Generate a feed of the given size and time every stage of the pipeline on it.
+
+      Parameters:
+        count {int} —— number of events in the generated feed
+        directory {str} —— where the feed and the rendered document are written
+        seed {int} —— seed for the feed generator
+      Returns:
+        stages {dict[str, dict]} —— for every stage in pipeline order, its "seconds", "rss_growth_mib", how much the resident memory grew while it ran (None where the platform does not report it), and "cumulative_peak_rss_mib", the process's peak so far
+    """
+    state = {
+        "feed_path": os.path.join(directory, f"feed-{count}.json"),
+        "output_path": os.path.join(directory, f"calendar-{count}.docx"),
+    }
+    write_feed(state["feed_path"], count, start=FEED_START, seed=seed)
+
+    stages = {}
+    for name, stage in STAGES:
+        resident = current_rss_bytes()
+        start = time.perf_counter()
+        stage(state)
+        seconds = time.perf_counter() - start
+        growth = None
+        if resident is not None:
+            growth = round((current_rss_bytes() - resident) / 2 ** 20, 1)
+        stages[name] = {
+            "seconds": round(seconds, 6),
+            "rss_growth_mib": growth,
+            "cumulative_peak_rss_mib": round(peak_rss_bytes() / 2 ** 20, 1),
+        }
+    return stages
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    Find the stages that got slower than the stored baseline allows.
+
+      Parameters:
+        results {dict} —— stage results keyed by size name, as built by main
+        baseline {dict} —— results loaded from a baseline file
+        tolerance {float} —— how many times slower than the baseline a stage may be
+      Returns:
+        regressions {list[str]} —— one description per slower stage, empty when nothing regressed
+    """
+    regressions = []
+    for size, stages in results.items():
+        for name, result in stages.items():
+            expected = baseline.get(size, {}).get(name)
+            if expected is None or expected["seconds"] < MIN_COMPARED_SECONDS:
+                continue
+            ratio = result["seconds"] / expected["seconds"]
+            if ratio > tolerance:
+                regressions.append(f"{size} {name}: {result['seconds']:.3f}s vs "
+                                   f"{expected['seconds']:.3f}s baseline ({ratio:.2f}x)")
+    return regressions
+
+
+def format_results(results: dict, baseline: dict = None) -> str:
+    """Lay the results out as a table, with the ratio to the baseline when one is given."""
+    header = (f"{'size':>6}  {'stage':<12} {'seconds':>9}  {'RSS growth MiB':>14}"
+              f"  {'peak RSS so far MiB':>19}")
+    lines = [header + ("  vs baseline" if baseline else "")]
+    for size, stages in results.items():
+        for name, result in stages.items():
+            growth = result.get("rss_growth_mib")
+            growth = "n/a" if growth is None else f"{growth:.1f}"
+            line = (f"{size:>6}  {name:<12} {result['seconds']:>9.3f}  {growth:>14}"
+                    f"  {result['cumulative_peak_rss_mib']:>19.1f}")
+            expected = (baseline or {}).get(size, {}).get(name)
+            if expected and expected["seconds"]:
+                line += f"  {result['seconds'] / expected['seconds']:>10.2f}x"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1k", "10k", "100k"],
+                        help="feed sizes to run, any of " + ", ".join(FEED_SIZES) + " or a number")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="baseline file to save to or compare with")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare with the baseline and exit with 1 if any stage regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    # import python-docx up front so the first size's render stage does not include it
+    import doc_builder.doc_builder
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results[size] = run_benchmark(feed_size(size), directory, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+from copy import deepcopy
+import io
+import os
 from docx import Document, types
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.section import WD_ORIENT
@@ -6,7 +9,10 @@ from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import qn, nsdecls
+from doc_builder.fingerprint import is_up_to_date, normalize_zip, template_fingerprint
+from event_calendar.conflicts import double_booked
 from event_calendar.event_calendar import EventCalendar
+from instrument import instrument
 
 
 class DocBuilder:
@@ -15,16 +21,78 @@ class DocBuilder:
 
       Constructor:
         The constructor will create an instance of the Document class from the python-docx library, then initialize some settings that are imported from the settings module. Since the calendar is a singular file and source of information that won't be changed, this information can all be satic. Any style changes should be made in the settings module.
+
+        The page set up, styles and header are the same for every document using the same settings, so they are prepared once per process into a base template and each new document is opened from a copy of it. Passing template_path keeps that template on disk as well, so later runs load it instead of preparing it again. The file records the settings it was prepared from and is prepared again when they change.
+
+        With highlight_conflicts, events double-booked into the same room are shaded so staff can spot them on the printed page.
     """
 
-    def __init__(self, font_style: str, font_size: int, margins: dict, calendar: EventCalendar = None):
-        self.__doc = Document()
+    # prepared base documents shared by every builder, keyed by template path, font and margins
+    __templates = {}
+    # the quiet room notice, built once per page width and cloned into each document
+    __psa_blocks = {}
+
+    def __init__(self, font_style: str, font_size: int, margins: dict, calendar: EventCalendar = None,
+                 template_path: str = None, highlight_conflicts: bool = False):
         self.__table = None
+        self.__event_prototype = None
         self.calendar = calendar
+        self.highlight_conflicts = highlight_conflicts
+        self.__doc = Document(io.BytesIO(self.base_template(
+            font_style, font_size, margins, template_path)))
         self.margins = margins
-        self.set_page_orientation()
-        self.set_doc_styles(font_style, font_size)
-        self.set_page_header()
+
+    @classmethod
+    def base_template(cls, font_style: str, font_size: int, margins: dict, template_path: str = None) -> bytes:
+        """
+        Returns the prepared base document for the given settings, building it on first use.
+
+          Parameters:
+            font_style {str} —— the default font style
+            font_size {int} —— the default font size
+            margins {dict} —— margin values in inches with keys "top", "bottom", "left", and "right"
+            template_path {str} —— optional .docx file the template is loaded from, or written to if it is missing or was prepared from other settings
+          Returns:
+            {bytes} —— the template as a .docx file
+        """
+        try:
+            key = (template_path, font_style, font_size,
+                   tuple(sorted(margins.items())))
+            template = cls.__templates.get(key)
+        except (AttributeError, TypeError):
+            # unusable settings are reported by the setters of the builder preparing the template
+            key, template = None, None
+        if template is not None:
+            return template
+
+        fingerprint = None
+        if template_path is not None:
+            try:
+                fingerprint = template_fingerprint(font_style, font_size, margins)
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+        if fingerprint is not None and is_up_to_date(template_path, fingerprint):
+            with open(template_path, "rb") as file:
+                template = file.read()
+        else:
+            builder = cls.__new__(cls)
+            builder.__doc = Document()
+            builder.margins = margins
+            builder.set_page_orientation()
+            builder.set_doc_styles(font_style, font_size)
+            builder.set_page_header()
+            builder.add_psa_style()
+            buffer = io.BytesIO()
+            builder.__doc.save(buffer)
+            template = normalize_zip(buffer.getvalue(), fingerprint)
+            if template_path is not None:
+                with open(template_path, "wb") as file:
+                    file.write(template)
+
+        if key is not None:
+            cls.__templates[key] = template
+        return template
 
     @property
     def margins(self) -> dict:
@@ -163,14 +231,34 @@ class DocBuilder:
         text.text = "Meeting Room Schedule"
 
     def init_table(self):
-        self.__table = self.create_table(
-            rows=3, cols=6, cell_width_inches=1.65)
-        self.__table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        self.__table.autofit = False
-        self.__table.style = 'Table Grid'
-        self.set_table_weekdays()
-        self.set_table_dates()
-        self.populate_table_with_events()
+        with instrument.span("render.table"):
+            self.__table = self.create_table(
+                rows=3, cols=6, cell_width_inches=1.65)
+            self.__table.alignment = WD_TABLE_ALIGNMENT.CENTER
+            self.__table.autofit = False
+            self.__table.style = 'Table Grid'
+            self.set_table_weekdays()
+            self.set_table_dates()
+            self.populate_table_with_events()
+
+    def init_weeks(self, mondays: list, psa: bool = True) -> None:
+        """
+        Lays out several weeks in one document, each week's table (and quiet room notice) on its own page.
+        The calendar selects each week in turn, so its events are looked up per page rather than all at once.
+
+          Parameters:
+            mondays {list[datetime.date]} —— the first day of every week, e.g. from EventCalendar.weeks_between
+            psa {bool} —— whether to add the quiet room notice below every week
+          Returns:
+              None
+        """
+        for index, monday in enumerate(mondays):
+            if index:
+                self.__doc.add_page_break()
+            self.calendar.select_week(monday)
+            self.init_table()
+            if psa:
+                self.init_psa()
 
     def create_table(self, rows, cols, cell_width_inches, parent=None) -> types.ProvidesXmlPart:
         """
@@ -200,6 +288,8 @@ class DocBuilder:
         # set headers of the table
         day_headers = self.__table.rows[0].cells
         week = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+        shading = parse_xml(
+            r'<w:shd {} w:fill="5b9bd7"/>'.format(nsdecls('w')))
         for day in range(0, len(week)):
             paragraph = day_headers[day].paragraphs[0]
             paragraph.alignment = WD_TABLE_ALIGNMENT.CENTER
@@ -211,14 +301,12 @@ class DocBuilder:
             text.font.color.rgb = RGBColor(255, 255, 255)
             text.font.size = Pt(12)
 
-            shading = parse_xml(
-                r'<w:shd {} w:fill="5b9bd7"/>'.format(nsdecls('w')))
             styles = day_headers[day]._element.get_or_add_tcPr()
-            styles.append(shading)
+            styles.append(deepcopy(shading))
 
     def set_table_dates(self):
         # set dates of the table
-        dates = self.calendar.get_next_weeks_dates()
+        dates = self.calendar.week_window.dates
         date_headers = self.__table.rows[1].cells
         for date in range(0, len(dates)):
             paragraph = date_headers[date].paragraphs[0]
@@ -226,30 +314,102 @@ class DocBuilder:
             text = paragraph.add_run(dates[date][-2::])
 
     def populate_table_with_events(self):
-        # set table events
+        # set table events, each day in the column matching its date
         event_containers = self.__table.rows[2].cells
-        for index, (__, events) in enumerate(self.calendar.events.items()):
-            container = event_containers[index]
-
-            cell_idx = 0
+        columns = {day: index for index,
+                   day in enumerate(self.calendar.week_window.dates)}
+        conflicting = double_booked(
+            self.calendar.events, self.calendar.report.canceled) if self.highlight_conflicts else set()
+        for day, events in self.calendar.events.items():
+            if day not in columns:
+                continue
+            container = event_containers[columns[day]]
+            instrument.count("events_rendered", len(events))
             for event in events:
-                table = self.create_table(1, 1, 1.4, container)
-                table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-                # style cell
-                cell = table.cell(0, 0)
-                styles = cell._element.get_or_add_tcPr()
-                borders = OxmlElement('w:tcBorders')
-                styles.append(borders)
-                self.append_border_styles(borders)
-
-                # add data to cell
-                event_text = cell.paragraphs[0]
-                event_text.paragraph_format.space_before = Pt(0)
-                title = event_text.add_run(event.title + "\n")
-                title.bold = True
-                date = event_text.add_run(event.full_event_string())
-                cell_idx += 1
+                self.add_event_cell(
+                    container, event.title, event.full_event_string(), id(event) in conflicting)
+
+    def add_event_cell(self, container, title: str, time_text: str, conflict: bool = False) -> None:
+        """
+        Appends a bordered event cell holding the title and time of an event to a day's container cell.
+
+        The styled cell is built once per document and cloned for every event, so only the text is filled in per event.
+        Finished cells are not kept in a RenderCache here: filling in a clone costs less than copying and parsing a cached cell's XML back into the document, so only the streaming backend uses one.
+
+          Parameters:
+            container —— the day's cell in the calendar table
+            title {str} —— the event title, shown in bold
+            time_text {str} —— the event's formatted start and end time
+            conflict {bool} —— shade the cell to mark the event as double-booked
+        """
+        if any(char in title + time_text for char in "\n\t\r"):
+            # add_run turns these characters into breaks and tabs, so let it lay the text out
+            table = self.create_event_table(container)
+            paragraph = table.cell(0, 0).paragraphs[0]
+            paragraph.add_run(title + "\n").bold = True
+            paragraph.add_run(time_text)
+            if conflict:
+                table.cell(0, 0)._element.get_or_add_tcPr().append(self.conflict_shading())
+            return
+
+        tbl = deepcopy(self.event_cell_prototype(container))
+        title_text, event_time = tbl.iter(qn('w:t'))
+        for element, text in ((title_text, title), (event_time, time_text)):
+            element.text = text
+            if text != text.strip():
+                element.set(qn('xml:space'), 'preserve')
+        if conflict:
+            tbl.find('.//' + qn('w:tcPr')).append(self.conflict_shading())
+
+        container._tc.append(tbl)
+        # Word requires every cell to end with a paragraph
+        container._tc.append(OxmlElement('w:p'))
+
+    def conflict_shading(self):
+        """Returns the light red shading that marks a double-booked event cell."""
+        return parse_xml(
+            r'<w:shd {} w:fill="f4cccc"/>'.format(nsdecls('w')))
+
+    def event_cell_prototype(self, container):
+        """
+        Returns the styled, single cell table that every event cell is cloned from, building it on first use.
+
+        Parameters:
+            container —— a day's cell in the calendar table, used to size the prototype
+        """
+        if self.__event_prototype is None:
+            table = self.create_event_table(container)
+            paragraph = table.cell(0, 0).paragraphs[0]
+            paragraph.add_run("title\n").bold = True
+            paragraph.add_run("time")
+
+            # detach the table and its trailing paragraph, keeping only the prototype
+            container._tc.remove(container._tc[-1])
+            container._tc.remove(table._tbl)
+            self.__event_prototype = table._tbl
+        return self.__event_prototype
+
+    def create_event_table(self, container) -> types.ProvidesXmlPart:
+        """
+        Creates an empty bordered single cell table for an event inside a day's container cell.
+
+        Parameters:
+            container —— the cell the event table is added to
+        Returns:
+            table —— The created table
+        """
+        table = self.create_table(1, 1, 1.4, container)
+        table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+        # style cell
+        cell = table.cell(0, 0)
+        styles = cell._element.get_or_add_tcPr()
+        borders = OxmlElement('w:tcBorders')
+        styles.append(borders)
+        self.append_border_styles(borders)
+
+        cell.paragraphs[0].paragraph_format.space_before = Pt(0)
+        return table
 
     def append_border_styles(self, border, sides=['top', 'left', 'bottom', 'right']):
         for border_type in sides:
@@ -260,7 +420,40 @@ class DocBuilder:
             border_elm.set(qn('w:color'), '000000')
             border.append(border_elm)
 
+    def add_psa_style(self) -> None:
+        """Adds the character style used by the quiet room notice, unless the document already has it."""
+        styles = self.styles
+        if 'psa' in styles:
+            return
+        psa_style = styles.add_style('psa', WD_STYLE_TYPE.CHARACTER)
+        psa_font = psa_style.font
+        psa_font.color.rgb = RGBColor(255, 255, 255)
+        psa_font.size = Pt(30)
+
     def init_psa(self):
+        with instrument.span("render.psa"):
+            self.add_psa_notice()
+
+    def add_psa_notice(self) -> None:
+        """Adds the quiet room notice, cloning it when one of the same width was already built."""
+        self.add_psa_style()
+        section = self.__doc.sections[-1]
+        key = (section.page_width, section.left_margin, section.right_margin)
+        psa_block = DocBuilder.__psa_blocks.get(key)
+        if psa_block is None:
+            DocBuilder.__psa_blocks[key] = deepcopy(
+                self.create_psa_table()._tbl)
+            return
+        # the notice is identical in every document of the same width, so clone the one already built
+        self.__doc.element.body._insert_tbl(deepcopy(psa_block))
+
+    def create_psa_table(self) -> types.ProvidesXmlPart:
+        """
+        Creates the shaded quiet room notice below the calendar table.
+
+        Returns:
+            table —— The created table
+        """
         quiet_room = self.create_table(1, 1, 9.9)
         quiet_room.alignment = WD_TABLE_ALIGNMENT.CENTER
         quiet_room.autofit = False
@@ -270,11 +463,6 @@ class DocBuilder:
         paragraph = container.paragraphs[0]
         paragraph.alignment = WD_TABLE_ALIGNMENT.CENTER
 
-        styles = self.styles
-        psa_style = styles.add_style('psa', WD_STYLE_TYPE.CHARACTER)
-        psa_font = psa_style.font
-        psa_font.color.rgb = RGBColor(255, 255, 255)
-        psa_font.size = Pt(30)
         psa_text = "The meeting room is available for public use as a quiet space when not reserved."
         paragraph.add_run(psa_text, style='psa').bold = True
 
@@ -290,6 +478,23 @@ class DocBuilder:
             r'<w:shd {} w:fill="5b9bd7"/>'.format(nsdecls('w')))
         styles = container._element.get_or_add_tcPr()
         styles.append(shading)
+        return quiet_room
 
-    def save_document(self, file_path):
-        self.__doc.save(file_path)
+    def save_document(self, file_path, fingerprint: str = None):
+        """
+        Saves the document with fixed timestamps on its parts, so the same calendar always gives a byte-identical file.
+
+          Parameters:
+            file_path —— a path, or a binary file object to write the document to
+            fingerprint {str} —— optional fingerprint of the calendar, see fingerprint.calendar_fingerprint, recorded so a later run can skip an unchanged document
+        """
+        with instrument.span("save"):
+            buffer = io.BytesIO()
+            self.__doc.save(buffer)
+            data = normalize_zip(buffer.getvalue(), fingerprint)
+            if hasattr(file_path, "write"):
+                file_path.write(data)
+            else:
+                with open(file_path, "wb") as file:
+                    file.write(data)
+        instrument.count("bytes_written", len(data))
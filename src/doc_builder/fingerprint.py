@@ -0,0 +1,139 @@
+from functools import lru_cache
+import hashlib
+import io
+import os
+import zipfile
+
+
+# bump whenever a change to DocBuilder or the streaming writer changes what a document looks like
+TEMPLATE_VERSION = 1
+
+# every entry of a saved document gets this timestamp, so the same content always gives the same bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# the fingerprint is kept in the zip comment of the document it was rendered into, which Word ignores
+# and drops when it saves the file, so a document edited by hand is never mistaken for an up to date one
+FINGERPRINT_PREFIX = b"calendar-fingerprint:"
+
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), "settings.py")
+
+
+def zip_entry(name: str) -> zipfile.ZipInfo:
+    """Return the header for a compressed document part with the fixed ZIP_DATE_TIME timestamp."""
+    info = zipfile.ZipInfo(name, ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def fingerprint_comment(fingerprint: str = None) -> bytes:
+    """The zip comment recording the given fingerprint, empty when there is none."""
+    if fingerprint is None:
+        return b""
+    return FINGERPRINT_PREFIX + fingerprint.encode("ascii")
+
+
+def normalize_zip(data: bytes, fingerprint: str = None) -> bytes:
+    """
+    Rewrite a saved .docx file so every part carries the fixed ZIP_DATE_TIME timestamp instead of the time it was saved.
+
+      Parameters:
+        data {bytes} —— the .docx file, e.g. as saved by python-docx
+        fingerprint {str} —— optional fingerprint of the content, see calendar_fingerprint, stored in the zip comment
+      Returns:
+        {bytes} —— the same parts, in the same order, with fixed timestamps
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, \
+            zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as target:
+        target.comment = fingerprint_comment(fingerprint)
+        for info in source.infolist():
+            target.writestr(zip_entry(info.filename), source.read(info))
+    return output.getvalue()
+
+
+@lru_cache(maxsize=1)
+def settings_digest() -> str:
+    """The hash of doc_builder/settings.py, so editing the layout settings changes every fingerprint without importing python-docx."""
+    with open(SETTINGS_PATH, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def template_fingerprint(font_style: str, font_size: int, margins: dict) -> str:
+    """
+    Hash the settings a DocBuilder base template is prepared from, so a template kept on disk is only reused for the same settings.
+
+      Parameters:
+        font_style {str} —— the default font style
+        font_size {int} —— the default font size
+        margins {dict} —— margin values in inches with keys "top", "bottom", "left", and "right"
+      Returns:
+        fingerprint {str} —— hex digest of the settings, the layout settings and the template version
+    """
+    settings = f"{TEMPLATE_VERSION}\0{settings_digest()}\0{font_style}\0{int(font_size)}\0{sorted(margins.items())}"
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+
+def calendar_fingerprint(calendar, mondays: list = None, backend: str = "python-docx",
+                         highlight_conflicts: bool = False) -> str:
+    """
+    Hash everything a calendar document shows: the text of every event per day, the layout settings and the template version.
+    Two runs with the same fingerprint write the same document, so the second can skip rendering altogether.
+
+      Parameters:
+        calendar {EventCalendar} —— the calendar to render
+        mondays {list[datetime.date]} —— optional weeks to render, one per page; defaults to the calendar's selected week
+        backend {str} —— the backend the document is built with, "python-docx" or "streaming"
+        highlight_conflicts {bool} —— whether double-booked events are shaded, which depends on the exact times and offsets as well
+      Returns:
+        fingerprint {str} —— hex digest of the document's content
+    """
+    if mondays is None:
+        weeks = [(calendar.week_window.dates, calendar.events)]
+    else:
+        weeks = calendar.iter_weeks(mondays)
+
+    digest = hashlib.sha256()
+    digest.update(f"{TEMPLATE_VERSION}\0{settings_digest()}\0{backend}\0{highlight_conflicts}\0".encode())
+    for week_dates, events in weeks:
+        for day in week_dates:
+            digest.update(f"\1{day}".encode())
+            for event in events.get(day, []):
+                digest.update(
+                    f"\2{event.title}\0{event.full_event_string()}".encode())
+                if highlight_conflicts:
+                    digest.update(f"\0{event.start_time}\0{event.end_time}\0{event.location}".encode())
+    return digest.hexdigest()
+
+
+def read_fingerprint(output_path: str) -> str | None:
+    """
+    Return the fingerprint recorded in a document's zip comment.
+
+      Parameters:
+        output_path {str} —— the document's path
+      Returns:
+        fingerprint {str | None} —— the recorded fingerprint, or None if the file is missing, unreadable or has none
+    """
+    try:
+        with zipfile.ZipFile(output_path) as document:
+            comment = document.comment
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if not comment.startswith(FINGERPRINT_PREFIX):
+        return None
+    return comment[len(FINGERPRINT_PREFIX):].decode("ascii", "replace")
+
+
+def is_up_to_date(output_path: str, fingerprint: str) -> bool:
+    """
+    Check whether the document at output_path was rendered from content with the given fingerprint, so rendering again would write the same file.
+    Only the end of the zip file is read.
+
+      Parameters:
+        output_path {str} —— the document's path
+        fingerprint {str} —— the fingerprint of the content about to be rendered, see calendar_fingerprint
+      Returns:
+        {bool} —— True if the document is up to date
+    """
+    return read_fingerprint(output_path) == fingerprint
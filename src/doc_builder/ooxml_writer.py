@@ -0,0 +1,283 @@
+import io
+import os
+import zipfile
+from xml.sax.saxutils import escape
+from doc_builder.fingerprint import fingerprint_comment, zip_entry
+from doc_builder.render_cache import RenderCache
+from event_calendar.conflicts import double_booked
+from instrument import instrument
+
+
+WORD_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+XML_DECLARATION = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+CONTENT_TYPES_XML = XML_DECLARATION + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/header1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS_XML = XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS_XML = XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/header" Target="header1.xml"/>'
+    '</Relationships>'
+)
+
+# the styles DocBuilder relies on from python-docx's default template, plus its "psa" style
+STYLES_XML = XML_DECLARATION + (
+    f'<w:styles {WORD_NAMESPACES}>'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:sz w:val="22"/><w:szCs w:val="22"/>'
+    '<w:lang w:val="en-US" w:eastAsia="en-US" w:bidi="ar-SA"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/>'
+    '<w:rPr><w:rFonts w:ascii="{font}" w:hAnsi="{font}"/><w:sz w:val="{size}"/></w:rPr></w:style>'
+    '<w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont"><w:name w:val="Default Paragraph Font"/>'
+    '<w:uiPriority w:val="1"/><w:semiHidden/><w:unhideWhenUsed/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Header"><w:name w:val="header"/><w:basedOn w:val="Normal"/>'
+    '<w:uiPriority w:val="99"/><w:unhideWhenUsed/><w:pPr><w:tabs><w:tab w:val="center" w:pos="4680"/>'
+    '<w:tab w:val="right" w:pos="9360"/></w:tabs><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+    '<w:rPr><w:sz w:val="40"/></w:rPr></w:style>'
+    '<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/>'
+    '<w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/>'
+    '<w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/>'
+    '<w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>'
+    '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/><w:basedOn w:val="TableNormal"/>'
+    '<w:uiPriority w:val="59"/><w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+    '<w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblBorders>'
+    '<w:top w:val="single" w:sz="4" w:space="0" w:color="auto"/><w:left w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="auto"/><w:right w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:insideH w:val="single" w:sz="4" w:space="0" w:color="auto"/><w:insideV w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '</w:tblBorders><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/>'
+    '<w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>'
+    '<w:style w:type="character" w:customStyle="1" w:styleId="psa"><w:name w:val="psa"/>'
+    '<w:rPr><w:color w:val="FFFFFF"/><w:sz w:val="60"/></w:rPr></w:style>'
+    '</w:styles>'
+)
+
+HEADER_XML = XML_DECLARATION + (
+    f'<w:hdr {WORD_NAMESPACES}><w:p><w:pPr><w:pStyle w:val="Header"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:t>Meeting Room Schedule</w:t></w:r></w:p></w:hdr>'
+)
+
+# 11 x 8.5 inch landscape page with the default template's margins, as DocBuilder lays it out
+SECTION_XML = (
+    '<w:sectPr><w:headerReference w:type="default" r:id="rId2"/>'
+    '<w:pgSz w:w="15840" w:h="12240" w:orient="landscape"/>'
+    '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" w:header="720" w:footer="720" w:gutter="0"/>'
+    '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr>'
+)
+
+TABLE_LOOK = '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+BORDER = '<w:{side} w:val="single" w:sz="10" w:space="0" w:color="000000"/>'
+SHADING = '<w:shd w:fill="5b9bd7"/>'
+CONFLICT_SHADING = '<w:shd w:fill="f4cccc"/>'
+
+WEEK_TABLE_START = (
+    '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/><w:jc w:val="center"/>'
+    f'<w:tblLayout w:type="fixed"/>{TABLE_LOOK}</w:tblPr><w:tblGrid>' +
+    '<w:gridCol w:w="2040"/>' * 6 + '</w:tblGrid>'
+)
+WEEKDAY_CELL = (
+    f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="2376"/>{SHADING}</w:tcPr><w:p><w:pPr><w:spacing w:before="0" w:after="0"/>'
+    '<w:jc w:val="center"/></w:pPr><w:r><w:rPr><w:b/><w:color w:val="FFFFFF"/><w:sz w:val="24"/></w:rPr>'
+    '<w:t>{day}</w:t></w:r></w:p></w:tc>'
+)
+DATE_CELL = (
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="2376"/></w:tcPr><w:p><w:pPr><w:jc w:val="right"/></w:pPr>'
+    '<w:r><w:t>{day}</w:t></w:r></w:p></w:tc>'
+)
+DAY_CELL_START = '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="2376"/></w:tcPr><w:p/>'
+EVENT_CELL = (
+    f'<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/><w:jc w:val="center"/>{TABLE_LOOK}</w:tblPr>'
+    '<w:tblGrid><w:gridCol w:w="2376"/></w:tblGrid><w:tr><w:tc><w:tcPr><w:tcW w:type="dxa" w:w="2016"/><w:tcBorders>' +
+    "".join(BORDER.format(side=side) for side in ("top", "left", "bottom", "right")) +
+    '</w:tcBorders></w:tcPr><w:p><w:pPr><w:spacing w:before="0"/></w:pPr><w:r><w:rPr><w:b/></w:rPr>{title}<w:br/></w:r>'
+    '<w:r>{time}</w:r></w:p></w:tc></w:tr></w:tbl><w:p/>'
+)
+# a double-booked event, shaded like DocBuilder's conflict highlight
+CONFLICT_EVENT_CELL = EVENT_CELL.replace(
+    "</w:tcBorders></w:tcPr>", f"</w:tcBorders>{CONFLICT_SHADING}</w:tcPr>", 1)
+PSA_TABLE = (
+    f'<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/><w:jc w:val="center"/><w:tblLayout w:type="fixed"/>{TABLE_LOOK}</w:tblPr>'
+    '<w:tblGrid><w:gridCol w:w="12240"/></w:tblGrid><w:tr><w:trPr><w:trHeight w:val="2880"/></w:trPr><w:tc><w:tcPr>'
+    '<w:tcW w:type="dxa" w:w="14256"/><w:vAlign w:val="center"/><w:tcBorders>' +
+    "".join(BORDER.format(side=side) for side in ("left", "bottom", "right")) +
+    f'</w:tcBorders>{SHADING}</w:tcPr><w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:rPr><w:rStyle w:val="psa"/><w:b/></w:rPr>'
+    '<w:t>The meeting room is available for public use as a quiet space when not reserved.</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+)
+PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+EMUS_PER_HALF_POINT = 6350
+
+# event cells shared by every writer in this process, unless one is given its own cache
+CELL_CACHE = RenderCache()
+
+
+def run_text(text: str) -> str:
+    """
+    Returns the run content for a piece of text, turning line breaks and tabs into the elements Word expects, like python-docx's add_run.
+    """
+    parts = []
+    for index, line in enumerate(text.split("\n")):
+        if index:
+            parts.append("<w:br/>")
+        for position, chunk in enumerate(line.split("\t")):
+            if position:
+                parts.append("<w:tab/>")
+            if chunk:
+                preserve = ' xml:space="preserve"' if chunk != chunk.strip() else ""
+                parts.append(f"<w:t{preserve}>{escape(chunk)}</w:t>")
+    return "".join(parts)
+
+
+class StreamingDocWriter:
+    """
+    The StreamingDocWriter class writes the calendar document straight into a .docx zip file, without building a python-docx object model.
+
+      Constructor:
+        Opens the output file and writes the fixed package parts (styles, page header, relationships) up front. The body of word/document.xml is then streamed through a small buffer as each week is written, so memory use stays the same however many events are rendered. Produces the same table layout, header and PSA block as DocBuilder. Call close(), or use the writer as a context manager, to finish the file. Every part carries the same fixed timestamp, so the same calendar always gives a byte-identical file.
+
+      Parameters:
+        file_path {str} —— where to write the document
+        font_style {str} —— the document's default font
+        font_size {int} —— the document's default font size, as a python-docx Length (EMUs), e.g. Pt(10)
+        fingerprint {str} —— optional fingerprint of the calendar, see fingerprint.calendar_fingerprint, recorded in the file
+        render_cache {RenderCache} —— where finished event cells are looked up, defaults to the cache shared by every writer
+    """
+
+    def __init__(self, file_path: str, font_style: str, font_size: int, fingerprint: str = None,
+                 render_cache: RenderCache = None):
+        if not isinstance(font_style, str):
+            raise TypeError("Font style must be a string.")
+        if not isinstance(font_size, int):
+            raise TypeError("Font size must be an integer.")
+
+        self.__render_cache = CELL_CACHE if render_cache is None else render_cache
+        self.__zip = zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED)
+        self.__zip.comment = fingerprint_comment(fingerprint)
+        self.__zip.writestr(zip_entry("[Content_Types].xml"), CONTENT_TYPES_XML)
+        self.__zip.writestr(zip_entry("_rels/.rels"), PACKAGE_RELS_XML)
+        self.__zip.writestr(zip_entry("word/_rels/document.xml.rels"), DOCUMENT_RELS_XML)
+        self.__zip.writestr(zip_entry("word/styles.xml"), STYLES_XML.replace("{font}", escape(font_style, {'"': "&quot;"})).replace(
+            "{size}", str(round(font_size / EMUS_PER_HALF_POINT))))
+        self.__zip.writestr(zip_entry("word/header1.xml"), HEADER_XML)
+
+        self.__stream = io.TextIOWrapper(self.__zip.open(
+            zip_entry("word/document.xml"), "w"), encoding="utf-8")
+        self.__stream.write(XML_DECLARATION)
+        self.__stream.write(f"<w:document {WORD_NAMESPACES}><w:body>")
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_week(self, week_dates: list[str], events: dict, conflicting: set = frozenset()) -> None:
+        """
+        Writes the Monday to Saturday table for one week.
+
+          Parameters:
+            week_dates {list[str]} —— the week's "YYYY-MM-DD" dates in order
+            events {dict[str, list]} —— events keyed by date, e.g. EventCalendar.events; anything with a title and full_event_string() works
+            conflicting {set[int]} —— ids of the events to shade as double-booked
+        """
+        with instrument.span("render.table"):
+            self.__write_week(week_dates, events, conflicting)
+
+    def __write_week(self, week_dates: list[str], events: dict, conflicting: set) -> None:
+        write = self.__stream.write
+        cache = self.__render_cache
+        write(WEEK_TABLE_START)
+        write("<w:tr>")
+        for day in WEEKDAYS:
+            write(WEEKDAY_CELL.format(day=day))
+        write("</w:tr><w:tr>")
+        for day in week_dates:
+            write(DATE_CELL.format(day=escape(day[-2::])))
+        write("</w:tr><w:tr>")
+        for day in week_dates:
+            write(DAY_CELL_START)
+            day_events = events.get(day, [])
+            instrument.count("events_rendered", len(day_events))
+            for event in day_events:
+                if conflicting and id(event) in conflicting:
+                    write(CONFLICT_EVENT_CELL.format(title=run_text(event.title),
+                                                     time=run_text(event.full_event_string())))
+                    continue
+                key = RenderCache.key(event.title, event.full_event_string())
+                cell = cache.get(key)
+                if cell is None:
+                    cell = cache.put(key, EVENT_CELL.format(title=run_text(key[1]),
+                                                            time=run_text(key[2])))
+                write(cell)
+            write("</w:tc>")
+        write("</w:tr></w:tbl>")
+
+    def write_psa(self) -> None:
+        """Writes the quiet room notice shown below the week table."""
+        self.__stream.write(PSA_TABLE)
+
+    def write_page_break(self) -> None:
+        """Starts a new page, e.g. before the next week of a multi-week document."""
+        self.__stream.write(PAGE_BREAK)
+
+    def close(self) -> None:
+        """Finishes word/document.xml and closes the file."""
+        if self.__closed:
+            return
+        with instrument.span("save"):
+            self.__stream.write(SECTION_XML)
+            self.__stream.write("</w:body></w:document>")
+            self.__stream.close()
+            self.__zip.close()
+        self.__closed = True
+        if instrument.enabled() and self.__zip.filename:
+            instrument.count("bytes_written", os.path.getsize(self.__zip.filename))
+
+
+def write_calendar(calendar, file_path: str, font_style: str, font_size: int, mondays: list = None,
+                   fingerprint: str = None, render_cache: RenderCache = None,
+                   highlight_conflicts: bool = False) -> None:
+    """
+    Writes the same document as DocBuilder's init_table (or init_weeks), init_psa and save_document, using the streaming writer.
+    Weeks are fetched from the calendar one at a time and written out before the next is looked up.
+
+      Parameters:
+        calendar {EventCalendar} —— the calendar to render
+        file_path {str} —— where to write the document
+        font_style {str} —— the document's default font
+        font_size {int} —— the document's default font size
+        mondays {list[datetime.date]} —— optional weeks to render, one per page; defaults to the calendar's selected week
+        fingerprint {str} —— optional fingerprint of the calendar to record in the file
+        render_cache {RenderCache} —— optional cache of finished event cells, defaults to the shared one
+        highlight_conflicts {bool} —— shade events double-booked into the same room
+    """
+    if mondays is None:
+        weeks = [(calendar.week_window.dates, calendar.events)]
+    else:
+        weeks = calendar.iter_weeks(mondays)
+
+    with StreamingDocWriter(file_path, font_style, font_size, fingerprint, render_cache) as writer:
+        for index, (week_dates, events) in enumerate(weeks):
+            if index:
+                writer.write_page_break()
+            writer.write_week(week_dates, events,
+                              double_booked(events, calendar.report.canceled) if highlight_conflicts else frozenset())
+            writer.write_psa()
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+import json
+import os
+from doc_builder.fingerprint import TEMPLATE_VERSION
+
+
+# enough for every distinct program in a year-long system feed
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class RenderCache:
+    """
+    The RenderCache class keeps the finished XML of recently rendered event cells, so a program that recurs week after week, in many rooms and documents, is only laid out once. It is used by the streaming backend, which writes cells out as text; the python-docx backend clones a prepared cell instead, see DocBuilder.add_event_cell.
+
+      Constructor:
+        Entries are keyed by everything that shows in the cell, the event's title and its time text, along with the template version, see key(). The least recently used entry is evicted once the cache holds max_entries. Passing file_path loads the entries saved by an earlier run, and save() writes them back, so later runs start warm.
+
+      Parameters:
+        max_entries {int} —— the most cells kept at once
+        file_path {str} —— optional JSON file the entries are loaded from and saved to
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, file_path: str = None):
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+
+        self.max_entries = max_entries
+        self.file_path = file_path
+        self.__entries = OrderedDict()
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0}
+        if file_path is not None:
+            self.load()
+
+    @property
+    def stats(self) -> dict:
+        """Counters for hits, misses and evictions since the cache was created."""
+        return dict(self.__stats)
+
+    @staticmethod
+    def key(title: str, time_text: str) -> tuple[int, str, str]:
+        """Return the cache key for an event cell. Cells saved before a layout change have an older TEMPLATE_VERSION and are never matched."""
+        return (TEMPLATE_VERSION, title, time_text)
+
+    def get(self, key: tuple) -> str | None:
+        """
+        Return the cached cell for a key, marking it as the most recently used.
+
+          Parameters:
+            key {tuple} —— the key, see key()
+          Returns:
+            cell {str | None} —— the cell's XML, or None on a miss
+        """
+        cell = self.__entries.get(key)
+        if cell is None:
+            self.__stats["misses"] += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__stats["hits"] += 1
+        return cell
+
+    def put(self, key: tuple, cell: str) -> str:
+        """
+        Store a freshly rendered cell, evicting the least recently used one if the cache is full.
+
+          Parameters:
+            key {tuple} —— the key, see key()
+            cell {str} —— the finished cell's XML
+          Returns:
+            cell {str} —— the stored cell, so a miss can be handled in one expression
+        """
+        self.__entries[key] = cell
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.__stats["evictions"] += 1
+        return cell
+
+    def clear(self) -> None:
+        """Remove every cell, keeping the counters."""
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.__entries
+
+    def load(self) -> int:
+        """
+        Load the entries saved at file_path, oldest first, skipping a missing, unreadable or malformed file.
+
+          Returns:
+            count {int} —— the number of entries loaded
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            # checked in full before any entry is kept, so a malformed file is skipped like a corrupt one
+            entries = OrderedDict((tuple(key), cell) for key, cell in entries[-self.max_entries:])
+            if not all(isinstance(cell, str) for cell in entries.values()):
+                return 0
+        except (OSError, TypeError, ValueError):
+            return 0
+        for key, cell in entries.items():
+            self.put(key, cell)
+        return len(entries)
+
+    def save(self) -> bool:
+        """
+        Write the entries to file_path, in least to most recently used order.
+
+          Raises:
+            ValueError if the cache has no file_path.
+          Returns:
+            True if successful, False if not.
+        """
+        if self.file_path is None:
+            raise ValueError("The render cache has no file to save to.")
+        entries = [[list(key), cell] for key, cell in self.__entries.items()]
+        try:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            with open(self.file_path, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+        except OSError as e:
+            print(f"An error occurred while saving the render cache: {e}")
+            return False
+        return True
@@ -11,6 +11,22 @@ class Event:
         self.end_time = end_time
         self.location = location
 
+    @classmethod
+    def trusted(cls, title: str, date: str, start_time: str, end_time: str, location: str):
+        """
+        Create an event from fields that have already been checked by validation.validate_records, skipping the validating setters.
+
+          Returns:
+            event {Event} —— the new event
+        """
+        event = cls.__new__(cls)
+        event.__title = title
+        event.__date = date
+        event.__start_time = start_time
+        event.__end_time = end_time
+        event.__location = location
+        return event
+
     @property
     def title(self):
         """The name of the event."""
@@ -0,0 +1,229 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+import sys
+from typing import NamedTuple
+from event_store.event_store import location_key
+from event.validation import check_fields
+from util.util import format_time
+
+
+# location ids are unsigned 32-bit integers, room for far more locations than any feed has
+LOCATION_ID_TYPECODE = "I"
+
+
+class EventRow(NamedTuple):
+    """A single row read back from an EventTable. Exposes the same fields as the Event class."""
+
+    title: str
+    date: str
+    start_time: str
+    end_time: str
+    location: str
+
+    def full_event_string(self):
+        start = format_time(self.start_time)
+        end = format_time(self.end_time)
+        return f"{start} - {end}"
+
+    def __str__(self):
+        return (f"{self.title}\n{self.full_event_string()}")
+
+
+class EventTable:
+    """
+    The EventTable class stores events column by column instead of as one object per event. It is a compact alternative to a list of Event objects for large feeds.
+
+      Constructor:
+        Creates an empty table. Dates are kept as ordinals in an array, locations as indexes into a pool of location names, and titles and times as interned strings so repeated values share a single object. Rows are sorted by date the first time the table is queried and can be looked up with a binary search, like the EventStore class.
+    """
+
+    __slots__ = ("__titles", "__dates", "__start_times", "__end_times",
+                 "__location_ids", "__locations", "__location_lookup", "__location_keys",
+                 "__location_rows", "__ordinals", "__sorted")
+
+    def __init__(self):
+        self.__titles = []
+        self.__dates = array("l")
+        self.__start_times = []
+        self.__end_times = []
+        self.__location_ids = array(LOCATION_ID_TYPECODE)
+        self.__locations = []
+        self.__location_lookup = {}
+        self.__location_keys = {}
+        self.__location_rows = {}
+        self.__ordinals = {}
+        self.__sorted = True
+
+    def __len__(self) -> int:
+        return len(self.__titles)
+
+    @property
+    def locations(self) -> list[str]:
+        """The normalized location keys held by the table."""
+        return list(self.__location_keys.keys())
+
+    def append(self, title: str, date: str, start_time: str, end_time: str, location: str) -> None:
+        """
+        Add a single event to the table.
+
+          Parameters:
+            title {str} —— the name of the event
+            date {str} —— the "YYYY-MM-DD" start date of the event
+            start_time {str} —— the start time as it appears in the feed
+            end_time {str} —— the end time as it appears in the feed
+            location {str} —— the location of the event
+          Raises:
+            ValueError if a field is empty or not a string.
+          Returns:
+            None
+        """
+        self.extend([(title, date, start_time, end_time, location)])
+
+    def extend(self, rows, trusted: bool = False) -> None:
+        """
+        Add events to the table in bulk.
+
+          Parameters:
+            rows {Iterable[tuple]} —— (title, date, start_time, end_time, location) tuples
+            trusted {bool} —— skip field checks for rows already checked by validation.validate_records
+          Raises:
+            ValueError if a field is empty or not a string.
+          Returns:
+            None
+        """
+        intern = sys.intern
+        titles, start_times, end_times = self.__titles, self.__start_times, self.__end_times
+        dates, location_ids = self.__dates, self.__location_ids
+        ordinals, lookup = self.__ordinals, self.__location_lookup
+        last_ordinal = dates[-1] if dates else None
+        is_sorted = self.__sorted
+
+        for title, event_date, start_time, end_time, location in rows:
+            if not trusted and (
+                    type(title) is not str or type(event_date) is not str
+                    or type(start_time) is not str or type(end_time) is not str
+                    or type(location) is not str or not event_date or not start_time
+                    or not end_time or not location or not title.strip()):
+                errors = check_fields(title, event_date, start_time,
+                                      end_time, location)
+                if errors:
+                    raise ValueError(errors[0])
+
+            ordinal = ordinals.get(event_date)
+            if ordinal is None:
+                ordinal = self.__date_ordinal(event_date)
+            if is_sorted and last_ordinal is not None and ordinal < last_ordinal:
+                is_sorted = False
+            last_ordinal = ordinal
+
+            location_id = lookup.get(location)
+            if location_id is None:
+                location_id = self.__add_location(location)
+
+            titles.append(intern(title.strip()))
+            dates.append(ordinal)
+            start_times.append(intern(start_time))
+            end_times.append(intern(end_time))
+            location_ids.append(location_id)
+
+        self.__sorted = is_sorted
+        if self.__location_rows:
+            self.__location_rows = {}
+
+    def extend_from_records(self, records) -> None:
+        """
+        Add events to the table straight from feed records.
+
+          Parameters:
+            records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+          Returns:
+            None
+        """
+        self.extend((item["title"], item["start_date"], item["start_time"],
+                     item["end_time"], item["locations"][0]["location_name"])
+                    for item in records)
+
+    def __date_ordinal(self, value: str) -> int:
+        try:
+            ordinal = date.fromisoformat(value).toordinal()
+        except ValueError:
+            raise ValueError(f"Invalid date: {value}")
+        self.__ordinals[sys.intern(value)] = ordinal
+        return ordinal
+
+    def __add_location(self, location: str) -> int:
+        key = location_key(location)
+        location_id = self.__location_keys.get(key)
+        if location_id is None:
+            location_id = len(self.__locations)
+            self.__locations.append(sys.intern(location))
+            self.__location_keys[key] = location_id
+        self.__location_lookup[sys.intern(location)] = location_id
+        return location_id
+
+    def __ensure_sorted(self) -> None:
+        if not self.__sorted:
+            # stable sort keeps feed order for events sharing a date
+            order = sorted(range(len(self.__dates)),
+                           key=self.__dates.__getitem__)
+            self.__titles = [self.__titles[i] for i in order]
+            self.__dates = array("l", (self.__dates[i] for i in order))
+            self.__start_times = [self.__start_times[i] for i in order]
+            self.__end_times = [self.__end_times[i] for i in order]
+            self.__location_ids = array(
+                LOCATION_ID_TYPECODE, (self.__location_ids[i] for i in order))
+            self.__sorted = True
+
+        if not self.__location_rows and self.__location_ids:
+            for row, location_id in enumerate(self.__location_ids):
+                if location_id not in self.__location_rows:
+                    self.__location_rows[location_id] = (
+                        array("l"), array("l"))
+                dates, rows = self.__location_rows[location_id]
+                dates.append(self.__dates[row])
+                rows.append(row)
+
+    def __row(self, index: int) -> EventRow:
+        return EventRow(self.__titles[index],
+                        date.fromordinal(self.__dates[index]).strftime(
+                            "%Y-%m-%d"),
+                        self.__start_times[index],
+                        self.__end_times[index],
+                        self.__locations[self.__location_ids[index]])
+
+    def between(self, start, end, location: str = None) -> list[EventRow]:
+        """
+        Return every event whose start date falls within the given range, in date order.
+
+          Parameters:
+            start {datetime.date | str} —— first date of the range (inclusive)
+            end {datetime.date | str} —— last date of the range (inclusive)
+            location {str} —— optional location name to restrict the results to
+          Raises:
+            ValueError if the dates are not dates or ISO formatted strings.
+          Returns:
+            rows {list[EventRow]} —— the matching events
+        """
+        self.__ensure_sorted()
+        start, end = self.__to_ordinal(start), self.__to_ordinal(end)
+
+        if location is None:
+            low = bisect_left(self.__dates, start)
+            high = bisect_right(self.__dates, end, lo=low)
+            return [self.__row(index) for index in range(low, high)]
+
+        location_id = self.__location_keys.get(location_key(location))
+        if location_id is None or location_id not in self.__location_rows:
+            return []
+        dates, rows = self.__location_rows[location_id]
+        low = bisect_left(dates, start)
+        high = bisect_right(dates, end, lo=low)
+        return [self.__row(rows[index]) for index in range(low, high)]
+
+    def __to_ordinal(self, value) -> int:
+        if isinstance(value, date):
+            return value.toordinal()
+        if isinstance(value, str):
+            return date.fromisoformat(value).toordinal()
+        raise ValueError("Passed dates should be of type date or str.")
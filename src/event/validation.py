@@ -0,0 +1,145 @@
+import datetime
+from functools import lru_cache
+from util.util import TIME_CACHE_SIZE, parse_time
+
+
+ON_ERROR_MODES = ("fail", "skip", "quarantine")
+
+
+class EventValidationError(ValueError):
+    """Raised when a batch of feed records contains invalid events. Holds every error found, not just the first."""
+
+    def __init__(self, errors: list[tuple]):
+        self.errors = errors
+        record_id, message = errors[0]
+        super().__init__(
+            f"{len(errors)} invalid event field(s), first in record {record_id!r}: {message}")
+
+
+class ValidationReport:
+    """
+    The ValidationReport class holds the outcome of validating a batch of feed records.
+
+      Attributes:
+        valid {list[tuple]} —— (title, date, start_time, end_time, location) tuples that passed validation, ready for trusted construction
+        quarantined {list[dict]} —— the raw records that failed validation, kept only in "quarantine" mode
+        errors {list[tuple]} —— (record id, message) pairs for every invalid field
+        canceled {set[tuple]} —— the field tuples of valid records marked as canceled, which still show on the calendar but book no room
+    """
+
+    def __init__(self):
+        self.valid = []
+        self.quarantined = []
+        self.errors = []
+        self.canceled = set()
+
+    @property
+    def rejected_ids(self) -> list:
+        """The ids of the records that failed validation, each once, in feed order."""
+        return list(dict.fromkeys(record_id for record_id, __ in self.errors))
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def is_iso_date(value: str) -> bool:
+    """Whether a date string is a real date in the "YYYY-MM-DD" form the event stores index by."""
+    try:
+        return datetime.date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+def check_fields(title, date, start_time, end_time, location) -> list[str]:
+    """
+    Check event fields against the same rules as the Event class setters, and check that the date and times can be read by the stores and the renderer.
+
+      Parameters:
+        title, date, start_time, end_time, location —— the raw field values
+      Returns:
+        errors {list[str]} —— a message for every invalid field, empty if all fields are valid
+    """
+    errors = []
+    if not isinstance(title, str):
+        errors.append("Title must be a string.")
+    elif not title.strip():
+        errors.append("Title cannot be empty.")
+
+    for name, value in (("Date", date), ("Start time", start_time),
+                        ("End time", end_time), ("Location", location)):
+        if not value:
+            errors.append(f"{name} cannot be empty.")
+        elif not isinstance(value, str):
+            errors.append(f"{name} must be a string.")
+        elif name == "Date":
+            if not is_iso_date(value):
+                errors.append(f"Invalid date: {value}")
+        elif name != "Location":
+            try:
+                parse_time(value)
+            except ValueError as e:
+                errors.append(str(e))
+    return errors
+
+
+def is_canceled(item: dict) -> bool:
+    """Whether a feed record is marked as canceled."""
+    return str(item.get("canceled", "0")) == "1"
+
+
+def record_fields(item: dict) -> tuple:
+    """
+    Pull the fields used by the Event class out of a feed record.
+
+      Parameters:
+        item {dict} —— an event dict as it appears in the Assabet feed
+      Returns:
+        fields {tuple} —— (title, date, start_time, end_time, location), with None for anything missing
+    """
+    locations = item.get("locations") or [{}]
+    location = locations[0].get(
+        "location_name") if isinstance(locations[0], dict) else None
+    return (item.get("title"), item.get("start_date"), item.get("start_time"),
+            item.get("end_time"), location)
+
+
+def validate_records(records, on_error: str = "fail") -> ValidationReport:
+    """
+    Validate a batch of feed records in a single pass, collecting every error along with its record id.
+
+      Parameters:
+        records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+        on_error {str} —— "fail" raises once the whole batch has been checked, "skip" drops invalid records and "quarantine" drops them but keeps them on the report
+      Raises:
+        ValueError if on_error is not a supported mode.
+        EventValidationError if on_error is "fail" and any record is invalid.
+      Returns:
+        report {ValidationReport} —— the valid field tuples, with titles stripped, and the errors found
+    """
+    if on_error not in ON_ERROR_MODES:
+        raise ValueError(
+            f"on_error must be one of {', '.join(ON_ERROR_MODES)}.")
+
+    report = ValidationReport()
+    for index, item in enumerate(records):
+        if not isinstance(item, dict):
+            report.errors.append((index, "Event record must be a dict."))
+            if on_error == "quarantine":
+                report.quarantined.append(item)
+            continue
+
+        title, date, start_time, end_time, location = record_fields(item)
+        errors = check_fields(title, date, start_time, end_time, location)
+        if errors:
+            record_id = item.get("id", index)
+            report.errors.extend((record_id, message) for message in errors)
+            if on_error == "quarantine":
+                report.quarantined.append(item)
+            continue
+
+        fields = (title.strip(), date, start_time, end_time, location)
+        report.valid.append(fields)
+        if is_canceled(item):
+            report.canceled.add(fields)
+
+    if on_error == "fail" and report.errors:
+        raise EventValidationError(report.errors)
+    return report
@@ -0,0 +1,96 @@
+from datetime import date, datetime, time, timedelta, timezone
+import heapq
+from typing import NamedTuple
+from event_store.event_store import location_key
+from util.util import parse_time
+
+
+class Conflict(NamedTuple):
+    """Two events booked into the same room at overlapping times, and when they overlap."""
+
+    location: str
+    first: object
+    second: object
+    start: datetime
+    end: datetime
+
+
+def as_utc(day: date, moment: time) -> datetime:
+    """Combine a date and a time into a naive UTC datetime. Times without an offset are taken as they are."""
+    combined = datetime.combine(day, moment)
+    if combined.tzinfo is None:
+        return combined
+    return combined.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def event_interval(event) -> tuple[datetime, datetime]:
+    """
+    Work out when an event starts and ends, with the feed's UTC offsets applied.
+
+      Parameters:
+        event {Event | EventRow} —— the event
+      Raises:
+        ValueError if the event's date or times cannot be parsed.
+      Returns:
+        interval {tuple[datetime, datetime]} —— naive UTC start and end; an end before the start is taken to be on the next day
+    """
+    day = date.fromisoformat(event.date)
+    start = as_utc(day, parse_time(event.start_time))
+    end = as_utc(day, parse_time(event.end_time))
+    if end < start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def find_conflicts(events, canceled=frozenset()) -> list[Conflict]:
+    """
+    Find every pair of events booked into the same room at overlapping times with a sort and sweep per room, in O(n log n) plus the number of conflicts.
+    Events that only touch, one ending as the next starts, do not conflict. Canceled events, events whose times cannot be parsed, and events that take no time are left out.
+
+      Parameters:
+        events {Iterable[Event | EventRow]} —— the events to check, e.g. EventStore.between
+        canceled {set[tuple]} —— (title, date, start_time, end_time, location) tuples of canceled events, e.g. ValidationReport.canceled
+      Returns:
+        conflicts {list[Conflict]} —— each overlapping pair once, by room in first seen order, then by the start of the overlap
+    """
+    rooms = {}
+    for index, event in enumerate(events):
+        if canceled and (event.title, event.date, event.start_time,
+                         event.end_time, event.location) in canceled:
+            continue
+        try:
+            start, end = event_interval(event)
+        except (ValueError, TypeError):
+            continue
+        if end == start:
+            continue
+        rooms.setdefault(location_key(event.location), []).append((start, end, index, event))
+
+    conflicts = []
+    for bookings in rooms.values():
+        bookings.sort(key=lambda booking: (booking[0], booking[2]))
+        # the bookings still running at the current start, soonest to end first
+        active = []
+        for start, end, index, event in bookings:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for other_end, __, other in sorted(active, key=lambda booking: booking[1]):
+                conflicts.append(Conflict(event.location, other, event, start, min(end, other_end)))
+            heapq.heappush(active, (end, index, event))
+    return conflicts
+
+
+def double_booked(events: dict, canceled=frozenset()) -> set[int]:
+    """
+    Return the ids of the events in a week that conflict with another, for shading them in a rendered calendar.
+
+      Parameters:
+        events {dict[str, list]} —— events keyed by date, e.g. EventCalendar.events
+        canceled {set[tuple]} —— field tuples of canceled events, which never conflict, e.g. ValidationReport.canceled
+      Returns:
+        ids {set[int]} —— id() of every event in at least one conflict
+    """
+    conflicts = find_conflicts((event for day_events in events.values()
+                                for event in day_events), canceled)
+    return {id(event) for conflict in conflicts
+            for event in (conflict.first, conflict.second)}
@@ -1,15 +1,81 @@
-# dateutil documentation:
-# https://dateutil.readthedocs.io/en/stable/
-
-from dateutil.relativedelta import *
 from datetime import *
 from event.event import Event
+from event.event_table import EventTable
+from event.validation import EventValidationError, ValidationReport, validate_records
+from event_calendar.conflicts import Conflict, as_utc, find_conflicts
+from event_calendar.week_window import WeekWindow, next_monday
+from event_store.event_store import EventStore, partition_records
+from event_store.series_store import SeriesStore
+from instrument import instrument
+from util.util import parse_time
+
+
+# start times within a day are compared as UTC datetimes on this fixed day, far enough
+# from date.min and date.max to convert any offset
+SORT_DAY = date(2000, 1, 3)
+
+
+def start_order(event) -> tuple:
+    """Sort key putting events on the same day in start time order, offsets included. Events whose start time cannot be read go last, in feed order."""
+    try:
+        return (0, as_utc(SORT_DAY, parse_time(event.start_time)))
+    except ValueError:
+        return (1, SORT_DAY)
 
 
 class EventCalendar:
-    def __init__(self):
+    def __init__(self, compact: bool = False, today: date = None, series: bool = False):
+        if compact and series:
+            raise ValueError("A calendar cannot be both compact and series backed.")
+        if today is None:
+            today = date.today()
+        if not isinstance(today, date):
+            raise ValueError("Passed dates should be of type date.")
+        # read once, so every week worked out by this calendar agrees even across midnight
+        self.__today = today
+        self.__compact = compact
+        self.__series = series
+        self.__report = ValidationReport()
         self.events = [{}]
 
+    @classmethod
+    def for_branches(cls, records, field: str = "location_name", branches=None,
+                     compact: bool = False, on_error: str = "fail", today: date = None,
+                     series: bool = False, report: ValidationReport = None) -> dict:
+        """
+        Build one calendar per location or branch from a single pass over the feed.
+        Records without a location belong to no calendar; they fail the whole call in "fail" mode and are otherwise added to report.
+
+          Parameters:
+            records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+            field {str} —— "location_name" for one calendar per room, "branch_name" for one per library
+            branches {Iterable[str]} —— optional names to build calendars for, every other location is skipped
+            compact {bool} —— build compact EventTable backed calendars
+            on_error {str} —— "fail", "skip" or "quarantine", see validation.validate_records
+            today {datetime.date} —— the date next week is worked out from, defaults to today
+            series {bool} —— build SeriesStore backed calendars, which group recurring events
+            report {ValidationReport} —— optional report the records without a location are added to; each calendar's own report lists the rest
+          Raises:
+            EventValidationError if on_error is "fail" and any record is invalid.
+          Returns:
+            calendars {dict[str, EventCalendar]} —— calendars keyed by normalized (case-folded) name
+        """
+        unplaced = ValidationReport()
+        partitions = partition_records(records, field, branches, unplaced)
+        if on_error == "fail" and unplaced.errors:
+            raise EventValidationError(unplaced.errors)
+        if report is not None:
+            report.errors.extend(unplaced.errors)
+            if on_error == "quarantine":
+                report.quarantined.extend(unplaced.quarantined)
+
+        calendars = {}
+        for key, partition in partitions.items():
+            calendar = cls(compact=compact, today=today, series=series)
+            calendar.load_events(partition, on_error)
+            calendars[key] = calendar
+        return calendars
+
     @property
     def events(self):
         """Return the events list."""
@@ -24,26 +90,206 @@ class EventCalendar:
         if len(json_data) == 0:
             raise ValueError("JSON data cannot be empty.")
 
-        weekly_calendar = {}
-        next_weeks_dates = self.get_next_weeks_dates()
+        self.load_events(item for all_events in json_data
+                         for item in all_events)
+
+    @property
+    def store(self) -> EventStore | EventTable | SeriesStore:
+        """The date-indexed store holding every event of the loaded feed."""
+        return self.__store
+
+    @property
+    def report(self) -> ValidationReport:
+        """The validation report from the last load, listing any rejected records."""
+        return self.__report
+
+    @property
+    def today(self) -> date:
+        """The date next week is worked out from."""
+        return self.__today
+
+    @property
+    def week_window(self) -> WeekWindow:
+        """The week currently exposed by events, shared with the document builders."""
+        return self.__window
+
+    @property
+    def compact(self) -> bool:
+        """Whether events are kept in a columnar EventTable instead of as Event objects."""
+        return self.__compact
+
+    @property
+    def series(self) -> bool:
+        """Whether recurring events are grouped into a SeriesStore, which only creates Event objects for the weeks looked up."""
+        return self.__series
+
+    def load_events(self, records, on_error: str = "fail") -> None:
+        """
+        Build the event store from feed records, then select next week's events from it.
+        Records are validated as one batch first, so the events themselves are created through the trusted fast path.
+        Compact calendars load the records into an EventTable in bulk and hand out EventRow tuples instead of Event objects.
+        Series calendars group recurring events into a SeriesStore, one record per series plus its dates.
+
+          Parameters:
+            records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+            on_error {str} —— "fail", "skip" or "quarantine", see validation.validate_records
+          Raises:
+            EventValidationError if on_error is "fail" and any record is invalid.
+          Returns:
+            None
+        """
+        with instrument.span("filter", compact=self.__compact, series=self.__series):
+            report = validate_records(records, on_error)
+            self.__report = report
+            instrument.count("events_kept", len(report.valid))
+            instrument.count("events_rejected", len(report.rejected_ids))
+
+            if self.__compact:
+                table = EventTable()
+                table.extend(report.valid, trusted=True)
+                self.__store = table
+            elif self.__series:
+                self.__store = SeriesStore(report.valid)
+            else:
+                self.__store = EventStore(
+                    [Event.trusted(*fields) for fields in report.valid])
+            # the field tuples now live in the store
+            report.valid = []
+            self.__select_next_week()
+
+    def __select_next_week(self) -> None:
+        self.__window = WeekWindow.next_week(self.__today)
+        self.__events = self.events_between(
+            self.__window.start, self.__window.end)
+
+    def select_week(self, monday: date) -> None:
+        """
+        Make the week starting on the given Monday the one exposed by events, and rendered by DocBuilder, instead of next week.
+
+          Parameters:
+            monday {datetime.date} —— the first day of the week
+          Raises:
+            ValueError if monday is not a date or does not fall on a Monday.
+          Returns:
+            None
+        """
+        window = WeekWindow.for_monday(monday)
+        self.__events = self.events_between(window.start, window.end)
+        self.__window = window
+
+    def get_week_dates_for(self, monday: date) -> list[str]:
+        """
+        Return the Monday to Saturday dates of the week starting on the given Monday.
+
+          Parameters:
+            monday {datetime.date} —— the first day of the week
+          Returns:
+            week_dates {list[str]} —— "YYYY-MM-DD" dates in order
+        """
+        return WeekWindow.for_monday(monday).dates
 
-        for all_events in json_data:
-            for item in all_events:
-                if item["start_date"] in next_weeks_dates:
-                    event = Event(
-                        title=item["title"],
-                        date=item["start_date"],
-                        start_time=item["start_time"],
-                        end_time=item["end_time"],
-                        location=item["locations"][0]["location_name"]
-                    )
+    def weeks_between(self, start: date, end: date) -> list[date]:
+        """
+        Return the Mondays of every Monday to Saturday week that overlaps the given range, e.g. all the weeks of a month.
 
-                    key = item["start_date"]
-                    if key not in weekly_calendar:
-                        weekly_calendar[key] = []
-                    weekly_calendar[key].append(event)
+          Parameters:
+            start {datetime.date} —— first date of the range (inclusive)
+            end {datetime.date} —— last date of the range (inclusive)
+          Raises:
+            ValueError if either value is not a date or the range ends before it starts.
+          Returns:
+            mondays {list[datetime.date]} —— the first day of each week, in order
+        """
+        if not isinstance(start, date) or not isinstance(end, date):
+            raise ValueError("Passed dates should be of type date.")
+        if end < start:
+            raise ValueError("The range cannot end before it starts.")
+        monday = start - timedelta(days=start.weekday())
+        if start.weekday() == 6:
+            # Sundays are not shown, so a range starting on one begins with the following week
+            monday += timedelta(weeks=1)
+        mondays = []
+        while monday <= end:
+            mondays.append(monday)
+            monday += timedelta(weeks=1)
+        return mondays
+
+    def iter_weeks(self, mondays: list[date], location: str = None):
+        """
+        Yield each requested week's dates and events one week at a time, so a long range never has to be held in memory at once.
+        Every week is a range lookup on the store rather than another pass over the feed.
 
-        self.__events = weekly_calendar
+          Parameters:
+            mondays {Iterable[datetime.date]} —— the first day of every week, e.g. from weeks_between
+            location {str} —— optional location name to restrict the results to
+          Returns:
+            weeks {Generator[tuple[list[str], dict[str, list[Event]]]]} —— (week_dates, events) pairs in the given order
+        """
+        for monday in mondays:
+            yield self.get_week_dates_for(monday), self.events_for_week(monday, location)
+
+    def get_week_dates(self) -> list[str]:
+        """
+        Return the Monday to Saturday dates of the week currently exposed by events.
+
+          Returns:
+            week_dates {list[str]} —— "YYYY-MM-DD" dates in order
+        """
+        return self.__window.dates
+
+    def events_between(self, start, end, location: str = None, by_time: bool = False) -> dict[str, list[Event]]:
+        """
+        Return the stored events between two dates, grouped by date.
+
+          Parameters:
+            start {datetime.date | str} —— first date of the range (inclusive)
+            end {datetime.date | str} —— last date of the range (inclusive)
+            location {str} —— optional location name to restrict the results to
+            by_time {bool} —— order each day's events by start time (offsets included) instead of feed order; events whose start time cannot be read go last
+          Returns:
+            events {dict[str, list[Event]]} —— events keyed by "YYYY-MM-DD" date, in date order. Dates without events are left out.
+        """
+        calendar = {}
+        for event in self.__store.between(start, end, location):
+            if event.date not in calendar:
+                calendar[event.date] = []
+            calendar[event.date].append(event)
+        if by_time:
+            for day_events in calendar.values():
+                day_events.sort(key=start_order)
+        return calendar
+
+    def events_for_week(self, monday: date, location: str = None) -> dict[str, list[Event]]:
+        """
+        Return the stored events for the Monday to Saturday week starting on the given Monday.
+
+          Parameters:
+            monday {datetime.date} —— the first day of the week
+            location {str} —— optional location name to restrict the results to
+          Raises:
+            ValueError if monday is not a date or does not fall on a Monday.
+          Returns:
+            events {dict[str, list[Event]]} —— events keyed by "YYYY-MM-DD" date
+        """
+        window = WeekWindow.for_monday(monday)
+        return self.events_between(window.start, window.end, location)
+
+    def conflicts(self, start=None, end=None, location: str = None) -> list[Conflict]:
+        """
+        Return every pair of events booked into the same room at overlapping times, see conflicts.find_conflicts. Events the feed marks as canceled are left out.
+
+          Parameters:
+            start {datetime.date | str} —— first date to check (inclusive), defaults to the start of the feed
+            end {datetime.date | str} —— last date to check (inclusive), defaults to the end of the feed
+            location {str} —— optional location name to restrict the check to
+          Returns:
+            conflicts {list[Conflict]} —— each double booking once, by room then by time
+        """
+        if start is None:
+            start = "0001-01-01"
+        if end is None:
+            end = "9999-12-31"
+        return find_conflicts(self.__store.between(start, end, location), self.__report.canceled)
 
     def get_next_monday_date(self, todays_date) -> date:
         """
@@ -54,24 +300,14 @@ class EventCalendar:
           Returns: 
             next-monday {datetime.date} —— date object representing next monday's date
         """
-        if not isinstance(todays_date, date):
-            raise ValueError("Passed dates should be of type date.")
-        next_monday = todays_date+relativedelta(weekday=MO)
-        return next_monday
+        return next_monday(todays_date)
 
-    def get_next_weeks_dates(self) -> list[date]:
+    def get_next_weeks_dates(self) -> list[str]:
         """
-        Create and return an array containing next week's dates, starting from Monday and ending on Saturday.
-        We use relativedelta to iterate over next week's days in relation to Monday
+        Return next week's dates, starting from Monday and ending on Saturday, as worked out from the calendar's today.
+        The week comes from the shared WeekWindow, so it is only computed once however often it is asked for.
 
           Returns:
-            next_weeks_dates {list[datetime.date]} —— A list containing date time values of next week's dates in order
+            next_weeks_dates {list[str]} —— "YYYY-MM-DD" dates of next week in order
         """
-
-        today = date.today()
-        next_monday = self.get_next_monday_date(today)
-
-        next_weeks_dates = [(next_monday +
-                            relativedelta(days=+i)).strftime("%Y-%m-%d") for i in range(6)]
-
-        return next_weeks_dates
+        return WeekWindow.next_week(self.__today).dates
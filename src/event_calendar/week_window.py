@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+
+def next_monday(todays_date: date) -> date:
+    """
+    Return the Monday on or after the given date, e.g. today's date on a Monday.
+
+      Parameters:
+        todays_date {datetime.date} —— the date to start from
+      Raises:
+        ValueError if todays_date is not a date.
+      Returns:
+        next_monday {datetime.date} —— the Monday's date
+    """
+    if not isinstance(todays_date, date):
+        raise ValueError("Passed dates should be of type date.")
+    return todays_date + timedelta(days=-todays_date.weekday() % 7)
+
+
+class WeekWindow:
+    """
+    The WeekWindow class describes the Monday to Saturday week shown on a calendar page.
+
+      Constructor:
+        Takes the Monday the week starts on and works out the week's dates once with plain ordinal arithmetic. Windows never change after they are built, so use WeekWindow.for_monday or WeekWindow.next_week to share the cached window for a week rather than building a new one; the calendar and the document builder then read the very same dates.
+    """
+
+    __slots__ = ("__monday", "__dates", "__ordinals")
+
+    # every window built so far, keyed by its Monday
+    __windows = {}
+
+    def __init__(self, monday: date):
+        if not isinstance(monday, date):
+            raise ValueError("Passed dates should be of type date.")
+        if monday.weekday() != 0:
+            raise ValueError("Weeks must start on a Monday.")
+
+        first = monday.toordinal()
+        self.__monday = monday
+        self.__ordinals = tuple(range(first, first + 6))
+        self.__dates = tuple(date.fromordinal(ordinal).isoformat()
+                             for ordinal in self.__ordinals)
+
+    @classmethod
+    def for_monday(cls, monday: date) -> "WeekWindow":
+        """
+        Return the shared window for the week starting on the given Monday, building it on first use.
+
+          Parameters:
+            monday {datetime.date} —— the first day of the week
+          Raises:
+            ValueError if monday is not a date or does not fall on a Monday.
+          Returns:
+            window {WeekWindow} —— the week's window
+        """
+        window = cls.__windows.get(monday)
+        if window is None:
+            window = cls.__windows[monday] = cls(monday)
+        return window
+
+    @classmethod
+    def next_week(cls, todays_date: date) -> "WeekWindow":
+        """
+        Return the shared window for the week starting on the Monday on or after the given date.
+
+          Parameters:
+            todays_date {datetime.date} —— the date to start from, usually today
+          Raises:
+            ValueError if todays_date is not a date.
+          Returns:
+            window {WeekWindow} —— the week's window
+        """
+        return cls.for_monday(next_monday(todays_date))
+
+    @property
+    def monday(self) -> date:
+        """The first day of the week."""
+        return self.__monday
+
+    @property
+    def dates(self) -> list[str]:
+        """The Monday to Saturday dates as "YYYY-MM-DD" strings, in order."""
+        return list(self.__dates)
+
+    @property
+    def ordinals(self) -> tuple[int, ...]:
+        """The Monday to Saturday dates as proleptic Gregorian ordinals, in order."""
+        return self.__ordinals
+
+    @property
+    def start(self) -> str:
+        """The Monday as a "YYYY-MM-DD" string."""
+        return self.__dates[0]
+
+    @property
+    def end(self) -> str:
+        """The Saturday as a "YYYY-MM-DD" string."""
+        return self.__dates[-1]
+
+    def __contains__(self, day: str) -> bool:
+        return day in self.__dates
+
+    def __repr__(self) -> str:
+        return f"WeekWindow({self.__monday!r})"
@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+import sys
+from event.event import Event
+from event.validation import ValidationReport
+
+
+def location_key(location: str) -> str:
+    """
+    Normalize a location name so it can be used as an index key.
+
+      Parameters:
+        location {str} —— the location name as it appears in the feed
+      Returns:
+        key {str} —— the case-folded, interned location name
+    """
+    return sys.intern(location.strip().casefold())
+
+
+def date_key(value) -> str:
+    """
+    Convert a date or an ISO formatted date string into the key used by the store.
+
+      Parameters:
+        value {datetime.date | str} —— the date to convert
+      Raises:
+        ValueError if the value is not a date or a string.
+      Returns:
+        key {str} —— the date as a "YYYY-MM-DD" string
+    """
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str):
+        return value
+    raise ValueError("Passed dates should be of type date or str.")
+
+
+def partition_records(records, field: str = "location_name", keys=None,
+                      report: ValidationReport = None) -> dict[str, list[dict]]:
+    """
+    Split feed records by location or branch in a single pass.
+
+      Parameters:
+        records {Iterable[dict]} —— event dicts as they appear in the Assabet feed
+        field {str} —— "location_name" to split by room or "branch_name" to split by library
+        keys {Iterable[str]} —— optional names to keep, every other record is dropped
+        report {ValidationReport} —— optional report that records without a location, or that are not dicts, are added to as errors and quarantined records, since no partition can take them
+      Raises:
+        ValueError if field is not a supported location field.
+      Returns:
+        partitions {dict[str, list[dict]]} —— records keyed by normalized location key, in feed order
+    """
+    if field not in ("location_name", "branch_name"):
+        raise ValueError("field must be 'location_name' or 'branch_name'.")
+    label = "Location" if field == "location_name" else "Branch"
+
+    wanted = None
+    if keys is not None:
+        wanted = {location_key(key) for key in keys}
+        partitions = {key: [] for key in wanted}
+    else:
+        partitions = {}
+
+    # case-fold each distinct name once rather than once per record
+    normalized = {}
+    for index, item in enumerate(records):
+        if not isinstance(item, dict):
+            if report is not None:
+                report.errors.append((index, "Event record must be a dict."))
+                report.quarantined.append(item)
+            continue
+        locations = item.get("locations") or [{}]
+        location = locations[0] if isinstance(locations, list) else None
+        name = location.get(field) if isinstance(location, dict) else None
+        if not name or not isinstance(name, str):
+            if report is not None:
+                report.errors.append((item.get("id", index), f"{label} cannot be empty."))
+                report.quarantined.append(item)
+            continue
+        key = normalized.get(name)
+        if key is None:
+            key = normalized[name] = location_key(name)
+        if wanted is not None and key not in wanted:
+            continue
+        if key not in partitions:
+            partitions[key] = []
+        partitions[key].append(item)
+    return partitions
+
+
+class EventStore:
+    """
+    The EventStore class holds every event of a feed sorted by start date so that any date range can be looked up with a binary search.
+
+      Constructor:
+        Takes an optional iterable of Event objects. Events are sorted once on load; events sharing a date keep their feed order. A secondary index keyed by location is built alongside the main index so that a single room can be queried without scanning the others.
+    """
+
+    def __init__(self, events=None):
+        self.__dates = []
+        self.__events = []
+        self.__locations = {}
+        if events is not None:
+            self.extend(events)
+
+    def __len__(self) -> int:
+        return len(self.__events)
+
+    @property
+    def locations(self) -> list[str]:
+        """The normalized location keys held by the store."""
+        return list(self.__locations.keys())
+
+    def extend(self, events) -> None:
+        """
+        Add events to the store and rebuild the indexes.
+
+          Parameters:
+            events {Iterable[Event]} —— the events to add
+          Raises:
+            TypeError if an item is not an Event.
+          Returns:
+            None
+        """
+        merged = list(zip(self.__dates, self.__events))
+        for event in events:
+            if not isinstance(event, Event):
+                raise TypeError("Expected events to be of type Event.")
+            merged.append((event.date, event))
+
+        # stable sort keeps feed order for events sharing a date
+        merged.sort(key=lambda pair: pair[0])
+        self.__dates = [pair[0] for pair in merged]
+        self.__events = [pair[1] for pair in merged]
+        self.__build_location_index()
+
+    def __build_location_index(self) -> None:
+        locations = {}
+        for event_date, event in zip(self.__dates, self.__events):
+            key = location_key(event.location)
+            if key not in locations:
+                locations[key] = ([], [])
+            locations[key][0].append(event_date)
+            locations[key][1].append(event)
+        self.__locations = locations
+
+    def between(self, start, end, location: str = None) -> list[Event]:
+        """
+        Return every event whose start date falls within the given range, in date order.
+
+          Parameters:
+            start {datetime.date | str} —— first date of the range (inclusive)
+            end {datetime.date | str} —— last date of the range (inclusive)
+            location {str} —— optional location name to restrict the results to
+          Returns:
+            events {list[Event]} —— the matching events
+        """
+        start, end = date_key(start), date_key(end)
+
+        if location is None:
+            dates, events = self.__dates, self.__events
+        else:
+            dates, events = self.__locations.get(
+                location_key(location), ([], []))
+
+        low = bisect_left(dates, start)
+        high = bisect_right(dates, end, lo=low)
+        return events[low:high]
@@ -0,0 +1,212 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+import sys
+from typing import NamedTuple
+from event.event import Event
+from event.event_table import LOCATION_ID_TYPECODE
+from event_store.event_store import location_key
+
+
+class Series(NamedTuple):
+    """A recurring program: the fields its occurrences share and the dates it runs on."""
+
+    title: str
+    start_time: str
+    end_time: str
+    location: str
+    dates: list[str]
+
+
+def week_number(ordinal: int) -> int:
+    """The number of the Monday to Sunday week a date ordinal falls in. Ordinal 1, 0001-01-01, is a Monday."""
+    return (ordinal - 1) // 7
+
+
+class SeriesStore:
+    """
+    The SeriesStore class groups a feed's recurring events into series, keeping one record per series plus the list of dates it runs on, and creates Event objects only for the dates that are looked up.
+
+      Constructor:
+        Takes optional (title, date, start_time, end_time, location) tuples, e.g. validation.validate_records' valid rows. Events sharing a title, start and end time and location belong to the same series, like the feed's numbered "preschool-story-time-37" instances of one program; a one-off event is a series with a single date. Each occurrence is stored as two integers, its date ordinal and its position in the feed, so lookups return events in the same order as an EventStore. Series are indexed by week and by location, so a week's lookup only visits the series that run that week.
+    """
+
+    __slots__ = ("__keys", "__titles", "__start_times", "__end_times", "__location_ids",
+                 "__series_locations", "__location_keys", "__dates", "__positions", "__unsorted",
+                 "__weeks", "__date_strings", "__count")
+
+    def __init__(self, rows=None):
+        self.__keys = {}
+        self.__titles = []
+        self.__start_times = []
+        self.__end_times = []
+        self.__location_ids = array(LOCATION_ID_TYPECODE)
+        self.__series_locations = []
+        self.__location_keys = {}
+        self.__dates = []
+        self.__positions = []
+        self.__unsorted = set()
+        self.__weeks = None
+        self.__date_strings = {}
+        self.__count = 0
+        if rows is not None:
+            self.extend(rows)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def series_count(self) -> int:
+        """The number of distinct series, one-off events included."""
+        return len(self.__titles)
+
+    @property
+    def locations(self) -> list[str]:
+        """The normalized location keys held by the store."""
+        return list(self.__location_keys.keys())
+
+    def extend(self, rows) -> None:
+        """
+        Add events to the store, adding each one to its series.
+
+          Parameters:
+            rows {Iterable[tuple]} —— (title, date, start_time, end_time, location) tuples that passed validation
+          Raises:
+            ValueError if a date is not an ISO formatted "YYYY-MM-DD" string.
+          Returns:
+            None
+        """
+        intern = sys.intern
+        keys, all_dates, all_positions = self.__keys, self.__dates, self.__positions
+        ordinals = {}
+        position = self.__count
+
+        for title, event_date, start_time, end_time, location in rows:
+            key = (title, start_time, end_time, location)
+            series = keys.get(key)
+            if series is None:
+                series = keys[key] = len(self.__titles)
+                self.__titles.append(intern(title))
+                self.__start_times.append(intern(start_time))
+                self.__end_times.append(intern(end_time))
+                self.__location_ids.append(self.__location_id(location))
+                self.__series_locations.append(intern(location))
+                all_dates.append(array("l"))
+                all_positions.append(array("l"))
+
+            ordinal = ordinals.get(event_date)
+            if ordinal is None:
+                try:
+                    ordinal = ordinals[event_date] = date.fromisoformat(event_date).toordinal()
+                except ValueError:
+                    raise ValueError(f"Invalid date: {event_date}")
+            dates = all_dates[series]
+            if dates and ordinal < dates[-1]:
+                self.__unsorted.add(series)
+            dates.append(ordinal)
+            all_positions[series].append(position)
+            position += 1
+
+        self.__count = position
+        self.__weeks = None
+
+    def __location_id(self, location: str) -> int:
+        key = location_key(location)
+        location_id = self.__location_keys.get(key)
+        if location_id is None:
+            location_id = self.__location_keys[key] = len(self.__location_keys)
+        return location_id
+
+    def __ensure_indexed(self) -> None:
+        for series in self.__unsorted:
+            dates, positions = self.__dates[series], self.__positions[series]
+            # stable sort keeps feed order for occurrences sharing a date
+            order = sorted(range(len(dates)), key=dates.__getitem__)
+            self.__dates[series] = array("l", (dates[i] for i in order))
+            self.__positions[series] = array("l", (positions[i] for i in order))
+        self.__unsorted.clear()
+
+        if self.__weeks is None:
+            weeks = {}
+            for series, dates in enumerate(self.__dates):
+                last_week = None
+                for ordinal in dates:
+                    week = week_number(ordinal)
+                    if week != last_week:
+                        weeks.setdefault(week, []).append(series)
+                        last_week = week
+            self.__weeks = weeks
+
+    def __date_string(self, ordinal: int) -> str:
+        value = self.__date_strings.get(ordinal)
+        if value is None:
+            value = self.__date_strings[ordinal] = sys.intern(
+                date.fromordinal(ordinal).isoformat())
+        return value
+
+    def between(self, start, end, location: str = None) -> list[Event]:
+        """
+        Return every event whose start date falls within the given range, in date order, creating the Event objects for those dates only.
+
+          Parameters:
+            start {datetime.date | str} —— first date of the range (inclusive)
+            end {datetime.date | str} —— last date of the range (inclusive)
+            location {str} —— optional location name to restrict the results to
+          Raises:
+            ValueError if the dates are not dates or ISO formatted strings.
+          Returns:
+            events {list[Event]} —— the matching events
+        """
+        self.__ensure_indexed()
+        start, end = self.__to_ordinal(start), self.__to_ordinal(end)
+
+        location_id = None
+        if location is not None:
+            location_id = self.__location_keys.get(location_key(location))
+            if location_id is None:
+                return []
+
+        first_week, last_week = week_number(start), week_number(end)
+        if last_week - first_week >= len(self.__weeks):
+            # a range wider than the feed is quicker to answer from every series
+            candidates = range(len(self.__titles))
+        else:
+            candidates = set()
+            for week in range(first_week, last_week + 1):
+                candidates.update(self.__weeks.get(week, ()))
+
+        found = []
+        for series in candidates:
+            if location_id is not None and self.__location_ids[series] != location_id:
+                continue
+            dates, positions = self.__dates[series], self.__positions[series]
+            low = bisect_left(dates, start)
+            high = bisect_right(dates, end, lo=low)
+            for index in range(low, high):
+                found.append((dates[index], positions[index], series))
+        found.sort()
+
+        return [Event.trusted(self.__titles[series], self.__date_string(ordinal),
+                              self.__start_times[series], self.__end_times[series],
+                              self.__series_locations[series])
+                for ordinal, __, series in found]
+
+    def iter_series(self):
+        """
+        Yield every series with the dates it runs on, in the order each was first seen in the feed.
+
+          Returns:
+            series {Generator[Series]} —— the series
+        """
+        self.__ensure_indexed()
+        for series, dates in enumerate(self.__dates):
+            yield Series(self.__titles[series], self.__start_times[series], self.__end_times[series],
+                         self.__series_locations[series],
+                         [self.__date_string(ordinal) for ordinal in dates])
+
+    def __to_ordinal(self, value) -> int:
+        if isinstance(value, date):
+            return value.toordinal()
+        if isinstance(value, str):
+            return date.fromisoformat(value).toordinal()
+        raise ValueError("Passed dates should be of type date or str.")
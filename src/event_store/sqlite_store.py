@@ -0,0 +1,173 @@
+import sqlite3
+from event_store.event_store import date_key, location_key
+
+
+# separates category names when they are folded into a single column
+CATEGORY_SEPARATOR = "\x1f"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT UNIQUE,
+    title TEXT,
+    start_date TEXT,
+    start_time TEXT,
+    end_date TEXT,
+    end_time TEXT,
+    canceled INTEGER NOT NULL DEFAULT 0,
+    last_modified TEXT,
+    location_name TEXT,
+    location_key TEXT,
+    branch_name TEXT,
+    branch_key TEXT
+);
+CREATE TABLE IF NOT EXISTS event_categories (
+    event_rowid INTEGER NOT NULL,
+    category_name TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    PRIMARY KEY (event_rowid, category_key)
+);
+CREATE INDEX IF NOT EXISTS events_start_date ON events (start_date);
+CREATE INDEX IF NOT EXISTS events_location ON events (location_key, start_date);
+CREATE INDEX IF NOT EXISTS events_branch ON events (branch_key, start_date);
+CREATE INDEX IF NOT EXISTS events_canceled ON events (canceled, start_date);
+CREATE INDEX IF NOT EXISTS event_categories_key ON event_categories (category_key, event_rowid);
+"""
+
+
+class SqliteEventStore:
+    """
+    The SqliteEventStore class keeps feed events in a local SQLite database indexed by date, location, branch, category and canceled flag.
+
+      Constructor:
+        Opens (and creates if needed) the database at the given path, or an in-memory database by default. Feeds are ingested once and can then be queried by any combination of filters without loading the whole feed into memory. Query results have the same shape as feed records, so they can be passed straight to EventCalendar.load_events.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(SCHEMA)
+        # databases created before last_modified was stored gain the column, empty until their events are ingested again
+        columns = {row[1] for row in self.__connection.execute("PRAGMA table_info(events)")}
+        if "last_modified" not in columns:
+            with self.__connection:
+                self.__connection.execute("ALTER TABLE events ADD COLUMN last_modified TEXT")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.__connection.close()
+
+    def ingest(self, records) -> int:
+        """
+        Add feed records to the database. A record whose id is already stored replaces the stored one.
+
+          Parameters:
+            records {Iterable[dict]} —— event dicts as they appear in the Assabet feed, full or projected
+          Returns:
+            count {int} —— the number of records ingested
+        """
+        count = 0
+        with self.__connection:
+            cursor = self.__connection.cursor()
+            for item in records:
+                location = (item.get("locations") or [{}])[0]
+                location_name = location.get("location_name")
+                branch_name = location.get("branch_name")
+                cursor.execute("""
+                    INSERT INTO events (id, title, start_date, start_time, end_date, end_time,
+                                        canceled, last_modified, location_name, location_key,
+                                        branch_name, branch_key)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        title = excluded.title, start_date = excluded.start_date,
+                        start_time = excluded.start_time, end_date = excluded.end_date,
+                        end_time = excluded.end_time, canceled = excluded.canceled,
+                        last_modified = excluded.last_modified,
+                        location_name = excluded.location_name, location_key = excluded.location_key,
+                        branch_name = excluded.branch_name, branch_key = excluded.branch_key
+                    RETURNING rowid
+                    """, (item.get("id"), item.get("title"), item.get("start_date"),
+                          item.get("start_time"), item.get("end_date"), item.get("end_time"),
+                          1 if str(item.get("canceled", "0")) == "1" else 0,
+                          item.get("last_modified"), location_name, location_key(
+                              location_name) if location_name else None,
+                          branch_name, location_key(branch_name) if branch_name else None))
+                rowid = cursor.fetchone()[0]
+
+                cursor.execute(
+                    "DELETE FROM event_categories WHERE event_rowid = ?", (rowid,))
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO event_categories VALUES (?, ?, ?)",
+                    [(rowid, category["category_name"], location_key(category["category_name"]))
+                     for category in item.get("categories") or [] if category.get("category_name")])
+                count += 1
+        return count
+
+    def query(self, start=None, end=None, location: str = None, branch: str = None,
+              category: str = None, include_canceled: bool = False):
+        """
+        Return the stored events matching every given filter, in date order.
+
+          Parameters:
+            start {datetime.date | str} —— optional first date of the range (inclusive)
+            end {datetime.date | str} —— optional last date of the range (inclusive)
+            location {str} —— optional location name, e.g. "Lakeway Meeting Room"
+            branch {str} —— optional branch name, e.g. "Lakeway Library"
+            category {str} —— optional category name, e.g. "Children"
+            include_canceled {bool} —— whether to return canceled events
+          Returns:
+            records {Generator[dict]} —— projected event dicts in the feed's shape
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("e.start_date >= ?")
+            params.append(date_key(start))
+        if end is not None:
+            conditions.append("e.start_date <= ?")
+            params.append(date_key(end))
+        if location is not None:
+            conditions.append("e.location_key = ?")
+            params.append(location_key(location))
+        if branch is not None:
+            conditions.append("e.branch_key = ?")
+            params.append(location_key(branch))
+        if category is not None:
+            conditions.append(
+                "e.rowid IN (SELECT event_rowid FROM event_categories WHERE category_key = ?)")
+            params.append(location_key(category))
+        if not include_canceled:
+            conditions.append("e.canceled = 0")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.__connection.execute(f"""
+            SELECT e.id, e.title, e.start_date, e.start_time, e.end_date, e.end_time,
+                   e.canceled, e.last_modified, e.location_name, e.branch_name,
+                   (SELECT group_concat(category_name, '{CATEGORY_SEPARATOR}')
+                    FROM event_categories WHERE event_rowid = e.rowid)
+            FROM events e
+            {where}
+            ORDER BY e.start_date, e.rowid
+            """, params)
+
+        for (event_id, title, start_date, start_time, end_date, end_time,
+             canceled, last_modified, location_name, branch_name, categories) in rows:
+            yield {
+                "id": event_id,
+                "title": title,
+                "start_date": start_date,
+                "start_time": start_time,
+                "end_date": end_date,
+                "end_time": end_time,
+                "canceled": str(canceled),
+                "last_modified": last_modified,
+                "locations": [{"location_name": location_name, "branch_name": branch_name}],
+                "categories": [{"category_name": name}
+                               for name in categories.split(CATEGORY_SEPARATOR)] if categories else [],
+            }
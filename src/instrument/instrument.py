@@ -0,0 +1,292 @@
+from contextlib import contextmanager, nullcontext
+import io
+import os
+import time
+
+
+# shared by every disabled span, so a span costs one call and a flag check when instrumentation is off
+_NULL_SPAN = nullcontext()
+
+# number of functions kept from each cProfile capture
+PROFILE_LIMIT = 25
+
+_recorder = None
+
+# resident memory of this process on Linux, in pages
+STATM_PATH = "/proc/self/statm"
+
+
+class Recorder:
+    """
+    The Recorder class collects the spans, counters and profiles of one instrumented run.
+
+      Constructor:
+        Takes the name of the span to capture with cProfile, if any, and whether to track memory. Created by enable(); nothing is recorded while no recorder is active. In memory mode every span also records the most memory traced by tracemalloc while it ran and how much of it was still held when it ended, both relative to what was held when it started. tracemalloc only sees Python allocations, while python-docx keeps its XML tree in libxml2, so where the platform reports it the growth of the process's resident memory is recorded as well.
+    """
+
+    def __init__(self, profile_stage: str = None, memory: bool = False):
+        self.__profile_stage = profile_stage
+        self.__memory = memory
+        self.__started = time.perf_counter()
+        self.__spans = []
+        self.__counters = {}
+        self.__profiles = {}
+        self.__depth = 0
+        # the highest traced memory seen so far by each open span, innermost last
+        self.__peaks = []
+        self.__started_tracing = False
+        # cProfile, pstats and tracemalloc are imported only by the runs that use them,
+        # so the app's startup does not pay for them
+        if memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.__started_tracing = True
+
+    @property
+    def memory(self) -> bool:
+        """Whether spans record memory use."""
+        return self.__memory
+
+    def stop(self) -> None:
+        """Stop tracing memory if this recorder started it."""
+        if self.__started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        record = {"name": name, "depth": self.__depth,
+                  "start": round(time.perf_counter() - self.__started, 6)}
+        record.update(attributes)
+        self.__spans.append(record)
+
+        profiler = None
+        if name == self.__profile_stage:
+            # a stage that runs several times, e.g. once per week, accumulates into one profile
+            profiler = self.__profiles.get(name)
+            if profiler is None:
+                import cProfile
+                profiler = self.__profiles[name] = cProfile.Profile()
+            profiler.enable()
+        if self.__memory:
+            import tracemalloc
+            held, peak = tracemalloc.get_traced_memory()
+            if self.__peaks:
+                # resetting the peak below would lose the enclosing span's peak so far
+                self.__peaks[-1] = max(self.__peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self.__peaks.append(held)
+            resident = current_rss_bytes()
+        self.__depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            self.__depth -= 1
+            if profiler is not None:
+                profiler.disable()
+            if self.__memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(self.__peaks.pop(), peak)
+                if self.__peaks:
+                    self.__peaks[-1] = max(self.__peaks[-1], peak)
+                record["peak_bytes"] = peak - held
+                record["retained_bytes"] = current - held
+                if resident is not None:
+                    record["rss_growth_bytes"] = current_rss_bytes() - resident
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def report(self) -> dict:
+        return {
+            "seconds": round(time.perf_counter() - self.__started, 6),
+            "spans": [dict(record) for record in self.__spans],
+            "counters": dict(self.__counters),
+            "profiles": {name: format_profile(profiler)
+                         for name, profiler in self.__profiles.items()},
+        }
+
+
+def current_rss_bytes() -> int | None:
+    """The resident memory of this process, or None where the platform does not report it."""
+    try:
+        with open(STATM_PATH, "r") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def format_profile(profiler: "cProfile.Profile", limit: int = PROFILE_LIMIT) -> str:
+    """Return the profile's most expensive functions by cumulative time as text."""
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats(
+        "cumulative").print_stats(limit)
+    return output.getvalue()
+
+
+def enable(profile_stage: str = None, memory: bool = False) -> Recorder:
+    """
+    Start recording spans and counters, replacing any earlier recording.
+
+      Parameters:
+        profile_stage {str} —— optional span name, e.g. "render.table", to capture with cProfile
+        memory {bool} —— also record each span's peak and retained memory with tracemalloc, which slows the run down
+      Returns:
+        recorder {Recorder} —— the active recorder
+    """
+    global _recorder
+    if _recorder is not None:
+        _recorder.stop()
+    _recorder = Recorder(profile_stage, memory)
+    return _recorder
+
+
+def disable() -> dict:
+    """
+    Stop recording and return the report of what was recorded.
+
+      Returns:
+        report {dict} —— the run's report, see report()
+    """
+    global _recorder
+    result = report()
+    if _recorder is not None:
+        _recorder.stop()
+    _recorder = None
+    return result
+
+
+def enabled() -> bool:
+    """Whether spans and counters are being recorded."""
+    return _recorder is not None
+
+
+def span(name: str, **attributes):
+    """
+    Time the code inside a with block as a named span. Spans can be nested.
+
+      Parameters:
+        name {str} —— the stage name, e.g. "load" or "render.table"
+        attributes —— extra values stored with the span, e.g. the file path
+      Returns:
+        {ContextManager[dict | None]} —— yields the span's record, or None when instrumentation is off
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+    return _recorder.span(name, **attributes)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a named counter, e.g. "events_read" or "bytes_written".
+
+      Parameters:
+        name {str} —— the counter's name
+        amount {int} —— how much to add
+    """
+    if _recorder is not None:
+        _recorder.count(name, amount)
+
+
+def report() -> dict:
+    """
+    Return what has been recorded so far.
+
+      Returns:
+        report {dict} —— "seconds" since recording started, "spans" in start order with their "depth" and "seconds", "counters", and "profiles" holding the text of any cProfile capture. Empty when instrumentation is off.
+    """
+    if _recorder is None:
+        return {}
+    return _recorder.report()
+
+
+def write_report(file_path: str, data: dict = None) -> None:
+    """
+    Write a report as JSON.
+
+      Parameters:
+        file_path {str} —— where to write the report
+        data {dict} —— the report to write, defaults to the current recording
+    """
+    import json
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(report() if data is None else data, file, indent=2)
+        file.write("\n")
+
+
+def stage_memory(data: dict) -> dict[str, dict]:
+    """
+    Collect the memory use of every stage in a memory mode report. A stage that ran several times keeps its largest figures.
+
+      Parameters:
+        data {dict} —— a report recorded with memory=True
+      Returns:
+        stages {dict[str, dict]} —— "peak_bytes", "retained_bytes" and, where available, "rss_growth_bytes" keyed by span name, in first run order
+    """
+    stages = {}
+    for record in data.get("spans", []):
+        if "peak_bytes" not in record:
+            continue
+        stage = stages.setdefault(record["name"], {"peak_bytes": 0, "retained_bytes": 0})
+        for measure in ("peak_bytes", "retained_bytes", "rss_growth_bytes"):
+            if measure in record:
+                stage[measure] = max(stage.get(measure, 0), record[measure])
+    return stages
+
+
+def format_memory_report(data: dict) -> str:
+    """Lay the memory use of every stage in a memory mode report out as a table."""
+    lines = [f"{'stage':<16} {'peak MiB':>9}  {'retained MiB':>12}  {'RSS growth MiB':>14}"]
+    for name, stage in stage_memory(data).items():
+        rss = stage.get("rss_growth_bytes")
+        lines.append(f"{name:<16} {stage['peak_bytes'] / 2 ** 20:>9.2f}  "
+                     f"{stage['retained_bytes'] / 2 ** 20:>12.2f}  "
+                     + (f"{rss / 2 ** 20:>14.2f}" if rss is not None else f"{'n/a':>14}"))
+    return "\n".join(lines)
+
+
+def check_budgets(data: dict, budgets: dict) -> list[str]:
+    """
+    Compare the memory use of each stage in a memory mode report with its budget.
+
+      Parameters:
+        data {dict} —— a report recorded with memory=True
+        budgets {dict} —— bytes keyed by span name; a number limits the stage's peak, a dict may limit "peak_bytes", "retained_bytes" and "rss_growth_bytes" separately
+      Raises:
+        ValueError if a budgeted stage is missing from the report.
+      Returns:
+        violations {list[str]} —— one description per exceeded budget, empty when every stage fits
+    """
+    stages = stage_memory(data)
+    violations = []
+    for name, budget in budgets.items():
+        if name not in stages:
+            raise ValueError(f"No memory was recorded for stage '{name}'.")
+        if not isinstance(budget, dict):
+            budget = {"peak_bytes": budget}
+        for measure, limit in budget.items():
+            used = stages[name].get(measure, 0)
+            if used > limit:
+                violations.append(f"{name} {measure.replace('_bytes', '')}: {used / 2 ** 20:.2f} MiB "
+                                  f"exceeds its {limit / 2 ** 20:.2f} MiB budget")
+    return violations
+
+
+def assert_within_budgets(data: dict, budgets: dict) -> None:
+    """
+    Test helper that fails when any stage of a memory mode report exceeds its budget, see check_budgets.
+
+      Raises:
+        AssertionError listing every exceeded budget.
+    """
+    violations = check_budgets(data, budgets)
+    if violations:
+        raise AssertionError("Memory budget exceeded:\n" + "\n".join(violations))
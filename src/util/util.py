@@ -1,4 +1,10 @@
-from datetime import date
+from datetime import date, time, timedelta, timezone
+from functools import lru_cache
+import re
+
+
+# distinct raw times seen by a run; a day has 1440 minutes, with room for seconds and offsets
+TIME_CACHE_SIZE = 4096
 
 
 def format_time(time_str: str) -> str:
@@ -17,7 +23,12 @@ def format_time(time_str: str) -> str:
 
     if not isinstance(time_str, str):
         raise ValueError("Time must be a string.")
+    return _format_time(time_str)
 
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def _format_time(time_str: str) -> str:
+    # feeds repeat the same handful of times, so each raw string is only parsed once
     time_str = time_str.strip()
     if not time_str:
         raise ValueError("Times cannot be empty strings.")
@@ -36,3 +47,73 @@ def format_time(time_str: str) -> str:
 
     formatted_time = f"{hours}:{minutes}" + ("am" if int_hours < 12 else "pm")
     return formatted_time
+
+
+def format_times(time_strs) -> list[str]:
+    """
+    Format a whole column of time strings from 24hr to AM/PM at once, parsing each distinct value only once.
+
+      Parameters:
+        time_strs {Iterable[str]} —— time strings in 24-hour format (e.g., "14:30:00 -0500")
+
+      Raises:
+        ValueError if any time is not a string or is empty.
+
+      Returns:
+        formatted_times {list[str]} —— the formatted times, in the same order
+    """
+    formatted = {}
+    formatted_times = []
+    for time_str in time_strs:
+        text = formatted.get(time_str) if isinstance(time_str, str) else None
+        if text is None:
+            text = formatted[time_str] = format_time(time_str)
+        formatted_times.append(text)
+    return formatted_times
+
+
+def parse_time(time_str: str) -> time:
+    """
+    Parse a feed time string into a time value, keeping its UTC offset so times can be compared and sorted.
+
+      Parameters:
+        time_str {str} —— The time string in 24-hour format with an optional offset (e.g., "14:30:00 -0500").
+
+      Raises:
+        ValueError if time_str is not a string, is empty or is not a valid time.
+
+      Returns:
+        parsed_time {datetime.time} —— the time, aware when an offset is given
+    """
+
+    if not isinstance(time_str, str):
+        raise ValueError("Time must be a string.")
+    return _parse_time(time_str)
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def _parse_time(time_str: str) -> time:
+    # checked for a string first, as an unhashable value would fail the cache lookup with a TypeError
+    parts = time_str.split()
+    if not parts:
+        raise ValueError("Times cannot be empty strings.")
+    if len(parts) > 2:
+        raise ValueError(f"Invalid time: {time_str}")
+
+    try:
+        hours, minutes, seconds = (int(part) for part in parts[0].split(":"))
+        tzinfo = None
+        if len(parts) == 2:
+            offset = parts[1]
+            if len(offset) != 5 or offset[0] not in "+-":
+                raise ValueError
+            delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+            tzinfo = timezone(-delta if offset[0] == "-" else delta)
+        return time(hours, minutes, seconds, tzinfo=tzinfo)
+    except ValueError:
+        raise ValueError(f"Invalid time: {time_str}") from None
+
+
+def slugify(name: str) -> str:
+    """Turn a location name into a file name friendly string, e.g. "Lakeway Meeting Room" -> "lakeway-meeting-room"."""
+    return re.sub(r"[^a-z0-9]+", "-", name.casefold()).strip("-")
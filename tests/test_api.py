@@ -0,0 +1,124 @@
+import io
+import json
+import pytest
+from datetime import date
+from api.api import (get_api_data_from_storage, iter_feed_items, merge_feeds,
+                     project_event, stream_api_data_from_storage)
+from event_calendar.event_calendar import EventCalendar
+
+
+data = get_api_data_from_storage("all-events.json")
+all_items = [item for events in data for item in events]
+
+
+class TestStreamingIngest:
+    def test_iter_feed_items_matches_json_load(self):
+        with open("src/storage/all-events.json", "r") as file:
+            streamed = list(iter_feed_items(file, chunk_size=97))
+        assert streamed == all_items
+
+    def test_iter_feed_items_flat_inner_lists(self):
+        feed = io.StringIO('[ [{"id": 1}, {"id": 2}], [], [{"id": 3}] ]')
+        assert [item["id"] for item in iter_feed_items(feed, 4)] == [1, 2, 3]
+
+    def test_iter_feed_items_truncated(self):
+        with pytest.raises(ValueError, match="Unexpected end of feed data."):
+            list(iter_feed_items(io.StringIO('[[{"id": 1}, {"id"')))
+
+    def test_iter_feed_items_malformed_event(self):
+        feed = '[[{"id": 1}, {"id": 2, "title" "Story Time"}' + ", {}" * 10000 + "]]"
+        file = io.StringIO(feed)
+        with pytest.raises(ValueError, match=r"Invalid feed data at offset 31: Expecting ':' delimiter"):
+            list(iter_feed_items(file, chunk_size=16))
+        # the error is raised without reading the rest of the feed
+        assert file.tell() < 64
+
+    def test_iter_feed_items_empty(self):
+        with pytest.raises(ValueError, match="Unexpected end of feed data."):
+            list(iter_feed_items(io.StringIO("   ")))
+
+    def test_iter_feed_items_invalid(self):
+        with pytest.raises(ValueError, match="Unexpected character in feed data"):
+            list(iter_feed_items(io.StringIO('[["event"]]')))
+
+    def test_project_event(self):
+        projected = project_event(all_items[0])
+        assert "description" not in projected
+        assert "registration" not in projected
+        assert projected["title"] == all_items[0]["title"]
+        assert projected["locations"][0]["location_name"] == \
+            all_items[0]["locations"][0]["location_name"]
+
+    def test_stream_filters_by_date(self):
+        streamed = list(stream_api_data_from_storage(
+            "all-events.json", date(2025, 7, 7), "2025-07-12"))
+        expected = [item["id"] for item in all_items
+                    if "2025-07-07" <= item["start_date"] <= "2025-07-12"]
+        assert [item["id"] for item in streamed] == expected
+
+    def test_stream_missing_file(self):
+        assert list(stream_api_data_from_storage("missing.json")) == []
+
+    def test_calendar_loads_stream(self):
+        calendar = EventCalendar()
+        calendar.load_events(stream_api_data_from_storage("all-events.json"))
+        assert len(calendar.store) == len(all_items)
+
+
+def feed_event(event_id: str, title: str = "Story Time", canceled: str = "0", **fields) -> dict:
+    return {"id": event_id, "title": title, "canceled": canceled, **fields}
+
+
+class TestMergeFeeds:
+    def test_overlapping_stored_feeds(self):
+        branch = get_api_data_from_storage("lkwy-events.json")
+        merged = merge_feeds([data, branch])
+        ids = [item["id"] for item in merged]
+        assert len(ids) == len(set(ids))
+        assert set(ids) == {item["id"] for item in all_items} | {
+            item["id"] for events in branch for item in events}
+        # ids keep the position they were first seen at
+        assert ids[:len(all_items)] == [item["id"] for item in all_items]
+
+    def test_duplicates_within_a_feed(self):
+        merged = merge_feeds([[[feed_event("a-1")], [feed_event("a-1", "Story Time (moved)")]]])
+        assert merged == [feed_event("a-1", "Story Time (moved)")]
+
+    def test_later_feed_wins(self):
+        merged = merge_feeds([[feed_event("a-1"), feed_event("b-1")],
+                              [feed_event("b-1", "Chess Club")]])
+        assert [item["title"] for item in merged] == ["Story Time", "Chess Club"]
+
+    def test_last_modified_wins(self):
+        newer = feed_event("a-1", "New", last_modified="2025-07-02T10:00:00")
+        older = feed_event("a-1", "Old", last_modified="2025-07-01T10:00:00")
+        assert merge_feeds([[newer], [older]]) == [newer]
+        assert merge_feeds([[older], [newer]]) == [newer]
+
+    def test_cancellation_is_not_undone_by_a_stale_feed(self):
+        canceled = feed_event("a-1", canceled="1")
+        assert merge_feeds([[canceled], [feed_event("a-1")]]) == [canceled]
+        assert merge_feeds([[feed_event("a-1")], [canceled]]) == [canceled]
+        # a newer modification can still bring an event back
+        restored = feed_event("a-1", last_modified="2025-07-02")
+        assert merge_feeds([[feed_event("a-1", canceled="1", last_modified="2025-07-01")],
+                            [restored]]) == [restored]
+
+    def test_drop_canceled(self):
+        merged = merge_feeds([[feed_event("a-1", canceled="1"), feed_event("b-1")]], drop_canceled=True)
+        assert [item["id"] for item in merged] == ["b-1"]
+
+    def test_unreadable_feed_raises(self):
+        # get_api_data_from_storage returns {} when a feed cannot be read
+        with pytest.raises(TypeError, match="not dict"):
+            merge_feeds([data, get_api_data_from_storage("nope.json")])
+
+    def test_events_without_ids_are_kept(self):
+        assert len(merge_feeds([[{"title": "A"}, {"title": "A"}]])) == 2
+
+    def test_streamed_feeds(self):
+        merged = merge_feeds(stream_api_data_from_storage(file_path)
+                             for file_path in ("all-events.json", "lkwy-events.json"))
+        calendar = EventCalendar(today=date(2025, 7, 1))
+        calendar.load_events(merged)
+        assert len(calendar.store) == len(merged)
@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from api import api
+from api.cache import ResponseCache
+from api.client import ApiClient
+
+
+class VersionedFeedHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Assabet API that supports ETag revalidation."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        etag = f'"v{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        server.downloads += 1
+        body = json.dumps([[{"id": f"event-v{server.version}",
+                           "path": self.path}]]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 21 Jul 2025 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), VersionedFeedHandler)
+    httpd.version, httpd.downloads, httpd.not_modified = 1, 0, 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def feed_url(server, path: str = "/events") -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+class TestResponseCache:
+    def test_fresh_responses_are_local_hits(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=60)
+        with ApiClient(cache=cache) as client:
+            first = client.fetch(feed_url(server), paginate=False)
+            second = client.fetch(feed_url(server), paginate=False)
+        assert first == second
+        assert server.downloads == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_params_are_part_of_the_key(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=60)
+        with ApiClient(cache=cache) as client:
+            client.fetch(feed_url(server), {"branch": "west"}, paginate=False)
+            client.fetch(feed_url(server), {"branch": "lakeway"}, paginate=False)
+        assert server.downloads == 2
+
+    def test_expired_responses_are_revalidated(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=0, stale_while_revalidate=0)
+        with ApiClient(cache=cache) as client:
+            client.fetch(feed_url(server), paginate=False)
+            events = client.fetch(feed_url(server), paginate=False)
+            assert server.not_modified == 1
+            assert events[0][0]["id"] == "event-v1"
+
+            server.version = 2
+            events = client.fetch(feed_url(server), paginate=False)
+        assert events[0][0]["id"] == "event-v2"
+        assert server.downloads == 2
+        assert cache.stats["revalidated"] == 1
+
+    def test_stale_while_revalidate(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=0, stale_while_revalidate=60)
+        with ApiClient(cache=cache) as client:
+            client.fetch(feed_url(server), paginate=False)
+            server.version = 2
+            stale = client.fetch(feed_url(server), paginate=False)
+            cache.wait()
+            refreshed = client.fetch(feed_url(server), paginate=False)
+            cache.wait()
+        assert stale[0][0]["id"] == "event-v1"
+        assert refreshed[0][0]["id"] == "event-v2"
+        assert cache.stats["stale_hits"] == 2
+
+    def test_stale_response_served_when_api_is_down(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=0, stale_while_revalidate=0)
+        url = feed_url(server)
+        with ApiClient(cache=cache) as client:
+            client.fetch(url, paginate=False)
+            server.shutdown()
+            server.server_close()
+            events = client.fetch(url, paginate=False)
+        assert events[0][0]["id"] == "event-v1"
+
+    def test_missing_response_raises_when_api_is_down(self, tmp_path):
+        cache = ResponseCache(str(tmp_path))
+        with ApiClient(cache=cache, timeout=1) as client:
+            with pytest.raises(requests.RequestException):
+                client.fetch("http://127.0.0.1:9/events", paginate=False)
+
+    def test_evicts_least_recently_used(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=60, max_bytes=100)
+        with ApiClient(cache=cache) as client:
+            for path in ["/a", "/b", "/c"]:
+                client.fetch(feed_url(server, path), paginate=False)
+        bodies = [name for name in os.listdir(tmp_path) if name.endswith(".body")]
+        assert 0 < len(bodies) < 3
+        assert os.path.exists(
+            tmp_path / f"{cache.key(feed_url(server, '/c'))}.body")
+
+    def test_body_removed_after_meta_read_is_a_miss(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=60)
+        url = feed_url(server)
+        with requests.Session() as session:
+            cache.get(session, url)
+            read_meta = cache._ResponseCache__read_meta
+
+            def read_meta_then_evict(key):
+                # an eviction or revalidation in another thread gets in between
+                meta = read_meta(key)
+                os.remove(tmp_path / f"{key}.body")
+                return meta
+
+            cache._ResponseCache__read_meta = read_meta_then_evict
+            response = cache.get(session, url)
+        assert response.json()[0][0]["id"] == "event-v1"
+        assert server.downloads == 2
+        assert cache.stats["misses"] == 2
+
+    def test_not_modified_without_stored_response_downloads_in_full(self, server, tmp_path):
+        cache = ResponseCache(str(tmp_path), ttl=60)
+        with requests.Session() as session:
+            # validators the cache knows nothing about, e.g. set on a shared session
+            session.headers["If-None-Match"] = '"v1"'
+            response = cache.get(session, feed_url(server))
+        assert response.json()[0][0]["id"] == "event-v1"
+        assert (server.not_modified, server.downloads) == (1, 1)
+        with open(tmp_path / f"{cache.key(feed_url(server))}.body", "rb") as file:
+            assert file.read() == response.content
+
+    def test_invalid_settings(self, tmp_path):
+        with pytest.raises(ValueError, match="Cache durations cannot be negative."):
+            ResponseCache(str(tmp_path), ttl=-1)
+
+
+class TestSharedClient:
+    def test_api_calls_go_through_the_cache(self, server, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(api, "_client", None)
+        first = api.call_api_and_return_json_data(feed_url(server))
+        assert api.call_api_and_return_json_data(feed_url(server)) == first
+        cache = api._client.cache
+        assert cache.directory == os.path.join(str(tmp_path), "src", "storage", "cache")
+        assert (server.downloads, cache.stats["hits"]) == (1, 1)
+
+        # once the stored response expires, the next call revalidates it
+        cache.ttl = cache.stale_while_revalidate = 0
+        assert api.call_api_and_return_json_data(feed_url(server)) == first
+        assert (server.downloads, server.not_modified) == (1, 1)
+        api._client.close()
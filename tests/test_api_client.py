@@ -0,0 +1,116 @@
+import json
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from api.client import ApiClient
+
+
+PAGE_COUNT = 3
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Assabet API serving PAGE_COUNT pages of events per branch."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        branch = query.get("branch", ["lakeway"])[0]
+        page = int(query.get("page", ["1"])[0])
+        self.server.connections.add(self.client_address)
+
+        if url.path == "/error":
+            self.send_json([], status=500)
+        elif url.path == "/unpaged":
+            self.send_json([[{"id": f"{branch}-1"}]])
+        elif url.path == "/linked":
+            links = {}
+            if page < PAGE_COUNT:
+                links["Link"] = f'</linked?page={page + 1}>; rel="next"'
+            self.send_json([[{"id": f"linked-{page}"}]], headers=links)
+        else:
+            events = [] if page > PAGE_COUNT else [[{"id": f"{branch}-{page}"}]]
+            self.send_json(events)
+
+    def send_json(self, data, status=200, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    httpd.connections = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestApiClient:
+    def test_fetch_follows_pages(self, server):
+        with ApiClient() as client:
+            events = client.fetch(f"{base_url(server)}/events")
+        assert [page[0]["id"] for page in events] == [
+            "lakeway-1", "lakeway-2", "lakeway-3"]
+
+    def test_fetch_without_pagination(self, server):
+        with ApiClient() as client:
+            events = client.fetch(f"{base_url(server)}/events", paginate=False)
+        assert events == [[{"id": "lakeway-1"}]]
+
+    def test_fetch_stops_on_repeated_page(self, server):
+        with ApiClient() as client:
+            events = client.fetch(f"{base_url(server)}/unpaged")
+        assert events == [[{"id": "lakeway-1"}]]
+
+    def test_fetch_follows_link_header(self, server):
+        with ApiClient() as client:
+            events = client.fetch(f"{base_url(server)}/linked")
+        assert [page[0]["id"] for page in events] == [
+            "linked-1", "linked-2", "linked-3"]
+
+    def test_fetch_respects_max_pages(self, server):
+        with ApiClient(max_pages=2) as client:
+            events = client.fetch(f"{base_url(server)}/events")
+        assert len(events) == 2
+
+    def test_fetch_error_status(self, server):
+        with ApiClient() as client:
+            with pytest.raises(requests.HTTPError) as error:
+                client.fetch(f"{base_url(server)}/error")
+        assert error.value.response.status_code == 500
+
+    def test_fetch_many_merges_in_order(self, server):
+        branches = ["lakeway", "west", "bee-cave", "spicewood", "lago", "hudson"]
+        requests_ = [(f"{base_url(server)}/events", {"branch": branch})
+                     for branch in branches]
+        server.connections.clear()
+        with ApiClient(max_workers=3) as client:
+            events = client.fetch_many(requests_)
+
+        assert [page[0]["id"] for page in events] == [
+            f"{branch}-{page}" for branch in branches for page in range(1, PAGE_COUNT + 1)]
+        # connections are pooled and reused across the 24 requests
+        assert len(server.connections) <= 3
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError, match="max_workers must be a positive integer."):
+            ApiClient(max_workers=0)
@@ -0,0 +1,78 @@
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from api.api import project_event
+from app import format_import_report, load_records, main, parse_args, without_import_report
+
+
+importtime_output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       5000 |   json.decoder
+import time:      1000 |       6000 | json
+import time:       300 |        300 | app
+Traceback lines are ignored
+"""
+
+
+class TestImportReport:
+    def test_format_import_report(self):
+        report = format_import_report(importtime_output, limit=2).splitlines()
+        assert report[1].split() == ["6.0", "1.0", "json"]
+        assert report[2].split() == ["5.0", "2.0", "json.decoder"]
+        assert report[-1] == "4 modules imported in 6.3ms"
+
+    def test_without_import_report(self):
+        assert without_import_report(["--import-report", "5", "--weeks", "2"]) == [
+            "--weeks", "2"]
+        assert without_import_report(["--import-report", "--weeks", "2"]) == [
+            "--weeks", "2"]
+        assert without_import_report(["--import-report=5"]) == []
+
+    def test_heavy_libraries_are_not_imported_at_startup(self):
+        source = os.path.join(os.path.dirname(__file__), "..", "src")
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import app; "
+                "print(sorted({'docx', 'requests', 'dotenv', 'cProfile', 'pstats', 'tracemalloc'}"
+                " & set(sys.modules)))")
+        result = subprocess.run([sys.executable, "-c", code, source],
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
+
+
+class TestFeeds:
+    @pytest.mark.parametrize("feeds", [["nope.json"], ["all-events.json", "lkwy-evnets.json"]])
+    def test_missing_feed_fails(self, feeds, tmp_path, capsys):
+        output = tmp_path / "calendar.docx"
+        with pytest.raises(SystemExit) as error:
+            main(["--feed", *feeds, "--output", str(output)])
+        assert error.value.code != 0
+        assert f"feed not found in src/storage: {feeds[-1]}" in capsys.readouterr().err
+        assert not output.exists()
+
+
+class TestSnapshots:
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        source = os.path.join(os.getcwd(), "src", "storage", "lkwy-events.json")
+        os.makedirs(tmp_path / "src" / "storage")
+        shutil.copy(source, tmp_path / "src" / "storage" / "lkwy-events.json")
+        monkeypatch.chdir(tmp_path)
+        return tmp_path / "src" / "storage"
+
+    def test_feeds_are_loaded_through_snapshots(self, storage, tmp_path):
+        main(["--output", str(tmp_path / "calendar.docx")])
+        assert (storage / "lkwy-events.snap").exists()
+        assert (tmp_path / "calendar.docx").exists()
+
+    def test_no_snapshot(self, storage, tmp_path):
+        main(["--no-snapshot", "--output", str(tmp_path / "calendar.docx")])
+        assert not (storage / "lkwy-events.snap").exists()
+        assert (tmp_path / "calendar.docx").exists()
+
+    def test_snapshot_records_match_json(self, storage):
+        args = parse_args([])
+        snapshot_records = load_records(args)
+        assert snapshot_records == load_records(args)
+        args.snapshot = False
+        assert snapshot_records == [project_event(item) for item in load_records(args)]
@@ -0,0 +1,140 @@
+import os
+import zipfile
+import pytest
+from datetime import date
+from docx import Document
+from event.validation import ValidationReport
+from api.api import stream_api_data_from_storage
+from app import main
+from batch.batch import RenderResult, format_summary, plan_jobs, render_batch, weeks_from
+
+
+records = list(stream_api_data_from_storage("all-events.json"))
+monday = date(2025, 7, 7)
+
+
+class TestBatch:
+    def test_weeks_from(self):
+        assert weeks_from(monday, 2) == [monday, date(2025, 7, 14)]
+        with pytest.raises(ValueError, match="Week count must be at least 1."):
+            weeks_from(monday, 0)
+
+    def test_plan_jobs(self, tmp_path):
+        jobs = plan_jobs(records, str(tmp_path), weeks_from(monday, 2),
+                         branches=["Lakeway Meeting Room", "West Meeting Room"])
+        # one job per room, each loading its events once for both weeks
+        assert len(jobs) == 2
+        assert [os.path.basename(path) for path in jobs[0].output_paths] in (
+            ["lakeway-meeting-room-2025-07-07.docx", "lakeway-meeting-room-2025-07-14.docx"],
+            ["west-meeting-room-2025-07-07.docx", "west-meeting-room-2025-07-14.docx"])
+
+    def test_render_batch_in_process_pool(self, tmp_path):
+        jobs = plan_jobs(records, str(tmp_path / "out"), [monday],
+                         field="branch_name")
+        results = render_batch(jobs, max_workers=2)
+
+        assert [result.output_path for result in results] == [
+            path for job in jobs for path in job.output_paths]
+        for result in results:
+            assert isinstance(result, RenderResult)
+            assert os.path.exists(result.output_path)
+            assert result.event_count > 0
+            Document(result.output_path)
+
+        summary = format_summary(results, 1.0)
+        assert summary.splitlines()[-1].startswith("2 documents in 1.000s")
+
+    def test_main_batch_mode(self, tmp_path, capsys):
+        main(["--feed", "all-events.json", "--branches", "West Meeting Room",
+              "--start", "2025-07-07", "--weeks", "2", "--workers", "1",
+              "--out-dir", str(tmp_path)])
+        assert sorted(os.listdir(tmp_path)) == [
+            "west-meeting-room-2025-07-07.docx", "west-meeting-room-2025-07-14.docx"]
+        assert "2 documents" in capsys.readouterr().out
+
+    def test_main_rejects_non_monday(self):
+        with pytest.raises(SystemExit):
+            main(["--branches", "West", "--start", "2025-07-08"])
+
+    def test_main_month_mode(self, tmp_path):
+        output = tmp_path / "july.docx"
+        main(["--feed", "all-events.json", "--month", "2025-07",
+              "--output", str(output)])
+        tables = Document(output).tables
+        # a week table and a quiet room notice for each of the five weeks
+        assert len(tables) == 10
+        assert [table.rows[1].cells[0].text for table in tables[::2]] == [
+            "30", "07", "14", "21", "28"]
+
+    def test_main_rejects_month_in_batch_mode(self):
+        with pytest.raises(SystemExit):
+            main(["--branches", "West", "--month", "2025-07"])
+
+    def test_unchanged_documents_are_skipped(self, tmp_path):
+        jobs = plan_jobs(records, str(tmp_path), [monday], branches=["West Meeting Room"])
+        assert not render_batch(jobs, max_workers=1)[0].skipped
+        result = render_batch(jobs, max_workers=1)[0]
+        assert result.skipped
+        assert "(1 up to date)" in format_summary([result], 1.0)
+
+        forced = plan_jobs(records, str(tmp_path), [monday], branches=["West Meeting Room"], force=True)
+        assert not render_batch(forced, max_workers=1)[0].skipped
+
+    def test_invalid_records_are_reported(self, tmp_path):
+        bad = [dict(item, start_date="07/08/2025") for item in records[:2]]
+        jobs = plan_jobs(bad + records, str(tmp_path), weeks_from(monday, 2), field="branch_name")
+        results = render_batch(jobs, max_workers=1)
+        assert sum(result.rejected for result in results) == 2
+        # each job's load is counted on its first week only
+        assert all(result.rejected == 0 for result in results if result.monday != monday)
+        assert format_summary(results, 1.0).splitlines()[-1].endswith(", 2 invalid records skipped")
+
+    def test_records_without_location_are_reported(self, tmp_path):
+        report = ValidationReport()
+        nowhere = dict(records[0], id="nowhere", locations=[])
+        jobs = plan_jobs([nowhere] + records, str(tmp_path), [monday], report=report)
+        assert sum(len(job.records) for job in jobs) == len(records)
+        assert report.rejected_ids == ["nowhere"]
+        assert format_summary([], 1.0, len(report.rejected_ids)).endswith(", 1 invalid records skipped")
+
+    def test_highlight_conflicts(self, tmp_path):
+        jobs = plan_jobs(records, str(tmp_path), [monday], branches=["West Meeting Room"])
+        render_batch(jobs, max_workers=1)
+        highlighted = plan_jobs(records, str(tmp_path), [monday], branches=["West Meeting Room"],
+                                highlight_conflicts=True)
+        # shading changes the document, so the plain one is not up to date
+        assert not render_batch(highlighted, max_workers=1)[0].skipped
+        assert render_batch(highlighted, max_workers=1)[0].skipped
+
+    def test_highlighted_documents_are_shaded(self, tmp_path):
+        overlapping = [{"id": title, "title": title, "start_date": "2025-07-08",
+                        "start_time": "10:00:00 -0500", "end_time": "11:00:00 -0500",
+                        "locations": [{"location_name": "West Meeting Room"}]}
+                       for title in ("Tech Coach", "Chess Club")]
+        jobs = plan_jobs(overlapping, str(tmp_path), [monday], highlight_conflicts=True)
+        result = render_batch(jobs, max_workers=1)[0]
+        with zipfile.ZipFile(result.output_path) as document:
+            assert document.read("word/document.xml").count(b'w:fill="f4cccc"') == 2
+
+    def test_streaming_backend(self, tmp_path, capsys):
+        main(["--feed", "all-events.json", "--branches", "West Meeting Room", "--start", "2025-07-07",
+              "--workers", "1", "--backend", "streaming", "--out-dir", str(tmp_path)])
+        output = tmp_path / "west-meeting-room-2025-07-07.docx"
+        with zipfile.ZipFile(output) as document:
+            # python-docx documents carry its default template's parts, the streaming writer's do not
+            assert "word/theme/theme1.xml" not in document.namelist()
+        Document(str(output))
+        # the python-docx backend renders a different file, so it is not up to date
+        main(["--feed", "all-events.json", "--branches", "West Meeting Room", "--start", "2025-07-07",
+              "--workers", "1", "--out-dir", str(tmp_path)])
+        assert "up to date" not in capsys.readouterr().out
+        with zipfile.ZipFile(output) as document:
+            assert "word/theme/theme1.xml" in document.namelist()
+
+    def test_main_rejects_render_cache_in_batch_mode(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["--branches", "West", "--backend", "streaming", "--render-cache", str(tmp_path / "cells.json")])
+
+    def test_plan_jobs_invalid_backend(self):
+        with pytest.raises(ValueError, match="backend must be one of"):
+            plan_jobs(records, "out", [monday], backend="pdf")
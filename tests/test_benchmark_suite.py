@@ -0,0 +1,30 @@
+from benchmark.suite import STAGES, compare_to_baseline, format_results, run_benchmark
+
+
+class TestBenchmarkSuite:
+    def test_run_benchmark_times_every_stage(self, tmp_path):
+        stages = run_benchmark(200, str(tmp_path))
+        assert list(stages) == [name for name, _ in STAGES]
+        for result in stages.values():
+            assert result["seconds"] >= 0
+            assert result["cumulative_peak_rss_mib"] >= 0
+            assert result["rss_growth_mib"] is None or isinstance(result["rss_growth_mib"], float)
+        peaks = [result["cumulative_peak_rss_mib"] for result in stages.values()]
+        assert peaks == sorted(peaks)
+        assert (tmp_path / "calendar-200.docx").exists()
+
+    def test_compare_to_baseline(self):
+        baseline = {"1k": {"parse": {"seconds": 0.1}, "render": {"seconds": 0.2},
+                           "filter": {"seconds": 0.001}}}
+        results = {"1k": {"parse": {"seconds": 0.2}, "render": {"seconds": 0.21},
+                          "filter": {"seconds": 0.01}, "save": {"seconds": 1.0}}}
+        regressions = compare_to_baseline(results, baseline)
+        # filter is too fast to compare and save has no baseline
+        assert regressions == ["1k parse: 0.200s vs 0.100s baseline (2.00x)"]
+
+    def test_format_results(self):
+        results = {"1k": {"parse": {"seconds": 0.2, "rss_growth_mib": 12.5, "cumulative_peak_rss_mib": 20.0},
+                          "save": {"seconds": 0.1, "rss_growth_mib": None, "cumulative_peak_rss_mib": 20.0}}}
+        lines = format_results(results, {"1k": {"parse": {"seconds": 0.1}}}).splitlines()
+        assert lines[1].split() == ["1k", "parse", "0.200", "12.5", "20.0", "2.00x"]
+        assert lines[2].split() == ["1k", "save", "0.100", "n/a", "20.0"]
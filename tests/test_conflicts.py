@@ -0,0 +1,137 @@
+import io
+import zipfile
+from datetime import date, datetime
+from docx.shared import Pt
+from event.event import Event
+from event_calendar.conflicts import double_booked, event_interval, find_conflicts
+from event_calendar.event_calendar import EventCalendar
+from doc_builder.doc_builder import DocBuilder
+from doc_builder.fingerprint import calendar_fingerprint
+from doc_builder.ooxml_writer import write_calendar
+from doc_builder.settings import MARGINS_IN_INCHES
+from app import main
+
+
+def booking(title: str, start: str, end: str, location: str = "Lakeway Meeting Room",
+            day: str = "2025-07-07") -> Event:
+    return Event(title, day, start, end, location)
+
+
+def double_booked_calendar() -> EventCalendar:
+    records = [{"title": title, "start_date": "2025-07-07", "start_time": start, "end_time": end,
+                "locations": [{"location_name": "Lakeway Meeting Room"}]}
+               for title, start, end in [("Tech Coach", "12:00:00 -0500", "14:00:00 -0500"),
+                                         ("Snow Cones", "13:30:00 -0500", "15:00:00 -0500"),
+                                         ("Chess Club", "15:00:00 -0500", "16:00:00 -0500")]]
+    calendar = EventCalendar(today=date(2025, 7, 1), series=True)
+    calendar.load_events(records)
+    return calendar
+
+
+def shaded_cells(file) -> int:
+    with zipfile.ZipFile(file) as document:
+        return document.read("word/document.xml").count(b'w:fill="f4cccc"')
+
+
+class TestConflicts:
+    def test_overlapping_bookings(self):
+        first = booking("Tech Coach", "12:00:00 -0500", "14:00:00 -0500")
+        second = booking("Snow Cones", "13:30:00 -0500", "15:00:00 -0500")
+        [conflict] = find_conflicts([second, first])
+        assert (conflict.first, conflict.second) == (first, second)
+        assert conflict.location == "Lakeway Meeting Room"
+        assert (conflict.start, conflict.end) == (datetime(2025, 7, 7, 18, 30), datetime(2025, 7, 7, 19))
+
+    def test_touching_bookings_do_not_conflict(self):
+        assert find_conflicts([booking("A", "10:00:00 -0500", "11:00:00 -0500"),
+                               booking("B", "11:00:00 -0500", "12:00:00 -0500")]) == []
+
+    def test_rooms_are_checked_separately(self):
+        assert find_conflicts([booking("A", "10:00:00 -0500", "11:00:00 -0500"),
+                               booking("B", "10:00:00 -0500", "11:00:00 -0500", "West Meeting Room"),
+                               booking("C", "10:00:00 -0500", "11:00:00 -0500", day="2025-07-08")]) == []
+        # room names are matched the same way as the location index
+        assert len(find_conflicts([booking("A", "10:00:00 -0500", "11:00:00 -0500"),
+                                   booking("B", "10:30:00 -0500", "11:00:00 -0500",
+                                           "lakeway meeting room ")])) == 1
+
+    def test_offsets_are_applied(self):
+        # 11:30 at -0400 is 10:30 at -0500
+        assert len(find_conflicts([booking("A", "10:00:00 -0500", "11:00:00 -0500"),
+                                   booking("B", "11:30:00 -0400", "12:30:00 -0400")])) == 1
+        assert find_conflicts([booking("A", "10:00:00 -0500", "11:00:00 -0500"),
+                               booking("B", "12:00:00 -0400", "13:00:00 -0400")]) == []
+
+    def test_every_overlapping_pair_is_reported(self):
+        events = [booking("Long", "09:00:00 -0500", "17:00:00 -0500"),
+                  booking("Morning", "10:00:00 -0500", "11:00:00 -0500"),
+                  booking("Midday", "10:30:00 -0500", "12:00:00 -0500"),
+                  booking("Afternoon", "13:00:00 -0500", "14:00:00 -0500")]
+        pairs = {(conflict.first.title, conflict.second.title) for conflict in find_conflicts(events)}
+        assert pairs == {("Long", "Morning"), ("Long", "Midday"), ("Morning", "Midday"),
+                         ("Long", "Afternoon")}
+
+    def test_end_past_midnight(self):
+        start, end = event_interval(booking("Lock-in", "22:00:00 -0500", "01:00:00 -0500"))
+        assert (end - start).total_seconds() == 3 * 60 * 60
+
+    def test_unparseable_times_are_skipped(self):
+        assert find_conflicts([booking("A", "soon", "later"),
+                               booking("B", "10:00:00 -0500", "11:00:00 -0500")]) == []
+
+    def test_calendar_conflicts(self):
+        calendar = double_booked_calendar()
+        assert [(conflict.first.title, conflict.second.title)
+                for conflict in calendar.conflicts()] == [("Tech Coach", "Snow Cones")]
+        assert calendar.conflicts("2025-07-08", "2025-07-31") == []
+        assert calendar.conflicts(location="West Meeting Room") == []
+        assert len(double_booked(calendar.events)) == 2
+
+    def test_canceled_events_do_not_conflict(self):
+        records = [{"id": event_id, "title": title, "canceled": canceled, "start_date": "2025-07-07",
+                    "start_time": "18:00:00 -0500", "end_time": "19:00:00 -0500",
+                    "locations": [{"location_name": "Lakeway Meeting Room"}]}
+                   for event_id, title, canceled in [("yoga", "CANCELED - Yoga", "1"), ("chess", "Chess", "0")]]
+        calendar = EventCalendar(today=date(2025, 7, 1), series=True)
+        calendar.load_events(records)
+        # the canceled event still shows on the calendar, but does not book the room
+        assert len(calendar.events["2025-07-07"]) == 2
+        assert calendar.conflicts() == []
+        assert double_booked(calendar.events, calendar.report.canceled) == set()
+
+        records[0]["canceled"] = "0"
+        calendar.load_events(records)
+        assert len(calendar.conflicts()) == 1
+
+    def test_highlight_in_both_backends(self, tmp_path):
+        calendar = double_booked_calendar()
+        calendar.select_week(date(2025, 7, 7))
+        for highlight, shaded in ((False, 0), (True, 2)):
+            builder = DocBuilder("Arial", Pt(10), MARGINS_IN_INCHES, calendar,
+                                 highlight_conflicts=highlight)
+            builder.init_table()
+            output = io.BytesIO()
+            builder.save_document(output)
+            assert shaded_cells(output) == shaded
+
+            output = io.BytesIO()
+            write_calendar(calendar, output, "Arial", Pt(10), highlight_conflicts=highlight)
+            assert shaded_cells(output) == shaded
+
+    def test_highlight_changes_fingerprint(self):
+        calendar = double_booked_calendar()
+        assert calendar_fingerprint(calendar) != calendar_fingerprint(calendar, highlight_conflicts=True)
+
+    def test_main_lists_conflicts(self, capsys):
+        main(["--feed", "all-events.json", "--list-conflicts"])
+        output = capsys.readouterr().out.splitlines()
+        assert output[-1] == f"{len(output) - 1} double booking(s) found."
+        main(["--feed", "all-events.json", "--list-conflicts", "--start", "2025-07-07"])
+        assert capsys.readouterr().out == "0 double booking(s) found.\n"
+
+    def test_main_merges_overlapping_feeds(self, capsys):
+        main(["--feed", "all-events.json", "--list-conflicts"])
+        single = capsys.readouterr().out.splitlines()[-1]
+        # the branch feed repeats events already in the system feed, which must not conflict with themselves
+        main(["--feed", "all-events.json", "lkwy-events.json", "--list-conflicts"])
+        assert capsys.readouterr().out.splitlines()[-1] == single
@@ -1,4 +1,7 @@
+import os
 import pytest
+from datetime import date
+from docx.oxml.ns import qn
 from event_calendar.event_calendar import EventCalendar
 from doc_builder.doc_builder import DocBuilder
 
@@ -66,3 +69,140 @@ class TestDocBuilderFonts:
         with pytest.raises(TypeError, match="Font size must be an integer."):
             invalid_font_size = "large"
             doc_builder.font_size = invalid_font_size
+
+
+def make_week_calendar() -> EventCalendar:
+    """A calendar for the week of 2025-07-07 with no events on Tuesday."""
+    records = [{"id": f"event-{day}-{index}", "title": f"Event {day} {index}",
+                "start_date": f"2025-07-{day:02d}", "start_time": "10:00:00 -0500",
+                "end_time": "11:30:00 -0500",
+                "locations": [{"location_name": "Lakeway Meeting Room"}]}
+               for day in (7, 9, 12) for index in range(2)]
+    week_calendar = EventCalendar()
+    week_calendar.load_events(records)
+    week_calendar.select_week(date(2025, 7, 7))
+    return week_calendar
+
+
+class TestDocBuilderEvents:
+    def build(self, week_calendar):
+        builder = DocBuilder(valid_font_style, valid_font_size,
+                             valid_margins, week_calendar)
+        builder.init_table()
+        return builder
+
+    def event_titles(self, cell) -> list[str]:
+        return [table.cell(0, 0).paragraphs[0].runs[0].text.rstrip("\n") for table in cell.tables]
+
+    def test_events_placed_in_their_date_column(self):
+        builder = self.build(make_week_calendar())
+        containers = builder._DocBuilder__table.rows[2].cells
+        assert self.event_titles(containers[0]) == ["Event 7 0", "Event 7 1"]
+        assert self.event_titles(containers[1]) == []
+        assert self.event_titles(containers[2]) == ["Event 9 0", "Event 9 1"]
+        assert self.event_titles(containers[5]) == ["Event 12 0", "Event 12 1"]
+
+    def test_event_cells_are_styled(self):
+        builder = self.build(make_week_calendar())
+        container = builder._DocBuilder__table.rows[2].cells[0]
+        for table in container.tables:
+            cell = table.cell(0, 0)
+            borders = cell._element.tcPr.find(qn('w:tcBorders'))
+            assert [border.tag for border in borders] == [
+                qn('w:top'), qn('w:left'), qn('w:bottom'), qn('w:right')]
+            runs = cell.paragraphs[0].runs
+            assert runs[0].bold
+            assert runs[1].text == "10:00am - 11:30am"
+        # Word requires every cell to end with a paragraph
+        assert container._tc[-1].tag == qn('w:p')
+
+    def test_event_cells_are_independent_copies(self):
+        builder = self.build(make_week_calendar())
+        tables = builder._DocBuilder__table.rows[2].cells[0].tables
+        assert tables[0]._tbl is not tables[1]._tbl
+        assert self.event_titles(builder._DocBuilder__table.rows[2].cells[0]) == [
+            "Event 7 0", "Event 7 1"]
+
+    def test_event_title_with_line_break(self):
+        builder = self.build(make_week_calendar())
+        container = builder._DocBuilder__table.rows[2].cells[1]
+        builder.add_event_cell(container, "Two\nLines", "1:00pm - 2:00pm")
+        paragraph = container.tables[0].cell(0, 0).paragraphs[0]
+        assert paragraph.text == "Two\nLines\n1:00pm - 2:00pm"
+
+    def test_weekday_headers_are_shaded(self):
+        builder = self.build(make_week_calendar())
+        for cell in builder._DocBuilder__table.rows[0].cells:
+            shading = cell._element.tcPr.find(qn('w:shd'))
+            assert shading.get(qn('w:fill')) == "5b9bd7"
+
+
+class TestDocBuilderTemplate:
+    def test_template_is_prepared_once(self):
+        first = DocBuilder.base_template(
+            valid_font_style, valid_font_size, valid_margins)
+        second = DocBuilder.base_template(
+            valid_font_style, valid_font_size, dict(valid_margins))
+        assert first is second
+
+    def test_documents_do_not_share_state(self):
+        first = DocBuilder(valid_font_style, valid_font_size,
+                           valid_margins, make_week_calendar())
+        second = DocBuilder(valid_font_style, valid_font_size,
+                            valid_margins, make_week_calendar())
+        first.init_table()
+        assert first.styles is not second.styles
+        assert len(first._DocBuilder__doc.tables) == 1
+        assert len(second._DocBuilder__doc.tables) == 0
+
+    def test_template_has_psa_style(self):
+        builder = DocBuilder(valid_font_style, valid_font_size, valid_margins)
+        assert 'psa' in builder.styles
+        builder.init_psa()
+        builder.init_psa()
+        assert len(builder._DocBuilder__doc.tables) == 2
+
+    def test_template_written_to_and_loaded_from_disk(self, tmp_path):
+        template_path = str(tmp_path / "base.docx")
+        builder = DocBuilder("Georgia", valid_font_size,
+                             valid_margins, template_path=template_path)
+        with open(template_path, "rb") as file:
+            assert file.read() == DocBuilder.base_template(
+                "Georgia", valid_font_size, valid_margins, template_path)
+        assert builder.styles["Normal"].font.name == "Georgia"
+        # a different font with the same file prepares the template again rather than loading a stale one
+        rebuilt = DocBuilder("Arial", valid_font_size,
+                             valid_margins, template_path=template_path)
+        assert rebuilt.styles["Normal"].font.name == "Arial"
+        with open(template_path, "rb") as file:
+            assert file.read() == DocBuilder.base_template(
+                "Arial", valid_font_size, valid_margins, template_path)
+
+    def test_template_from_disk_reused_for_same_settings(self, tmp_path):
+        template_path = str(tmp_path / "base.docx")
+        DocBuilder("Verdana", valid_font_size, valid_margins, template_path=template_path)
+        modified = os.stat(template_path).st_mtime_ns
+        # a fresh process has no templates in memory and reads the file instead
+        DocBuilder._DocBuilder__templates.clear()
+        loaded = DocBuilder("Verdana", valid_font_size, valid_margins, template_path=template_path)
+        assert loaded.styles["Normal"].font.name == "Verdana"
+        assert os.stat(template_path).st_mtime_ns == modified
+
+
+class TestDocBuilderWeeks:
+    def test_init_weeks_one_page_per_week(self):
+        week_calendar = make_week_calendar()
+        builder = DocBuilder(valid_font_style, valid_font_size,
+                             valid_margins, week_calendar)
+        builder.init_weeks([date(2025, 7, 7), date(2025, 7, 14)])
+        body = builder._DocBuilder__doc.element.body
+        tags = [element.tag for element in body][:-1]
+        assert tags == [qn('w:tbl'), qn('w:tbl'), qn('w:p'),
+                        qn('w:tbl'), qn('w:tbl')]
+        assert body[2].xpath('.//w:br/@w:type') == ["page"]
+
+        tables = builder._DocBuilder__doc.tables
+        assert tables[0].rows[1].cells[0].text == "07"
+        assert tables[2].rows[1].cells[0].text == "14"
+        assert sum(len(cell.tables) for cell in tables[2].rows[2].cells) == 0
+        assert week_calendar.get_week_dates()[0] == "2025-07-14"
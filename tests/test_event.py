@@ -127,3 +127,14 @@ class TestEventFormattedString:
         event.start_time = "07:30:00 -0500"
         event.end_time = "15:45:00 -0500"
         assert event.full_event_string() == "7:30am - 3:45pm"
+
+
+class TestEventTrusted:
+    """Test cases for the trusted construction path."""
+
+    def test_trusted_matches_validated_event(self):
+        event = Event.trusted(**valid_event)
+        assert isinstance(event, Event)
+        assert event.__dict__ == Event(**valid_event).__dict__
+        assert event.title == valid_event["title"]
+        assert event.location == valid_event["location"]
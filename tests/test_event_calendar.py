@@ -1,11 +1,14 @@
 import pytest
 from app import get_api_data_from_storage
-from event_calendar.event_calendar import EventCalendar
+from event_calendar.event_calendar import EventCalendar, start_order
 from event.event import Event
+from event.validation import EventValidationError, ValidationReport
+from util.util import parse_time
 from datetime import *
 
 
-calendar = EventCalendar()
+# the sample feed covers July and August 2025
+calendar = EventCalendar(today=date(2025, 7, 1))
 data = get_api_data_from_storage("all-events.json")
 calendar.events = data
 
@@ -56,3 +59,132 @@ class TestEventCalendar:
         assert len(dates) != 0
         for date in dates:
             assert isinstance(date, str)
+
+    def test_get_next_weeks_dates_from_today(self):
+        assert calendar.get_next_weeks_dates() == [
+            "2025-07-07", "2025-07-08", "2025-07-09", "2025-07-10", "2025-07-11", "2025-07-12"]
+
+    def test_get_next_monday_date_on_a_monday(self):
+        assert calendar.get_next_monday_date(date(2025, 7, 7)) == date(2025, 7, 7)
+        assert calendar.get_next_monday_date(date(2025, 7, 13)) == date(2025, 7, 14)
+
+    def test_week_window_shared(self):
+        week_calendar = EventCalendar(today=date(2025, 7, 1))
+        assert week_calendar.week_window is calendar.week_window
+        assert calendar.get_week_dates() == calendar.get_next_weeks_dates()
+
+    def test_today_invalid_type(self):
+        with pytest.raises(ValueError, match="Passed dates should be of type date."):
+            EventCalendar(today="2025-07-01")
+
+
+class TestEventCalendarQueries:
+    def test_events_between(self):
+        events = calendar.events_between("2025-07-07", "2025-07-12")
+        assert len(events) != 0
+        assert list(events.keys()) == sorted(events.keys())
+        for day, day_events in events.items():
+            assert "2025-07-07" <= day <= "2025-07-12"
+            for event in day_events:
+                assert isinstance(event, Event)
+                assert event.date == day
+
+    def test_events_between_location(self):
+        events = calendar.events_between(
+            "2025-07-01", "2025-08-31", location="West Meeting Room")
+        assert len(events) != 0
+        for day_events in events.values():
+            for event in day_events:
+                assert event.location == "West Meeting Room"
+
+    def test_events_for_week(self):
+        week = calendar.events_for_week(date(2025, 7, 7))
+        assert week == calendar.events_between("2025-07-07", "2025-07-12")
+
+    def test_events_for_week_not_monday(self):
+        with pytest.raises(ValueError, match="Weeks must start on a Monday."):
+            calendar.events_for_week(date(2025, 7, 8))
+
+    def test_events_for_week_invalid_type(self):
+        with pytest.raises(ValueError, match="Passed dates should be of type date."):
+            calendar.events_for_week("2025-07-07")
+
+    def test_events_between_by_time(self):
+        events = calendar.events_between(
+            "2025-07-01", "2025-08-31", by_time=True)
+        for day_events in events.values():
+            starts = [parse_time(event.start_time) for event in day_events]
+            assert starts == sorted(starts)
+
+    def test_events_between_by_time_mixed_offsets(self):
+        records = [{"title": title, "start_date": "2025-07-08", "start_time": start, "end_time": start,
+                    "locations": [{"location_name": "Room"}]}
+                   for title, start in [("Late", "10:00:00 -0500"), ("Early", "09:00:00")]]
+        mixed = EventCalendar(today=date(2025, 7, 1))
+        mixed.load_events(records)
+        events = mixed.events_between("2025-07-08", "2025-07-08", by_time=True)
+        # 09:00:00 without an offset is taken as UTC, so it starts before 10:00 at -0500
+        assert [event.title for event in events["2025-07-08"]] == ["Early", "Late"]
+
+    def test_start_order_puts_unreadable_times_last(self):
+        events = [Event("Unreadable", "2025-07-08", "09:00", "10:00", "Room"),
+                  Event("Late", "2025-07-08", "10:00:00 -0500", "11:00:00 -0500", "Room"),
+                  Event("Also unreadable", "2025-07-08", "soon", "later", "Room"),
+                  Event("Early", "2025-07-08", "09:00:00 +1400", "10:00:00 +1400", "Room")]
+        assert [event.title for event in sorted(events, key=start_order)] == [
+            "Early", "Late", "Unreadable", "Also unreadable"]
+
+    def test_weeks_between_month(self):
+        mondays = calendar.weeks_between(date(2025, 7, 1), date(2025, 7, 31))
+        assert mondays == [date(2025, 6, 30), date(2025, 7, 7), date(2025, 7, 14),
+                           date(2025, 7, 21), date(2025, 7, 28)]
+
+    def test_weeks_between_skips_sunday_edges(self):
+        # 2025-06-01 is a Sunday and 2025-06-30 a Monday
+        mondays = calendar.weeks_between(date(2025, 6, 1), date(2025, 6, 29))
+        assert mondays[0] == date(2025, 6, 2)
+        assert mondays[-1] == date(2025, 6, 23)
+
+    def test_weeks_between_invalid_range(self):
+        with pytest.raises(ValueError, match="The range cannot end before it starts."):
+            calendar.weeks_between(date(2025, 7, 31), date(2025, 7, 1))
+
+    def test_iter_weeks(self):
+        mondays = [date(2025, 7, 7), date(2025, 7, 14)]
+        weeks = list(calendar.iter_weeks(mondays))
+        assert [week_dates[0] for week_dates, _ in weeks] == [
+            "2025-07-07", "2025-07-14"]
+        assert weeks[1][1] == calendar.events_for_week(date(2025, 7, 14))
+
+
+class TestEventCalendarBranches:
+    def test_for_branches(self):
+        items = [item for events in data for item in events]
+        calendars = EventCalendar.for_branches(items)
+        assert set(calendars.keys()) == {
+            "lakeway meeting room", "lakeway", "west meeting room", "west"}
+        assert sum(len(branch.store) for branch in calendars.values()) == len(items)
+        for branch in calendars.values():
+            assert isinstance(branch, EventCalendar)
+
+    def test_for_branches_reports_records_without_location(self):
+        items = [item for events in data for item in events][:20]
+        items.append(dict(items[0], id="nowhere", locations=[]))
+        with pytest.raises(EventValidationError, match="'nowhere': Location cannot be empty."):
+            EventCalendar.for_branches(items)
+
+        report = ValidationReport()
+        calendars = EventCalendar.for_branches(items, on_error="skip", report=report)
+        assert report.rejected_ids == ["nowhere"]
+        assert report.quarantined == []
+        assert sum(len(branch.store) for branch in calendars.values()) == 20
+
+    def test_for_branches_selected(self):
+        items = [item for events in data for item in events]
+        calendars = EventCalendar.for_branches(
+            items, "branch_name", ["West Library"], compact=True)
+        assert list(calendars.keys()) == ["west library"]
+        events = calendars["west library"].events_between(
+            "2025-07-01", "2025-08-31")
+        locations = {event.location for day in events.values() for event in day}
+        assert locations == {"West Meeting Room", "West"}
@@ -0,0 +1,128 @@
+import pytest
+from datetime import date
+from event.event import Event
+from event.validation import ValidationReport
+from event_store.event_store import EventStore, location_key, partition_records
+
+
+def make_event(day: str, location: str = "Lakeway Meeting Room", title: str = "Sample Event") -> Event:
+    return Event(title=title, date=day, start_time="10:00:00 -0500",
+                 end_time="11:00:00 -0500", location=location)
+
+
+events = [
+    make_event("2025-07-09", title="Wednesday"),
+    make_event("2025-07-07", title="Monday A"),
+    make_event("2025-07-12", "West Meeting Room", "Saturday"),
+    make_event("2025-07-07", "West Meeting Room", "Monday B"),
+    make_event("2025-07-14", title="Next Monday"),
+]
+store = EventStore(events)
+
+
+class TestEventStore:
+    def test_store_length(self):
+        assert len(store) == len(events)
+
+    def test_between_sorted_by_date(self):
+        found = store.between("2025-07-01", "2025-07-31")
+        assert [event.date for event in found] == sorted(
+            event.date for event in events)
+
+    def test_between_keeps_feed_order_within_a_day(self):
+        found = store.between("2025-07-07", "2025-07-07")
+        assert [event.title for event in found] == ["Monday A", "Monday B"]
+
+    def test_between_is_inclusive(self):
+        found = store.between(date(2025, 7, 7), date(2025, 7, 12))
+        assert [event.title for event in found] == [
+            "Monday A", "Monday B", "Wednesday", "Saturday"]
+
+    def test_between_empty_range(self):
+        assert store.between("2025-08-01", "2025-08-31") == []
+        assert store.between("2025-07-12", "2025-07-07") == []
+
+    def test_between_by_location(self):
+        found = store.between("2025-07-01", "2025-07-31",
+                              location="west meeting room")
+        assert [event.title for event in found] == ["Monday B", "Saturday"]
+        assert store.between("2025-07-01", "2025-07-31",
+                             location="Nowhere") == []
+
+    def test_locations(self):
+        assert sorted(store.locations) == [
+            "lakeway meeting room", "west meeting room"]
+
+    def test_extend(self):
+        extended = EventStore(events)
+        extended.extend([make_event("2025-07-08", title="Tuesday")])
+        found = extended.between("2025-07-08", "2025-07-08")
+        assert [event.title for event in found] == ["Tuesday"]
+
+    def test_extend_invalid_type(self):
+        with pytest.raises(TypeError, match="Expected events to be of type Event."):
+            EventStore([{"title": "Not an event"}])
+
+    def test_invalid_date_type(self):
+        with pytest.raises(ValueError, match="Passed dates should be of type date or str."):
+            store.between(20250707, "2025-07-12")
+
+
+def test_location_key():
+    assert location_key("  Lakeway Meeting Room ") == "lakeway meeting room"
+
+
+class TestPartitionRecords:
+    records = [
+        {"id": "a", "locations": [{"location_name": "Lakeway Meeting Room",
+                                   "branch_name": "Lakeway Library"}]},
+        {"id": "b", "locations": [{"location_name": "WEST Meeting Room",
+                                   "branch_name": "West Library"}]},
+        {"id": "c", "locations": [{"location_name": "Lakeway",
+                                   "branch_name": "Lakeway Library"}]},
+        {"id": "d", "locations": [{"location_name": "West meeting room",
+                                   "branch_name": "West Library"}]},
+        {"id": "e", "locations": []},
+    ]
+
+    def test_partition_by_location(self):
+        partitions = partition_records(self.records)
+        assert {key: [item["id"] for item in items]
+                for key, items in partitions.items()} == {
+            "lakeway meeting room": ["a"],
+            "west meeting room": ["b", "d"],
+            "lakeway": ["c"],
+        }
+
+    def test_partition_by_branch(self):
+        partitions = partition_records(self.records, "branch_name")
+        assert [item["id"] for item in partitions["lakeway library"]] == [
+            "a", "c"]
+
+    def test_partition_selected_keys(self):
+        partitions = partition_records(
+            self.records, keys=["West Meeting Room", "Nowhere"])
+        assert set(partitions.keys()) == {"west meeting room", "nowhere"}
+        assert partitions["nowhere"] == []
+        assert len(partitions["west meeting room"]) == 2
+
+    def test_partition_reports_records_without_location(self):
+        records = self.records + [{"id": "f", "locations": ["Lakeway"]},
+                                  {"id": "g", "locations": [{"branch_name": "West Library"}]},
+                                  "not an event"]
+        report = ValidationReport()
+        partitions = partition_records(records, keys=["Lakeway"], report=report)
+        assert [item["id"] for item in partitions["lakeway"]] == ["c"]
+        assert report.errors == [("e", "Location cannot be empty."),
+                                 ("f", "Location cannot be empty."),
+                                 ("g", "Location cannot be empty."),
+                                 (7, "Event record must be a dict.")]
+        assert report.quarantined == records[4:]
+
+        report = ValidationReport()
+        partition_records(records, "branch_name", report=report)
+        assert report.rejected_ids == ["e", "f", 7]
+
+    def test_partition_invalid_field(self):
+        with pytest.raises(ValueError, match="field must be"):
+            partition_records(self.records, "address")
@@ -0,0 +1,99 @@
+import pytest
+from datetime import date
+from event.event_table import EventRow, EventTable
+from api.api import get_api_data_from_storage
+from event_calendar.event_calendar import EventCalendar
+
+
+table = EventTable()
+table.append("Wednesday", "2025-07-09", "10:00:00 -0500",
+             "11:00:00 -0500", "Lakeway Meeting Room")
+table.append("Monday A", "2025-07-07", "14:00:00 -0500",
+             "17:00:00 -0500", "Lakeway Meeting Room")
+table.append("Saturday", "2025-07-12", "10:00:00 -0500",
+             "11:00:00 -0500", "West Meeting Room")
+table.append("  Monday B ", "2025-07-07", "08:00:00 -0500",
+             "12:00:00 -0500", "West Meeting Room")
+
+
+class TestEventTable:
+    def test_table_length(self):
+        assert len(table) == 4
+
+    def test_between_sorted_by_date(self):
+        rows = table.between("2025-07-01", date(2025, 7, 31))
+        assert [row.title for row in rows] == [
+            "Monday A", "Monday B", "Wednesday", "Saturday"]
+
+    def test_between_by_location(self):
+        rows = table.between("2025-07-01", "2025-07-31",
+                             location="WEST MEETING ROOM")
+        assert [row.title for row in rows] == ["Monday B", "Saturday"]
+        assert table.between("2025-07-01", "2025-07-31",
+                             location="Nowhere") == []
+
+    def test_rows_match_event_interface(self):
+        row = table.between("2025-07-07", "2025-07-07")[0]
+        assert isinstance(row, EventRow)
+        assert row.date == "2025-07-07"
+        assert row.location == "Lakeway Meeting Room"
+        assert row.full_event_string() == "2:00pm - 5:00pm"
+        assert str(row) == "Monday A\n2:00pm - 5:00pm"
+
+    def test_strings_are_interned(self):
+        rows = table.between("2025-07-01", "2025-07-31")
+        assert rows[2].location is rows[0].location
+        assert rows[2].start_time is rows[3].start_time
+
+    def test_more_locations_than_fit_in_16_bits(self):
+        many = EventTable()
+        # dates out of feed order, so the ids are also copied by the first query's sort
+        many.extend((("Drop In", "2025-07-08" if number % 2 else "2025-07-07", "10:00:00", "11:00:00",
+                      f"Room {number}") for number in range(2 ** 16 + 2)), trusted=True)
+        assert [row.location for row in many.between("2025-07-07", "2025-07-08",
+                                                      location=f"Room {2 ** 16 + 1}")] == [f"Room {2 ** 16 + 1}"]
+        assert len(many.between("2025-07-07", "2025-07-07")) == 2 ** 15 + 1
+
+    def test_append_after_query(self):
+        extended = EventTable()
+        extended.append("Later", "2025-07-10", "10:00:00 -0500",
+                        "11:00:00 -0500", "West Meeting Room")
+        assert len(extended.between("2025-07-01", "2025-07-31",
+                                    "West Meeting Room")) == 1
+        extended.append("Earlier", "2025-07-08", "10:00:00 -0500",
+                        "11:00:00 -0500", "West Meeting Room")
+        rows = extended.between("2025-07-01", "2025-07-31",
+                                "West Meeting Room")
+        assert [row.title for row in rows] == ["Earlier", "Later"]
+
+    def test_append_empty_title(self):
+        with pytest.raises(ValueError, match="Title cannot be empty."):
+            EventTable().append("  ", "2025-07-07", "10:00:00 -0500",
+                                "11:00:00 -0500", "West Meeting Room")
+
+    def test_append_invalid_location(self):
+        with pytest.raises(ValueError, match="Location must be a string."):
+            EventTable().append("Title", "2025-07-07", "10:00:00 -0500",
+                                "11:00:00 -0500", 12345)
+
+    def test_append_invalid_date(self):
+        with pytest.raises(ValueError, match="Invalid date: July 7th"):
+            EventTable().append("Title", "July 7th", "10:00:00 -0500",
+                                "11:00:00 -0500", "West Meeting Room")
+
+
+def test_compact_calendar_matches_event_calendar():
+    data = get_api_data_from_storage("all-events.json")
+    calendar = EventCalendar()
+    calendar.events = data
+    compact = EventCalendar(compact=True)
+    compact.events = data
+
+    assert isinstance(compact.store, EventTable)
+    assert len(compact.store) == len(calendar.store)
+    expected = calendar.events_between("2025-07-01", "2025-08-31")
+    found = compact.events_between("2025-07-01", "2025-08-31")
+    assert list(found.keys()) == list(expected.keys())
+    for day in expected:
+        assert [str(row) for row in found[day]] == \
+            [str(event) for event in expected[day]]
@@ -0,0 +1,63 @@
+import json
+import pytest
+from collections import Counter
+from datetime import date
+from api.api import get_api_data_from_storage
+from benchmark.feed_generator import (FEED_SIZES, feed_size, generate_events,
+                                      generate_feed, write_feed)
+from event_calendar.event_calendar import EventCalendar
+
+
+sample = get_api_data_from_storage("all-events.json")
+
+
+class TestFeedGenerator:
+    def test_events_have_the_sample_structure(self):
+        event = next(generate_events(1))
+        expected = sample[0][0]
+        assert event.keys() == expected.keys()
+        assert event["locations"][0].keys() == expected["locations"][0].keys()
+        assert event["registration"].keys() == expected["registration"].keys()
+
+    def test_feed_shape(self):
+        feed = generate_feed(50)
+        assert len(feed) == 50
+        assert all(len(group) == 1 for group in feed)
+
+    def test_same_seed_same_feed(self):
+        assert generate_feed(20, seed=3) == generate_feed(20, seed=3)
+        assert generate_feed(20, seed=3) != generate_feed(20, seed=4)
+
+    def test_branch_weights(self):
+        events = list(generate_events(200, branch_weights={"West Library": 1}))
+        assert {event["locations"][0]["branch_name"] for event in events} == {"West Library"}
+
+    def test_dates_stay_in_range_and_skip_sundays(self):
+        events = list(generate_events(500, start=date(2025, 7, 1), days=14))
+        days = Counter(date.fromisoformat(event["start_date"]) for event in events)
+        assert min(days) >= date(2025, 7, 1)
+        assert max(days) <= date(2025, 7, 14)
+        assert all(day.weekday() != 6 for day in days)
+
+    def test_range_without_open_days(self):
+        with pytest.raises(ValueError, match="The date range has no days that can hold events."):
+            list(generate_events(1, start=date(2025, 7, 6), days=1))
+
+    def test_generated_feed_loads_into_a_calendar(self, tmp_path):
+        file_path = str(tmp_path / "feed.json")
+        write_feed(file_path, 300)
+        with open(file_path, "r", encoding="utf-8") as file:
+            feed = json.load(file)
+        assert len(feed) == 300
+
+        calendar = EventCalendar(today=date(2025, 7, 1))
+        calendar.events = get_api_data_from_storage(file_path)
+        assert len(calendar.store) == 300
+        assert calendar.report.errors == []
+
+    def test_feed_size(self):
+        assert feed_size("10k") == FEED_SIZES["10k"]
+        assert feed_size("1M") == 1_000_000
+        assert feed_size("250") == 250
+        with pytest.raises(ValueError):
+            feed_size("0")
@@ -0,0 +1,75 @@
+import zipfile
+from datetime import date
+from docx.shared import Pt
+from doc_builder.doc_builder import DocBuilder
+from doc_builder.fingerprint import (ZIP_DATE_TIME, calendar_fingerprint, is_up_to_date,
+                                     read_fingerprint)
+from doc_builder.ooxml_writer import write_calendar
+from doc_builder.settings import MARGINS_IN_INCHES
+from event_calendar.event_calendar import EventCalendar
+from app import main
+from test_doc_builder import make_week_calendar
+
+
+def save_calendar(week_calendar, file_path, fingerprint=None):
+    builder = DocBuilder("Arial", Pt(10), MARGINS_IN_INCHES, week_calendar)
+    builder.init_table()
+    builder.init_psa()
+    builder.save_document(file_path, fingerprint)
+
+
+class TestFingerprint:
+    def test_stable_for_the_same_events(self):
+        assert calendar_fingerprint(make_week_calendar()) == calendar_fingerprint(make_week_calendar())
+
+    def test_changes_with_events_weeks_and_backend(self):
+        week_calendar = make_week_calendar()
+        fingerprint = calendar_fingerprint(week_calendar)
+        assert calendar_fingerprint(week_calendar, backend="streaming") != fingerprint
+        assert calendar_fingerprint(week_calendar, [date(2025, 7, 7), date(2025, 7, 14)]) != fingerprint
+
+        moved = EventCalendar()
+        moved.load_events([{"title": "Event 7 0", "start_date": "2025-07-07",
+                            "start_time": "10:15:00 -0500", "end_time": "11:30:00 -0500",
+                            "locations": [{"location_name": "Lakeway Meeting Room"}]}])
+        moved.select_week(date(2025, 7, 7))
+        assert calendar_fingerprint(moved) != fingerprint
+
+    def test_saved_documents_are_byte_identical(self, tmp_path):
+        save_calendar(make_week_calendar(), tmp_path / "first.docx")
+        save_calendar(make_week_calendar(), tmp_path / "second.docx")
+        assert (tmp_path / "first.docx").read_bytes() == (tmp_path / "second.docx").read_bytes()
+        with zipfile.ZipFile(tmp_path / "first.docx") as document:
+            assert {info.date_time for info in document.infolist()} == {ZIP_DATE_TIME}
+
+    def test_streamed_documents_are_byte_identical(self, tmp_path):
+        write_calendar(make_week_calendar(), tmp_path / "first.docx", "Arial", Pt(10))
+        write_calendar(make_week_calendar(), tmp_path / "second.docx", "Arial", Pt(10))
+        assert (tmp_path / "first.docx").read_bytes() == (tmp_path / "second.docx").read_bytes()
+
+    def test_fingerprint_recorded_in_document(self, tmp_path):
+        file_path = tmp_path / "calendar.docx"
+        assert read_fingerprint(file_path) is None
+        week_calendar = make_week_calendar()
+        fingerprint = calendar_fingerprint(week_calendar)
+        save_calendar(week_calendar, file_path, fingerprint)
+        assert read_fingerprint(file_path) == fingerprint
+        assert is_up_to_date(file_path, fingerprint)
+        assert not is_up_to_date(file_path, calendar_fingerprint(week_calendar, backend="streaming"))
+
+        file_path.write_bytes(b"not a document")
+        assert not is_up_to_date(file_path, fingerprint)
+
+    def test_main_skips_unchanged_document(self, tmp_path, capsys):
+        output = tmp_path / "calendar.docx"
+        arguments = ["--feed", "all-events.json", "--start", "2025-07-07", "--output", str(output)]
+        main(arguments)
+        written = output.stat().st_mtime_ns
+        assert capsys.readouterr().out == ""
+
+        main(arguments)
+        assert "is up to date" in capsys.readouterr().out
+        assert output.stat().st_mtime_ns == written
+
+        main(arguments + ["--weeks", "2"])
+        assert "is up to date" not in capsys.readouterr().out
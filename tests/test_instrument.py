@@ -0,0 +1,156 @@
+import json
+import pytest
+from datetime import date
+from instrument import instrument
+from event_calendar.event_calendar import EventCalendar
+from doc_builder.doc_builder import DocBuilder
+from test_doc_builder import make_week_calendar
+
+
+@pytest.fixture
+def recording():
+    instrument.enable()
+    yield
+    instrument.disable()
+
+
+class TestInstrument:
+    def test_disabled_by_default(self):
+        assert not instrument.enabled()
+        with instrument.span("load") as record:
+            assert record is None
+        instrument.count("events_read")
+        assert instrument.report() == {}
+
+    def test_spans_nest(self, recording):
+        with instrument.span("render"):
+            with instrument.span("render.table", week="2025-07-07") as record:
+                record["cells"] = 3
+        spans = instrument.report()["spans"]
+        assert [(span["name"], span["depth"]) for span in spans] == [
+            ("render", 0), ("render.table", 1)]
+        assert spans[1]["week"] == "2025-07-07"
+        assert spans[1]["cells"] == 3
+        assert spans[0]["seconds"] >= spans[1]["seconds"] >= 0
+
+    def test_counters(self, recording):
+        instrument.count("events_read", 10)
+        instrument.count("events_read")
+        assert instrument.report()["counters"] == {"events_read": 11}
+
+    def test_span_recorded_when_stage_fails(self, recording):
+        with pytest.raises(ValueError):
+            with instrument.span("load"):
+                raise ValueError("bad feed")
+        assert "seconds" in instrument.report()["spans"][0]
+
+    def test_profile_stage(self):
+        instrument.enable(profile_stage="render.table")
+        with instrument.span("render.table"):
+            sorted(range(1000))
+        with instrument.span("render.table"):
+            sorted(range(1000))
+        report = instrument.disable()
+        assert list(report["profiles"]) == ["render.table"]
+        assert "function calls" in report["profiles"]["render.table"]
+
+    def test_pipeline_report(self, recording, tmp_path):
+        builder = DocBuilder("Arial", 12, {"top": 1, "bottom": 1, "left": 1, "right": 1},
+                             make_week_calendar())
+        builder.init_table()
+        builder.init_psa()
+        builder.save_document(str(tmp_path / "calendar.docx"))
+
+        file_path = tmp_path / "report.json"
+        instrument.write_report(str(file_path))
+        with open(file_path, "r", encoding="utf-8") as file:
+            report = json.load(file)
+        names = [span["name"] for span in report["spans"]]
+        assert names[-3:] == ["render.table", "render.psa", "save"]
+        assert report["counters"]["events_rendered"] == 6
+        assert report["counters"]["bytes_written"] == (
+            tmp_path / "calendar.docx").stat().st_size
+
+    def test_filter_counters(self, recording):
+        calendar = EventCalendar(today=date(2025, 7, 1))
+        calendar.load_events([{"title": "Kept", "start_date": "2025-07-07",
+                               "start_time": "10:00:00 -0500", "end_time": "11:00:00 -0500",
+                               "locations": [{"location_name": "West"}]},
+                              {"title": "", "start_date": "2025-07-07"}], on_error="skip")
+        counters = instrument.report()["counters"]
+        assert counters["events_kept"] == 1
+        assert counters["events_rejected"] == 1
+
+
+@pytest.fixture
+def memory_recording():
+    instrument.enable(memory=True)
+    yield
+    instrument.disable()
+
+
+class TestMemoryBudgets:
+    def test_nested_peaks(self, memory_recording):
+        with instrument.span("render"):
+            with instrument.span("render.table"):
+                block = bytearray(4 * 2 ** 20)
+                del block
+            kept = bytearray(2 ** 20)
+        stages = instrument.stage_memory(instrument.report())
+        # the inner peak was freed before the outer span ended, but still counts towards it
+        assert stages["render.table"]["peak_bytes"] >= 4 * 2 ** 20
+        assert stages["render"]["peak_bytes"] >= stages["render.table"]["peak_bytes"]
+        assert stages["render.table"]["retained_bytes"] < 2 ** 20
+        assert stages["render"]["retained_bytes"] >= 2 ** 20
+        del kept
+
+    def test_repeated_stage_keeps_largest(self, memory_recording):
+        for size in (2 ** 20, 3 * 2 ** 20):
+            with instrument.span("render.table"):
+                block = bytearray(size)
+                del block
+        stages = instrument.stage_memory(instrument.report())
+        assert list(stages) == ["render.table"]
+        assert stages["render.table"]["peak_bytes"] >= 3 * 2 ** 20
+
+    def test_check_budgets(self):
+        report = {"spans": [{"name": "load", "peak_bytes": 3 * 2 ** 20, "retained_bytes": 2 ** 20},
+                            {"name": "save", "peak_bytes": 2 ** 20, "retained_bytes": 0}]}
+        assert instrument.check_budgets(report, {"load": 4 * 2 ** 20, "save": 2 ** 20}) == []
+        violations = instrument.check_budgets(
+            report, {"load": {"peak_bytes": 4 * 2 ** 20, "retained_bytes": 2 ** 19}})
+        assert violations == ["load retained: 1.00 MiB exceeds its 0.50 MiB budget"]
+        with pytest.raises(AssertionError, match="Memory budget exceeded"):
+            instrument.assert_within_budgets(report, {"save": 2 ** 19})
+        with pytest.raises(ValueError, match="No memory was recorded for stage 'render'."):
+            instrument.check_budgets(report, {"render": 2 ** 20})
+
+    def test_format_memory_report(self):
+        report = {"spans": [{"name": "load", "peak_bytes": 2 ** 20, "retained_bytes": 0},
+                            {"name": "save", "peak_bytes": 0, "retained_bytes": 0,
+                             "rss_growth_bytes": 2 ** 21}]}
+        lines = instrument.format_memory_report(report).splitlines()
+        assert lines[1].split() == ["load", "1.00", "0.00", "n/a"]
+        assert lines[2].split() == ["save", "0.00", "0.00", "2.00"]
+
+    def test_app_stays_within_budgets(self, tmp_path, monkeypatch, capsys):
+        from app import main
+        from benchmark.feed_generator import write_feed
+
+        storage = tmp_path / "src" / "storage"
+        storage.mkdir(parents=True)
+        write_feed(str(storage / "feed.json"), 2000, start=date(2025, 7, 1), days=14)
+        monkeypatch.chdir(tmp_path)
+        main(["--feed", "feed.json", "--start", "2025-07-07",
+              "--output", "calendar.docx", "--trace-report", "trace.json", "--memory"])
+        assert "peak MiB" in capsys.readouterr().out
+
+        with open(tmp_path / "trace.json", "r", encoding="utf-8") as file:
+            report = json.load(file)
+        # generous limits, a few times what a 2000 event feed needs, to catch runaway growth
+        instrument.assert_within_budgets(report, {
+            "load": 16 * 2 ** 20,
+            "filter": 8 * 2 ** 20,
+            "render": {"peak_bytes": 32 * 2 ** 20, "retained_bytes": 16 * 2 ** 20},
+            "save": 16 * 2 ** 20,
+        })
@@ -0,0 +1,95 @@
+import pytest
+import zipfile
+from datetime import date
+from lxml import etree
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from doc_builder.ooxml_writer import StreamingDocWriter, run_text, write_calendar
+from doc_builder.doc_builder import DocBuilder
+from doc_builder.settings import MARGINS_IN_INCHES
+from test_doc_builder import make_week_calendar
+
+
+def body_without_section(file_path) -> list[bytes]:
+    body = Document(file_path).element.body
+    # exclusive canonical form drops the unused namespace declarations python-docx's template adds
+    return [etree.tostring(element, method="c14n", exclusive=True)
+            for element in body if element.tag != qn('w:sectPr')]
+
+
+class TestStreamingDocWriter:
+    def test_document_opens_with_python_docx(self, tmp_path):
+        file_path = tmp_path / "calendar.docx"
+        write_calendar(make_week_calendar(), file_path, "Arial", Pt(10))
+        doc = Document(file_path)
+        assert len(doc.tables) == 2
+        assert doc.styles['Normal'].font.name == "Arial"
+        assert doc.styles['Normal'].font.size == Pt(10)
+        assert doc.sections[0].header.paragraphs[0].text == "Meeting Room Schedule"
+
+    def test_matches_doc_builder_output(self, tmp_path):
+        week_calendar = make_week_calendar()
+        builder = DocBuilder("Arial", Pt(10), MARGINS_IN_INCHES, week_calendar)
+        builder.init_table()
+        builder.init_psa()
+        builder.save_document(tmp_path / "python-docx.docx")
+        write_calendar(week_calendar, tmp_path / "streaming.docx", "Arial", Pt(10))
+
+        expected = body_without_section(tmp_path / "python-docx.docx")
+        actual = body_without_section(tmp_path / "streaming.docx")
+        assert actual == expected
+
+    def test_events_placed_in_their_date_column(self, tmp_path):
+        file_path = tmp_path / "calendar.docx"
+        write_calendar(make_week_calendar(), file_path, "Arial", Pt(10))
+        containers = Document(file_path).tables[0].rows[2].cells
+        titles = [[table.cell(0, 0).paragraphs[0].runs[0].text.rstrip("\n")
+                   for table in cell.tables] for cell in containers]
+        assert titles == [["Event 7 0", "Event 7 1"], [], ["Event 9 0", "Event 9 1"],
+                          [], [], ["Event 12 0", "Event 12 1"]]
+
+    def test_page_break_between_weeks(self, tmp_path):
+        week_calendar = make_week_calendar()
+        file_path = tmp_path / "calendar.docx"
+        with StreamingDocWriter(file_path, "Arial", Pt(10)) as writer:
+            writer.write_week(week_calendar.get_week_dates(), week_calendar.events)
+            writer.write_page_break()
+            writer.write_week(week_calendar.get_week_dates(), {})
+        body = Document(file_path).element.body
+        assert [element.tag for element in body] == [
+            qn('w:tbl'), qn('w:p'), qn('w:tbl'), qn('w:sectPr')]
+
+    def test_weeks_match_doc_builder_output(self, tmp_path):
+        mondays = [date(2025, 7, 7), date(2025, 7, 14)]
+        builder = DocBuilder("Arial", Pt(10), MARGINS_IN_INCHES, make_week_calendar())
+        builder.init_weeks(mondays)
+        builder.save_document(tmp_path / "python-docx.docx")
+        write_calendar(make_week_calendar(), tmp_path / "streaming.docx",
+                       "Arial", Pt(10), mondays)
+
+        assert body_without_section(tmp_path / "streaming.docx") == body_without_section(
+            tmp_path / "python-docx.docx")
+
+    def test_close_is_idempotent(self, tmp_path):
+        writer = StreamingDocWriter(tmp_path / "calendar.docx", "Arial", Pt(10))
+        writer.close()
+        writer.close()
+        assert zipfile.ZipFile(tmp_path / "calendar.docx").testzip() is None
+
+    @pytest.mark.parametrize("font_style, font_size", [(1, Pt(10)), ("Arial", "10")])
+    def test_invalid_font(self, tmp_path, font_style, font_size):
+        with pytest.raises(TypeError):
+            StreamingDocWriter(tmp_path / "calendar.docx", font_style, font_size)
+
+
+class TestRunText:
+    def test_escapes_markup(self):
+        assert run_text("Q&A <Teens>") == "<w:t>Q&amp;A &lt;Teens&gt;</w:t>"
+
+    def test_line_breaks_and_tabs(self):
+        assert run_text("Two\nLines\tTabbed") == (
+            "<w:t>Two</w:t><w:br/><w:t>Lines</w:t><w:tab/><w:t>Tabbed</w:t>")
+
+    def test_preserves_surrounding_spaces(self):
+        assert run_text(" padded ") == '<w:t xml:space="preserve"> padded </w:t>'
@@ -0,0 +1,81 @@
+import io
+import json
+import pytest
+from docx.shared import Pt
+from doc_builder.fingerprint import TEMPLATE_VERSION
+from doc_builder.ooxml_writer import write_calendar
+from doc_builder.render_cache import RenderCache
+from app import main
+from test_doc_builder import make_week_calendar
+
+
+class TestRenderCache:
+    def test_hits_and_misses(self):
+        cache = RenderCache()
+        key = RenderCache.key("Story Time", "10:00 AM - 11:00 AM")
+        assert key == (TEMPLATE_VERSION, "Story Time", "10:00 AM - 11:00 AM")
+        assert cache.get(key) is None
+        assert cache.put(key, "<w:tbl/>") == "<w:tbl/>"
+        assert cache.get(key) == "<w:tbl/>"
+        assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(max_entries=2)
+        cache.put(("a",), "a")
+        cache.put(("b",), "b")
+        cache.get(("a",))
+        cache.put(("c",), "c")
+        assert ("a",) in cache and ("c",) in cache
+        assert ("b",) not in cache
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError, match="max_entries must be a positive integer."):
+            RenderCache(max_entries=0)
+
+    def test_persisted_between_runs(self, tmp_path):
+        file_path = str(tmp_path / "cells.json")
+        cache = RenderCache(file_path=file_path)
+        for index in range(3):
+            cache.put(RenderCache.key(f"Event {index}", "10:00 AM - 11:00 AM"), f"<cell {index}/>")
+        assert cache.save()
+
+        loaded = RenderCache(max_entries=2, file_path=file_path)
+        assert len(loaded) == 2
+        # the most recently used entries are the ones kept
+        assert loaded.get(RenderCache.key("Event 2", "10:00 AM - 11:00 AM")) == "<cell 2/>"
+        assert RenderCache.key("Event 0", "10:00 AM - 11:00 AM") not in loaded
+
+        (tmp_path / "cells.json").write_text("not json")
+        assert len(RenderCache(file_path=file_path)) == 0
+        with pytest.raises(ValueError, match="The render cache has no file to save to."):
+            RenderCache().save()
+
+    @pytest.mark.parametrize("content", ['{"a": 1}', "[1, 2]", '[[["a"], 1]]', '[[[["a"]], "<cell/>"]]', "null"])
+    def test_malformed_file_is_skipped(self, tmp_path, content):
+        (tmp_path / "cells.json").write_text(content)
+        assert len(RenderCache(file_path=str(tmp_path / "cells.json"))) == 0
+
+    def test_streaming_writer_reuses_cells(self, tmp_path):
+        cache = RenderCache()
+        first, second = io.BytesIO(), io.BytesIO()
+        write_calendar(make_week_calendar(), first, "Arial", Pt(10), render_cache=cache)
+        assert cache.stats["misses"] == 6
+        write_calendar(make_week_calendar(), second, "Arial", Pt(10), render_cache=cache)
+        assert cache.stats["hits"] == 6
+        assert first.getvalue() == second.getvalue()
+
+    def test_main_saves_render_cache(self, tmp_path):
+        cache_path = tmp_path / "cells.json"
+        main(["--feed", "all-events.json", "--start", "2025-07-07", "--backend", "streaming",
+              "--output", str(tmp_path / "calendar.docx"), "--render-cache", str(cache_path),
+              "--trace-report", str(tmp_path / "trace.json")])
+        with open(cache_path, "r", encoding="utf-8") as file:
+            assert len(json.load(file)) > 0
+        with open(tmp_path / "trace.json", "r", encoding="utf-8") as file:
+            assert "render_cache_misses" in json.load(file)["counters"]
+
+    def test_main_rejects_render_cache_for_python_docx(self):
+        with pytest.raises(SystemExit):
+            main(["--render-cache", "cells.json"])
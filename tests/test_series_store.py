@@ -0,0 +1,130 @@
+import pytest
+from datetime import date
+from event.event import Event
+from event.validation import validate_records
+from event_calendar.event_calendar import EventCalendar
+from event_store.event_store import EventStore
+from event_store.series_store import Series, SeriesStore, week_number
+from api.api import stream_api_data_from_storage
+
+
+def story_time(day: str, location: str = "Lakeway Meeting Room") -> tuple:
+    return ("Preschool Story Time", day, "10:30:00 -0500", "11:00:00 -0500", location)
+
+
+rows = [
+    story_time("2025-07-14"),
+    ("Tech Coach", "2025-07-07", "13:00:00 -0500", "14:00:00 -0500", "Lakeway Meeting Room"),
+    story_time("2025-07-07"),
+    story_time("2025-07-07", "West Meeting Room"),
+    ("Chess Club", "2025-07-09", "16:00:00 -0500", "17:00:00 -0500", "West Meeting Room"),
+    story_time("2025-07-21"),
+]
+
+
+def fields(events) -> list[tuple]:
+    return [(event.title, event.date, event.start_time, event.end_time, event.location)
+            for event in events]
+
+
+class TestSeriesStore:
+    def test_groups_recurring_events(self):
+        store = SeriesStore(rows)
+        assert len(store) == 6
+        assert store.series_count == 4
+        assert list(store.iter_series())[0] == Series(
+            "Preschool Story Time", "10:30:00 -0500", "11:00:00 -0500", "Lakeway Meeting Room",
+            ["2025-07-07", "2025-07-14", "2025-07-21"])
+
+    def test_matches_event_store(self):
+        series_store = SeriesStore(rows)
+        event_store = EventStore([Event.trusted(*row) for row in rows])
+        for start, end, location in [("2025-07-07", "2025-07-12", None),
+                                     ("2025-07-01", "2025-07-31", None),
+                                     (date(2025, 7, 7), date(2025, 7, 31), "lakeway meeting room"),
+                                     ("2025-07-08", "2025-07-08", None)]:
+            assert fields(series_store.between(start, end, location)) == fields(
+                event_store.between(start, end, location))
+
+    def test_keeps_feed_order_within_a_day(self):
+        found = SeriesStore(rows).between("2025-07-07", "2025-07-07")
+        assert [(event.title, event.location) for event in found] == [
+            ("Tech Coach", "Lakeway Meeting Room"),
+            ("Preschool Story Time", "Lakeway Meeting Room"),
+            ("Preschool Story Time", "West Meeting Room")]
+
+    def test_expands_only_requested_dates(self):
+        found = SeriesStore(rows).between("2025-07-14", "2025-07-19")
+        assert fields(found) == [story_time("2025-07-14")]
+        assert isinstance(found[0], Event)
+
+    def test_extend(self):
+        store = SeriesStore(rows[:3])
+        store.extend(rows[3:])
+        assert fields(store.between("2025-07-01", "2025-07-31")) == fields(
+            SeriesStore(rows).between("2025-07-01", "2025-07-31"))
+
+    def test_unknown_location(self):
+        assert SeriesStore(rows).between("2025-07-01", "2025-07-31", "Nowhere") == []
+
+    def test_invalid_date(self):
+        with pytest.raises(ValueError, match="Invalid date: 07/07/2025"):
+            SeriesStore([story_time("07/07/2025")])
+        with pytest.raises(ValueError, match="Passed dates should be of type date or str."):
+            SeriesStore(rows).between(None, "2025-07-31")
+
+    def test_week_number(self):
+        assert week_number(date(2025, 7, 7).toordinal()) == week_number(date(2025, 7, 13).toordinal())
+        assert week_number(date(2025, 7, 14).toordinal()) == week_number(date(2025, 7, 7).toordinal()) + 1
+
+    def test_series_calendar_matches_default(self):
+        records = list(stream_api_data_from_storage("all-events.json"))
+        default = EventCalendar(today=date(2025, 7, 1))
+        default.load_events(records)
+        grouped = EventCalendar(today=date(2025, 7, 1), series=True)
+        grouped.load_events(records)
+        assert isinstance(grouped.store, SeriesStore)
+        assert grouped.store.series_count < len(grouped.store)
+        for monday in grouped.weeks_between(date(2025, 7, 1), date(2025, 8, 31)):
+            assert ({day: fields(events) for day, events in grouped.events_for_week(monday).items()}
+                    == {day: fields(events) for day, events in default.events_for_week(monday).items()})
+
+    def test_calendar_cannot_be_compact_and_series(self):
+        with pytest.raises(ValueError, match="A calendar cannot be both compact and series backed."):
+            EventCalendar(compact=True, series=True)
+
+    @pytest.mark.parametrize("backing", [{}, {"compact": True}, {"series": True}])
+    def test_bad_date_is_skipped_not_fatal(self, backing):
+        records = [
+            {"id": "good", "title": "Tech Coach", "start_date": "2025-07-08",
+             "start_time": "13:00:00 -0500", "end_time": "14:00:00 -0500",
+             "locations": [{"location_name": "Lakeway Meeting Room"}]},
+            {"id": "us-date", "title": "Tech Coach", "start_date": "07/08/2025",
+             "start_time": "13:00:00 -0500", "end_time": "14:00:00 -0500",
+             "locations": [{"location_name": "Lakeway Meeting Room"}]},
+        ]
+        calendar = EventCalendar(today=date(2025, 7, 1), **backing)
+        calendar.load_events(records, on_error="skip")
+        assert len(calendar.store) == 1
+        assert calendar.report.rejected_ids == ["us-date"]
+
+    def test_app_skips_bad_records(self, tmp_path, monkeypatch, capsys):
+        import json
+        from app import main
+
+        items = list(stream_api_data_from_storage("all-events.json"))
+        items[0] = dict(items[0], start_date="07/08/2025")
+        storage = tmp_path / "src" / "storage"
+        storage.mkdir(parents=True)
+        (storage / "feed.json").write_text(json.dumps([items]), encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+        main(["--feed", "feed.json", "--start", "2025-07-07", "--output", "calendar.docx"])
+        assert (tmp_path / "calendar.docx").exists()
+        assert f"Skipped 1 invalid event(s): {items[0]['id']}" in capsys.readouterr().err
+
+    def test_more_locations_than_fit_in_16_bits(self):
+        store = SeriesStore(("Drop In", "2025-07-07", "10:00:00", "11:00:00", f"Room {number}")
+                            for number in range(2 ** 16 + 1))
+        assert store.series_count == 2 ** 16 + 1
+        assert fields(store.between("2025-07-07", "2025-07-07", f"Room {2 ** 16}")) == [
+            ("Drop In", "2025-07-07", "10:00:00", "11:00:00", f"Room {2 ** 16}")]
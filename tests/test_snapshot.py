@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import pytest
+from api.api import get_api_data_from_storage, project_event, write_json_to_file
+from api.snapshot import (decode_snapshot, encode_snapshot, load_snapshot,
+                          snapshot_path_for, write_snapshot)
+
+
+source_feed = os.path.join(os.getcwd(), "src", "storage", "all-events.json")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Run from a scratch project directory holding a copy of the sample feed."""
+    os.makedirs(tmp_path / "src" / "storage")
+    shutil.copy(source_feed, tmp_path / "src" / "storage" / "all-events.json")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "src" / "storage"
+
+
+class TestSnapshotFormat:
+    def test_round_trip_matches_projection(self):
+        with open(source_feed, "r") as file:
+            data = json.load(file)
+        decoded, fingerprint = decode_snapshot(encode_snapshot(data, (1, 2)))
+        assert fingerprint == (1, 2)
+        assert decoded == [[project_event(item) for item in events]
+                           for events in data]
+
+    def test_snapshot_is_smaller_than_json(self):
+        with open(source_feed, "r") as file:
+            data = json.load(file)
+        assert len(encode_snapshot(data)) < os.path.getsize(source_feed) / 4
+
+    def test_last_modified_is_kept(self):
+        data = [[{"id": "a", "title": "Event", "last_modified": "2025-07-01T09:30:00"}]]
+        decoded, __ = decode_snapshot(encode_snapshot(data))
+        assert decoded[0][0]["last_modified"] == "2025-07-01T09:30:00"
+
+    def test_not_a_snapshot(self):
+        with pytest.raises(ValueError, match="Data is not an event snapshot."):
+            decode_snapshot(b"[[]]")
+
+    def test_corrupted_snapshot(self):
+        with pytest.raises(ValueError, match="Snapshot data is corrupted."):
+            decode_snapshot(encode_snapshot([[{"id": "a"}]])[:-10])
+
+    def test_snapshot_path_for(self):
+        assert snapshot_path_for("lkwy-events.json") == "lkwy-events.snap"
+
+
+class TestSnapshotStorage:
+    def test_write_and_load(self, storage):
+        data = get_api_data_from_storage("all-events.json")
+        assert write_snapshot(data, "all.snap")
+        assert load_snapshot("all.snap") == [
+            [project_event(item) for item in events] for events in data]
+
+    def test_missing_snapshot(self, storage):
+        assert load_snapshot("missing.snap") is None
+
+    def test_get_api_data_builds_snapshot(self, storage):
+        data = get_api_data_from_storage("all-events.json", use_snapshot=True)
+        assert (storage / "all-events.snap").exists()
+        assert get_api_data_from_storage(
+            "all-events.json", use_snapshot=True) == data
+        assert data[0][0] == project_event(
+            get_api_data_from_storage("all-events.json")[0][0])
+
+    def test_snapshot_rebuilt_when_source_changes(self, storage):
+        get_api_data_from_storage("all-events.json", use_snapshot=True)
+        data = get_api_data_from_storage("all-events.json")
+        data[0][0]["title"] = "Updated Title"
+        write_json_to_file(data, "all-events.json")
+
+        assert load_snapshot("all-events.snap", "all-events.json") is None
+        reloaded = get_api_data_from_storage(
+            "all-events.json", use_snapshot=True)
+        assert reloaded[0][0]["title"] == "Updated Title"
+
+    def test_write_json_with_snapshot(self, storage):
+        data = get_api_data_from_storage("all-events.json")
+        assert write_json_to_file(data, "copy.json", snapshot=True)
+        assert load_snapshot("copy.snap", "copy.json") is not None
@@ -0,0 +1,96 @@
+import sqlite3
+import pytest
+from datetime import date
+from api.api import get_api_data_from_storage, project_event
+from event_calendar.event_calendar import EventCalendar
+from event_store.sqlite_store import SCHEMA, SqliteEventStore
+
+
+data = get_api_data_from_storage("all-events.json")
+items = [item for events in data for item in events]
+
+
+@pytest.fixture
+def store():
+    with SqliteEventStore() as store:
+        store.ingest(items)
+        yield store
+
+
+class TestSqliteEventStore:
+    def test_ingest_count(self, store):
+        assert len(store) == len(items)
+
+    def test_ingest_replaces_by_id(self, store):
+        updated = dict(items[0], title="Updated Title")
+        store.ingest([updated])
+        assert len(store) == len(items)
+        found = [record for record in store.query(include_canceled=True)
+                 if record["id"] == updated["id"]]
+        assert found[0]["title"] == "Updated Title"
+
+    def test_query_all_matches_projection(self, store):
+        found = list(store.query(include_canceled=True))
+        expected = sorted((project_event(item) for item in items),
+                          key=lambda record: record["start_date"])
+        assert found == expected
+
+    def test_query_date_range(self, store):
+        found = list(store.query(date(2025, 7, 7), "2025-07-12"))
+        assert found
+        assert all("2025-07-07" <= record["start_date"] <= "2025-07-12"
+                   for record in found)
+        assert [record["start_date"] for record in found] == sorted(
+            record["start_date"] for record in found)
+
+    def test_query_location_and_branch(self, store):
+        rooms = list(store.query(location="west meeting room"))
+        assert rooms
+        assert all(record["locations"][0]["location_name"] == "West Meeting Room"
+                   for record in rooms)
+
+        branch = list(store.query(branch="WEST LIBRARY"))
+        assert len(branch) > len(rooms)
+        assert all(record["locations"][0]["branch_name"] == "West Library"
+                   for record in branch)
+
+    def test_query_category(self, store):
+        found = list(store.query(category="children"))
+        assert found
+        for record in found:
+            names = [category["category_name"]
+                     for category in record["categories"]]
+            assert "Children" in names
+
+    def test_query_canceled(self, store):
+        canceled = [item["id"] for item in items if item["canceled"] == "1"]
+        assert canceled
+        assert not any(record["id"] in canceled for record in store.query())
+        assert any(record["id"] in canceled
+                   for record in store.query(include_canceled=True))
+
+    def test_populates_event_calendar(self, store):
+        calendar = EventCalendar()
+        calendar.load_events(store.query(
+            "2025-07-01", "2025-08-31", location="Lakeway Meeting Room"))
+        events = calendar.events_between("2025-07-01", "2025-08-31")
+        assert events
+        for day in events.values():
+            for event in day:
+                assert event.location == "Lakeway Meeting Room"
+
+    def test_persists_to_disk(self, tmp_path):
+        path = str(tmp_path / "events.db")
+        with SqliteEventStore(path) as store:
+            store.ingest(items)
+        with SqliteEventStore(path) as store:
+            assert len(store) == len(items)
+
+    def test_adds_last_modified_to_older_databases(self, tmp_path):
+        path = str(tmp_path / "events.db")
+        with sqlite3.connect(path) as connection:
+            connection.executescript(SCHEMA.replace("    last_modified TEXT,\n", ""))
+        with SqliteEventStore(path) as store:
+            store.ingest([dict(items[0], last_modified="2025-07-01T09:30:00")])
+            assert next(store.query(include_canceled=True))[
+                "last_modified"] == "2025-07-01T09:30:00"
@@ -1,5 +1,6 @@
 import pytest
-from util.util import format_time
+from datetime import time, timedelta, timezone
+from util.util import _format_time, format_time, format_times, parse_time, slugify
 
 
 class TestFormatTime:
@@ -26,3 +27,53 @@ class TestFormatTime:
     def test_format_time_invalid_type(self):
         with pytest.raises(ValueError, match="Time must be a string."):
             format_time(12345)
+
+
+class TestFormatTimes:
+    def test_format_times(self):
+        times = ["14:30:00 -0500", "09:00:00 -0500", "14:30:00 -0500"]
+        assert format_times(times) == ["2:30pm", "9:00am", "2:30pm"]
+
+    def test_format_times_invalid(self):
+        with pytest.raises(ValueError, match="Times cannot be empty strings."):
+            format_times(["10:00:00 -0500", ""])
+
+    def test_format_time_is_cached(self):
+        format_time("16:05:00 -0500")
+        hits = _format_time.cache_info().hits
+        assert format_time("16:05:00 -0500") == "4:05pm"
+        assert _format_time.cache_info().hits == hits + 1
+
+
+class TestParseTime:
+    def test_parse_time_with_offset(self):
+        parsed = parse_time("14:30:15 -0500")
+        assert parsed == time(14, 30, 15, tzinfo=timezone(timedelta(hours=-5)))
+
+    def test_parse_time_without_offset(self):
+        assert parse_time("9:05:00") == time(9, 5)
+
+    def test_parse_time_sorts_across_offsets(self):
+        times = ["14:30:00 -0500", "09:30:00 -0600", "10:00:00 -0500"]
+        assert sorted(times, key=parse_time) == [
+            "10:00:00 -0500", "09:30:00 -0600", "14:30:00 -0500"]
+
+    @pytest.mark.parametrize("invalid_time", ["25:00:00 -0500", "10:00 -0500", "10:00:00 EST", "ten"])
+    def test_parse_time_invalid(self, invalid_time):
+        with pytest.raises(ValueError, match="Invalid time"):
+            parse_time(invalid_time)
+
+    @pytest.mark.parametrize("not_a_string", [None, 930, ["09:30:00"]])
+    def test_parse_time_not_a_string(self, not_a_string):
+        with pytest.raises(ValueError, match="Time must be a string."):
+            parse_time(not_a_string)
+
+    def test_parse_time_empty(self):
+        with pytest.raises(ValueError, match="Times cannot be empty strings."):
+            parse_time("  ")
+
+
+class TestSlugify:
+    def test_slugify(self):
+        assert slugify("Lakeway Meeting Room") == "lakeway-meeting-room"
+        assert slugify("  Study Room #2 ") == "study-room-2"
@@ -0,0 +1,113 @@
+import pytest
+from event.validation import (EventValidationError, ValidationReport,
+                              check_fields, validate_records)
+
+
+def make_record(record_id: str, **overrides) -> dict:
+    record = {
+        "id": record_id,
+        "title": " Sample Event ",
+        "start_date": "2025-07-08",
+        "start_time": "10:00:00 -0500",
+        "end_time": "14:00:00 -0500",
+        "locations": [{"location_name": "Lakeway Meeting Room"}],
+    }
+    record.update(overrides)
+    return record
+
+
+records = [
+    make_record("good-1"),
+    make_record("no-title", title=""),
+    make_record("bad-fields", start_time=None, end_time=1400, locations=[]),
+    make_record("good-2"),
+]
+
+
+class TestCheckFields:
+    def test_valid_fields(self):
+        assert check_fields("Title", "2025-07-08", "10:00:00", "11:00:00 -0500", "Room") == []
+
+    def test_collects_every_error(self):
+        assert check_fields("  ", "", 10, None, 5) == [
+            "Title cannot be empty.",
+            "Date cannot be empty.",
+            "Start time must be a string.",
+            "End time cannot be empty.",
+            "Location must be a string.",
+        ]
+
+    def test_malformed_date_and_times(self):
+        assert check_fields("Title", "07/08/2025", "9am", "14:00:00 EST", "Room") == [
+            "Invalid date: 07/08/2025",
+            "Invalid time: 9am",
+            "Invalid time: 14:00:00 EST",
+        ]
+        assert check_fields("Title", "2025-02-30", "10:00:00", "11:00:00", "Room") == [
+            "Invalid date: 2025-02-30"]
+        # fromisoformat also reads the basic form, which the stores do not index by
+        assert check_fields("Title", "20250708", "10:00:00", "11:00:00", "Room") == [
+            "Invalid date: 20250708"]
+
+
+class TestValidateRecords:
+    def test_fail_reports_every_error(self):
+        with pytest.raises(EventValidationError) as error:
+            validate_records(records)
+        assert isinstance(error.value, ValueError)
+        assert error.value.errors == [
+            ("no-title", "Title cannot be empty."),
+            ("bad-fields", "Start time cannot be empty."),
+            ("bad-fields", "End time must be a string."),
+            ("bad-fields", "Location cannot be empty."),
+        ]
+
+    def test_skip(self):
+        report = validate_records(records, on_error="skip")
+        assert isinstance(report, ValidationReport)
+        assert len(report.valid) == 2
+        assert report.valid[0] == ("Sample Event", "2025-07-08",
+                                   "10:00:00 -0500", "14:00:00 -0500",
+                                   "Lakeway Meeting Room")
+        assert report.rejected_ids == ["no-title", "bad-fields"]
+        assert report.quarantined == []
+
+    def test_quarantine(self):
+        report = validate_records(records, on_error="quarantine")
+        assert len(report.valid) == 2
+        assert report.quarantined == [records[1], records[2]]
+
+    def test_skip_drops_malformed_dates(self):
+        report = validate_records([make_record("good-1"), make_record("us-date", start_date="07/08/2025")],
+                                  on_error="skip")
+        assert len(report.valid) == 1
+        assert report.rejected_ids == ["us-date"]
+
+    def test_rejected_ids_are_unique(self):
+        report = ValidationReport()
+        report.errors = [("a", "x"), ("b", "x"), ("a", "y"), ("a", "z")]
+        assert report.rejected_ids == ["a", "b"]
+
+    def test_non_dict_record(self):
+        report = validate_records(["not an event"], on_error="skip")
+        assert report.errors == [(0, "Event record must be a dict.")]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="on_error must be one of"):
+            validate_records(records, on_error="ignore")
+
+
+class TestCalendarValidation:
+    def test_calendar_fails_on_bad_records(self):
+        from event_calendar.event_calendar import EventCalendar
+        calendar = EventCalendar()
+        with pytest.raises(EventValidationError):
+            calendar.events = [records]
+
+    def test_calendar_skips_bad_records(self):
+        from event_calendar.event_calendar import EventCalendar
+        for compact in (False, True):
+            calendar = EventCalendar(compact=compact)
+            calendar.load_events(records, on_error="skip")
+            assert len(calendar.store) == 2
+            assert calendar.report.rejected_ids == ["no-title", "bad-fields"]
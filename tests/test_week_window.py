@@ -0,0 +1,49 @@
+import pytest
+from datetime import date
+from event_calendar.week_window import WeekWindow, next_monday
+
+
+class TestNextMonday:
+    def test_next_monday(self):
+        assert next_monday(date(2025, 7, 1)) == date(2025, 7, 7)
+        assert next_monday(date(2025, 7, 6)) == date(2025, 7, 7)
+
+    def test_next_monday_on_a_monday(self):
+        assert next_monday(date(2025, 7, 7)) == date(2025, 7, 7)
+
+    def test_next_monday_invalid_type(self):
+        with pytest.raises(ValueError, match="Passed dates should be of type date."):
+            next_monday("2025-07-07")
+
+
+class TestWeekWindow:
+    def test_dates(self):
+        window = WeekWindow(date(2025, 6, 30))
+        assert window.dates == ["2025-06-30", "2025-07-01", "2025-07-02",
+                                "2025-07-03", "2025-07-04", "2025-07-05"]
+        assert window.start == "2025-06-30"
+        assert window.end == "2025-07-05"
+        assert window.ordinals[0] == date(2025, 6, 30).toordinal()
+        assert "2025-07-02" in window
+        assert "2025-07-06" not in window
+
+    def test_for_monday_is_cached(self):
+        assert WeekWindow.for_monday(date(2025, 7, 7)) is WeekWindow.for_monday(
+            date(2025, 7, 7))
+
+    def test_next_week(self):
+        window = WeekWindow.next_week(date(2025, 7, 1))
+        assert window is WeekWindow.for_monday(date(2025, 7, 7))
+
+    def test_dates_cannot_be_changed(self):
+        window = WeekWindow.for_monday(date(2025, 7, 7))
+        window.dates.clear()
+        assert len(window.dates) == 6
+
+    def test_not_a_monday(self):
+        with pytest.raises(ValueError, match="Weeks must start on a Monday."):
+            WeekWindow(date(2025, 7, 8))
+
+    def test_invalid_type(self):
+        with pytest.raises(ValueError, match="Passed dates should be of type date."):
+            WeekWindow.for_monday("2025-07-07")